@@ -1,113 +1,254 @@
 
+
+module crc_parallel #(
+    parameter int                   DATA_WIDTH = 12,
+    parameter int                   CRC_WIDTH  = 4,
+    parameter logic [CRC_WIDTH:0]   POLY = 5'b10011
+) (
+    input  logic [CRC_WIDTH-1:0]    crc_in,
+    input  logic [DATA_WIDTH-1:0]   data_in,
+    output logic [CRC_WIDTH-1:0]    crc_out
+);
+
+    localparam int IN_WIDTH = CRC_WIDTH + DATA_WIDTH;
+
+    // LFSR state after DATA_WIDTH bits, MSB first as the sequential stages
+    function automatic logic [CRC_WIDTH-1:0] lfsr(
+        input logic [CRC_WIDTH-1:0]  crc,
+        input logic [DATA_WIDTH-1:0] data
+    );
+        logic feedback;
+        for (int i = DATA_WIDTH-1; i >= 0; i--) begin
+            feedback = data[i] ^ crc[CRC_WIDTH-1];
+            crc      = (crc << 1) ^ (feedback ? POLY[CRC_WIDTH-1:0] : {CRC_WIDTH{1'b0}});
+        end
+        return crc;
+    endfunction
+
+    // Next-state XOR matrix, built at elaboration from the LFSR response to
+    // every single {crc, data} input bit: bit j*IN_WIDTH+k set when input
+    // bit k feeds crc_out[j] (same equations as model/crc.py --bits-per-cycle)
+    function automatic logic [CRC_WIDTH*IN_WIDTH-1:0] crc_matrix();
+        logic [IN_WIDTH-1:0]  unit;
+        logic [CRC_WIDTH-1:0] response;
+        crc_matrix = '0;
+        for (int k = 0; k < IN_WIDTH; k++) begin
+            unit     = '0;
+            unit[k]  = 1'b1;
+            response = lfsr(unit[IN_WIDTH-1:DATA_WIDTH], unit[DATA_WIDTH-1:0]);
+            for (int j = 0; j < CRC_WIDTH; j++)
+                crc_matrix[j*IN_WIDTH+k] = response[j];
+        end
+    endfunction
+
+    localparam logic [CRC_WIDTH*IN_WIDTH-1:0] MATRIX = crc_matrix();
+
+    genvar gj;
+    generate
+      for (gj = 0; gj < CRC_WIDTH; gj = gj + 1) begin : gen_crc_xor
+        assign crc_out[gj] = ^(MATRIX[gj*IN_WIDTH +: IN_WIDTH] & {crc_in, data_in});
+      end
+    endgenerate
+
+endmodule
+
+
 module crc_generator_seq #(
     parameter int                   DATA_WIDTH = 12,
     parameter int                   CRC_WIDTH  = 4,
     parameter logic [CRC_WIDTH:0]   POLY = 5'b10011,
     parameter logic [CRC_WIDTH-1:0] SEED = '0,
-    parameter int                   XOR_OPS_PER_CYCLE = 1
+    parameter int                   XOR_OPS_PER_CYCLE = 1,
+    parameter int                   MODE = 0 // 0: sequential, 1: parallel (single cycle), 2: pipelined
 ) (
     input  logic                    clk,
     input  logic                    rst_n,
     input  logic                    start,
     input  logic [DATA_WIDTH-1:0]   data_in,
     output logic [CRC_WIDTH-1:0]    crc_out,
-    output logic                    done
+    output logic                    done,
+    output logic                    ready // start is accepted
 );
 
-    typedef enum logic [1:0] {
-        S_IDLE,
-        S_CRC_CALC,
-        S_RESULT
-    } state_t;
-    state_t state, next_state;
-
-    logic [DATA_WIDTH-1:0]          shift_reg;
-    logic [CRC_WIDTH-1:0]           crc;
-    logic [$clog2(DATA_WIDTH+1):0]  bit_counter;
-    
-    // Combinational signals for loop computation (unrolled stages)
-    logic [DATA_WIDTH-1:0]          shift_reg_comb;
-    logic [CRC_WIDTH-1:0]           crc_comb;
-    logic [$clog2(DATA_WIDTH+1):0]  bit_counter_comb;
-
-    // Stage arrays for generate-unroll (XOR_OPS_PER_CYCLE stages)
-    logic [DATA_WIDTH-1:0]          shift_stage [0:XOR_OPS_PER_CYCLE];
-    logic [CRC_WIDTH-1:0]           crc_stage   [0:XOR_OPS_PER_CYCLE];
-    logic [$clog2(DATA_WIDTH+1):0]  bc_stage    [0:XOR_OPS_PER_CYCLE];
-
-    always_ff @(posedge clk or negedge rst_n) begin
-      if (!rst_n)
-            state <= S_IDLE;
-        else
-            state <= next_state;
-    end
-
-    always_comb begin
-        next_state = state;
-        case (state)
-            S_IDLE:     if (start) next_state = S_CRC_CALC;
-            S_CRC_CALC: if (bit_counter == 0) next_state = S_RESULT;
-            S_RESULT:   next_state = S_IDLE;
-            default:    next_state = S_IDLE;
-        endcase
-    end
-
-    // Initial stage (stage 0)
-    assign shift_stage[0] = shift_reg;
-    assign crc_stage[0]   = crc;
-    assign bc_stage[0]    = bit_counter;
-
-    // Generate combinational unrolled stages
-    genvar gi;
+    localparam int IN_WIDTH = DATA_WIDTH;
+
     generate
-      for (gi = 0; gi < XOR_OPS_PER_CYCLE; gi = gi + 1) begin : gen_crc_stages
-        wire feedback = (bc_stage[gi] > 'b0) ? (shift_stage[gi][DATA_WIDTH-1] ^ crc_stage[gi][CRC_WIDTH-1]) : 1'b0;
-        wire [CRC_WIDTH-1:0] crc_shift = crc_stage[gi] << 1;
-        assign crc_stage[gi+1] = (bc_stage[gi] > 'b0) ? (crc_shift ^ (feedback ? POLY[CRC_WIDTH-1:0] : {CRC_WIDTH{1'b0}})) : crc_stage[gi];
-        assign shift_stage[gi+1] = (bc_stage[gi] > 'b0) ? (shift_stage[gi] << 1) : shift_stage[gi];
-        assign bc_stage[gi+1] = (bc_stage[gi] > 'b0) ? (bc_stage[gi] - 1'b1) : bc_stage[gi];
-      end
-    endgenerate
+      if (MODE == 0) begin : gen_seq
+        typedef enum logic [1:0] {
+            S_IDLE,
+            S_CRC_CALC,
+            S_RESULT
+        } state_t;
+        state_t state, next_state;
+
+        assign ready = (state == S_IDLE);
+
+        logic [DATA_WIDTH-1:0]          shift_reg;
+        logic [CRC_WIDTH-1:0]           crc;
+        logic [$clog2(DATA_WIDTH+1):0]  bit_counter;
 
-    // Outputs from last stage
-    assign crc_comb         = crc_stage[XOR_OPS_PER_CYCLE];
-    assign shift_reg_comb   = shift_stage[XOR_OPS_PER_CYCLE];
-    assign bit_counter_comb = bc_stage[XOR_OPS_PER_CYCLE];
-
-    always_ff @(posedge clk or negedge rst_n) begin
-        if (!rst_n) begin
-            crc         <= SEED;
-            shift_reg   <=  'b0;
-            bit_counter <=  'b0;
-            done        <= 1'b0;
-            crc_out     <=  'b0;
+        // Combinational signals for loop computation (unrolled stages)
+        logic [DATA_WIDTH-1:0]          shift_reg_comb;
+        logic [CRC_WIDTH-1:0]           crc_comb;
+        logic [$clog2(DATA_WIDTH+1):0]  bit_counter_comb;
+
+        // Stage arrays for generate-unroll (XOR_OPS_PER_CYCLE stages)
+        logic [DATA_WIDTH-1:0]          shift_stage [0:XOR_OPS_PER_CYCLE];
+        logic [CRC_WIDTH-1:0]           crc_stage   [0:XOR_OPS_PER_CYCLE];
+        logic [$clog2(DATA_WIDTH+1):0]  bc_stage    [0:XOR_OPS_PER_CYCLE];
+
+        always_ff @(posedge clk or negedge rst_n) begin
+          if (!rst_n)
+                state <= S_IDLE;
+            else
+                state <= next_state;
         end
-        else begin
+
+        always_comb begin
+            next_state = state;
             case (state)
-                S_IDLE: begin
-                    done        <= 1'b0;
-                    if (start) begin
-                        // $display("[%0t][DE-CRC-Gen] Data-in: 0x%0h ", $time, data_in);
-                        crc         <= SEED;
-                        shift_reg   <= data_in;
-                        bit_counter <= DATA_WIDTH;
+                S_IDLE:     if (start) next_state = S_CRC_CALC;
+                S_CRC_CALC: if (bit_counter == 0) next_state = S_RESULT;
+                S_RESULT:   next_state = S_IDLE;
+                default:    next_state = S_IDLE;
+            endcase
+        end
+
+        // Initial stage (stage 0)
+        assign shift_stage[0] = shift_reg;
+        assign crc_stage[0]   = crc;
+        assign bc_stage[0]    = bit_counter;
+
+        // Generate combinational unrolled stages
+        genvar gi;
+        for (gi = 0; gi < XOR_OPS_PER_CYCLE; gi = gi + 1) begin : gen_crc_stages
+          wire feedback = (bc_stage[gi] > 'b0) ? (shift_stage[gi][DATA_WIDTH-1] ^ crc_stage[gi][CRC_WIDTH-1]) : 1'b0;
+          wire [CRC_WIDTH-1:0] crc_shift = crc_stage[gi] << 1;
+          assign crc_stage[gi+1] = (bc_stage[gi] > 'b0) ? (crc_shift ^ (feedback ? POLY[CRC_WIDTH-1:0] : {CRC_WIDTH{1'b0}})) : crc_stage[gi];
+          assign shift_stage[gi+1] = (bc_stage[gi] > 'b0) ? (shift_stage[gi] << 1) : shift_stage[gi];
+          assign bc_stage[gi+1] = (bc_stage[gi] > 'b0) ? (bc_stage[gi] - 1'b1) : bc_stage[gi];
+        end
+
+        // Outputs from last stage
+        assign crc_comb         = crc_stage[XOR_OPS_PER_CYCLE];
+        assign shift_reg_comb   = shift_stage[XOR_OPS_PER_CYCLE];
+        assign bit_counter_comb = bc_stage[XOR_OPS_PER_CYCLE];
+
+        always_ff @(posedge clk or negedge rst_n) begin
+            if (!rst_n) begin
+                crc         <= SEED;
+                shift_reg   <=  'b0;
+                bit_counter <=  'b0;
+                done        <= 1'b0;
+                crc_out     <=  'b0;
+            end
+            else begin
+                case (state)
+                    S_IDLE: begin
+                        done        <= 1'b0;
+                        if (start) begin
+                            // $display("[%0t][DE-CRC-Gen] Data-in: 0x%0h ", $time, data_in);
+                            crc         <= SEED;
+                            shift_reg   <= data_in;
+                            bit_counter <= DATA_WIDTH;
+                        end
                     end
-                end
 
-                S_CRC_CALC: begin
-                    crc         <= crc_comb;
-                    shift_reg   <= shift_reg_comb;
-                    bit_counter <= bit_counter_comb;
-                end
+                    S_CRC_CALC: begin
+                        crc         <= crc_comb;
+                        shift_reg   <= shift_reg_comb;
+                        bit_counter <= bit_counter_comb;
+                    end
+
+                    S_RESULT: begin
+                    //   $display("[%0t][DE-CRC-Gen] CRC-out: 0x%0h ", $time, crc);
+                       crc_out  <= crc;
+                       done     <= 1'b1;
+                    end
+                endcase
+            end
+        end
+      end
+      else if (MODE == 1) begin : gen_par
+        // Single cycle: the whole word goes through the next-state XOR matrix
+        logic [CRC_WIDTH-1:0] crc_comb;
+
+        crc_parallel #(
+            .DATA_WIDTH (IN_WIDTH),
+            .CRC_WIDTH  (CRC_WIDTH),
+            .POLY       (POLY)
+        ) crc_par_u (
+            .crc_in     (SEED),
+            .data_in    (data_in),
+            .crc_out    (crc_comb)
+        );
+
+        assign ready = 1'b1;
 
-                S_RESULT: begin
-                //   $display("[%0t][DE-CRC-Gen] CRC-out: 0x%0h ", $time, crc);
-                   crc_out  <= crc;
-                   done     <= 1'b1;
+        always_ff @(posedge clk or negedge rst_n) begin
+            if (!rst_n) begin
+                crc_out   <= 'b0;
+                done      <= 1'b0;
+            end
+            else begin
+                done <= start;
+                if (start)
+                    crc_out <= crc_comb;
+            end
+        end
+      end
+      else begin : gen_pipe
+        // Two stages, a new word every cycle: the upper bits from the seed,
+        // then the lower bits from the registered partial CRC
+        localparam int LO_WIDTH = IN_WIDTH / 2;
+
+        logic [CRC_WIDTH-1:0] crc_hi, crc_hi_r, crc_comb;
+        logic [LO_WIDTH-1:0]  data_lo_r;
+        logic                 valid_r;
+
+        crc_parallel #(
+            .DATA_WIDTH (IN_WIDTH-LO_WIDTH),
+            .CRC_WIDTH  (CRC_WIDTH),
+            .POLY       (POLY)
+        ) crc_hi_u (
+            .crc_in     (SEED),
+            .data_in    (data_in[IN_WIDTH-1:LO_WIDTH]),
+            .crc_out    (crc_hi)
+        );
+
+        crc_parallel #(
+            .DATA_WIDTH (LO_WIDTH),
+            .CRC_WIDTH  (CRC_WIDTH),
+            .POLY       (POLY)
+        ) crc_lo_u (
+            .crc_in     (crc_hi_r),
+            .data_in    (data_lo_r),
+            .crc_out    (crc_comb)
+        );
+
+        assign ready = 1'b1;
+
+        always_ff @(posedge clk or negedge rst_n) begin
+            if (!rst_n) begin
+                crc_hi_r  <= 'b0;
+                data_lo_r <= 'b0;
+                valid_r   <= 1'b0;
+                crc_out   <= 'b0;
+                done      <= 1'b0;
+            end
+            else begin
+                valid_r <= start;
+                done    <= valid_r;
+                if (start) begin
+                    crc_hi_r  <= crc_hi;
+                    data_lo_r <= data_in[LO_WIDTH-1:0];
                 end
-            endcase
+                if (valid_r)
+                    crc_out <= crc_comb;
+            end
         end
-    end
+      end
+    endgenerate
 
 endmodule
 
@@ -117,107 +258,194 @@ module crc_verify_seq #(
     parameter int                   DATA_WIDTH = 12,
     parameter int                   CRC_WIDTH  = 4,
     parameter logic [CRC_WIDTH:0]   POLY = 5'b10011,
-    parameter int                   XOR_OPS_PER_CYCLE = 1
+    parameter int                   XOR_OPS_PER_CYCLE = 1,
+    parameter int                   MODE = 0 // 0: sequential, 1: parallel (single cycle), 2: pipelined
 ) (
     input  logic                            clk,
     input  logic                            rst_n,
     input  logic                            start,
     input  logic [DATA_WIDTH+CRC_WIDTH-1:0] data_crc_in,
     output logic                            crc_valid,
-    output logic                            done
+    output logic                            done,
+    output logic                            ready // start is accepted
 );
 
-    typedef enum logic [1:0] {
-        S_IDLE,
-        S_CRC_CALC,
-        S_RESULT
-    } state_t;
-    state_t state, next_state;
-
-    logic [DATA_WIDTH+CRC_WIDTH-1:0]            shift_reg;
-    logic [CRC_WIDTH-1:0]                       crc;
-    logic [$clog2(DATA_WIDTH+CRC_WIDTH+1):0]    bit_counter;
-
-    // Combinational signals for loop computation (unrolled stages)
-    logic [DATA_WIDTH+CRC_WIDTH-1:0]            shift_reg_comb;
-    logic [CRC_WIDTH-1:0]                       crc_comb;
-    logic [$clog2(DATA_WIDTH+CRC_WIDTH+1):0]    bit_counter_comb;
-
-    // Stage arrays for generate-unroll (XOR_OPS_PER_CYCLE stages)
-    logic [DATA_WIDTH+CRC_WIDTH-1:0]            shift_stage_v [0:XOR_OPS_PER_CYCLE];
-    logic [CRC_WIDTH-1:0]                       crc_stage_v   [0:XOR_OPS_PER_CYCLE];
-    logic [$clog2(DATA_WIDTH+CRC_WIDTH+1):0]    bc_stage_v    [0:XOR_OPS_PER_CYCLE];
-
-    always_ff @(posedge clk or negedge rst_n) begin
-        if (!rst_n)
-            state <= S_IDLE;
-        else
-            state <= next_state;
-    end
-
-    always_comb begin
-        next_state = state;
-        case (state)
-            S_IDLE:     if (start) next_state = S_CRC_CALC;
-            S_CRC_CALC: if (bit_counter == 0) next_state = S_RESULT;
-            S_RESULT:   next_state = S_IDLE;
-        endcase
-    end
-
-    // Initial stage (stage 0)
-    assign shift_stage_v[0] = shift_reg;
-    assign crc_stage_v[0]   = crc;
-    assign bc_stage_v[0]    = bit_counter;
-
-    // Generate combinational unrolled stages
-    genvar gj;
+    localparam int IN_WIDTH = DATA_WIDTH+CRC_WIDTH;
+
     generate
-      for (gj = 0; gj < XOR_OPS_PER_CYCLE; gj = gj + 1) begin : gen_crc_verify_stages
-        wire feedback_v = (bc_stage_v[gj] > 'b0) ? (shift_stage_v[gj][DATA_WIDTH+CRC_WIDTH-1] ^ crc_stage_v[gj][CRC_WIDTH-1]) : 1'b0;
-        wire [CRC_WIDTH-1:0] crc_shift_v = crc_stage_v[gj] << 1;
-        assign crc_stage_v[gj+1] = (bc_stage_v[gj] > 'b0) ? (crc_shift_v ^ (feedback_v ? POLY[CRC_WIDTH-1:0] : {CRC_WIDTH{1'b0}})) : crc_stage_v[gj];
-        assign shift_stage_v[gj+1] = (bc_stage_v[gj] > 'b0) ? (shift_stage_v[gj] << 1) : shift_stage_v[gj];
-        assign bc_stage_v[gj+1] = (bc_stage_v[gj] > 'b0) ? (bc_stage_v[gj] - 1'b1) : bc_stage_v[gj];
-      end
-    endgenerate
+      if (MODE == 0) begin : gen_seq
+        typedef enum logic [1:0] {
+            S_IDLE,
+            S_CRC_CALC,
+            S_RESULT
+        } state_t;
+        state_t state, next_state;
+
+        assign ready = (state == S_IDLE);
+
+        logic [DATA_WIDTH+CRC_WIDTH-1:0]            shift_reg;
+        logic [CRC_WIDTH-1:0]                       crc;
+        logic [$clog2(DATA_WIDTH+CRC_WIDTH+1):0]    bit_counter;
+
+        // Combinational signals for loop computation (unrolled stages)
+        logic [DATA_WIDTH+CRC_WIDTH-1:0]            shift_reg_comb;
+        logic [CRC_WIDTH-1:0]                       crc_comb;
+        logic [$clog2(DATA_WIDTH+CRC_WIDTH+1):0]    bit_counter_comb;
+
+        // Stage arrays for generate-unroll (XOR_OPS_PER_CYCLE stages)
+        logic [DATA_WIDTH+CRC_WIDTH-1:0]            shift_stage_v [0:XOR_OPS_PER_CYCLE];
+        logic [CRC_WIDTH-1:0]                       crc_stage_v   [0:XOR_OPS_PER_CYCLE];
+        logic [$clog2(DATA_WIDTH+CRC_WIDTH+1):0]    bc_stage_v    [0:XOR_OPS_PER_CYCLE];
 
-    // Outputs from last stage
-    assign crc_comb         = crc_stage_v[XOR_OPS_PER_CYCLE];
-    assign shift_reg_comb   = shift_stage_v[XOR_OPS_PER_CYCLE];
-    assign bit_counter_comb = bc_stage_v[XOR_OPS_PER_CYCLE];
-
-    always_ff @(posedge clk or negedge rst_n) begin
-        if (!rst_n) begin
-            crc         <= 'b0;
-            shift_reg   <= 'b0;
-            bit_counter <= 'b0;
-            crc_valid   <= 1'b0;
-            done        <= 1'b0;
+        always_ff @(posedge clk or negedge rst_n) begin
+            if (!rst_n)
+                state <= S_IDLE;
+            else
+                state <= next_state;
         end
-        else begin
+
+        always_comb begin
+            next_state = state;
             case (state)
-                S_IDLE: begin
-                    done        <= 1'b0;
-                    if (start) begin
-                        shift_reg   <= data_crc_in;
-                        crc         <= 'b0;
-                        bit_counter <= (DATA_WIDTH+CRC_WIDTH);
-                        crc_valid   <= 1'b0;
+                S_IDLE:     if (start) next_state = S_CRC_CALC;
+                S_CRC_CALC: if (bit_counter == 0) next_state = S_RESULT;
+                S_RESULT:   next_state = S_IDLE;
+            endcase
+        end
+
+        // Initial stage (stage 0)
+        assign shift_stage_v[0] = shift_reg;
+        assign crc_stage_v[0]   = crc;
+        assign bc_stage_v[0]    = bit_counter;
+
+        // Generate combinational unrolled stages
+        genvar gj;
+        for (gj = 0; gj < XOR_OPS_PER_CYCLE; gj = gj + 1) begin : gen_crc_verify_stages
+          wire feedback_v = (bc_stage_v[gj] > 'b0) ? (shift_stage_v[gj][DATA_WIDTH+CRC_WIDTH-1] ^ crc_stage_v[gj][CRC_WIDTH-1]) : 1'b0;
+          wire [CRC_WIDTH-1:0] crc_shift_v = crc_stage_v[gj] << 1;
+          assign crc_stage_v[gj+1] = (bc_stage_v[gj] > 'b0) ? (crc_shift_v ^ (feedback_v ? POLY[CRC_WIDTH-1:0] : {CRC_WIDTH{1'b0}})) : crc_stage_v[gj];
+          assign shift_stage_v[gj+1] = (bc_stage_v[gj] > 'b0) ? (shift_stage_v[gj] << 1) : shift_stage_v[gj];
+          assign bc_stage_v[gj+1] = (bc_stage_v[gj] > 'b0) ? (bc_stage_v[gj] - 1'b1) : bc_stage_v[gj];
+        end
+
+        // Outputs from last stage
+        assign crc_comb         = crc_stage_v[XOR_OPS_PER_CYCLE];
+        assign shift_reg_comb   = shift_stage_v[XOR_OPS_PER_CYCLE];
+        assign bit_counter_comb = bc_stage_v[XOR_OPS_PER_CYCLE];
+
+        always_ff @(posedge clk or negedge rst_n) begin
+            if (!rst_n) begin
+                crc         <= 'b0;
+                shift_reg   <= 'b0;
+                bit_counter <= 'b0;
+                crc_valid   <= 1'b0;
+                done        <= 1'b0;
+            end
+            else begin
+                case (state)
+                    S_IDLE: begin
+                        done        <= 1'b0;
+                        if (start) begin
+                            shift_reg   <= data_crc_in;
+                            crc         <= 'b0;
+                            bit_counter <= (DATA_WIDTH+CRC_WIDTH);
+                            crc_valid   <= 1'b0;
+                        end
                     end
-                end
 
-                S_CRC_CALC: begin
-                    crc         <= crc_comb;
-                    shift_reg   <= shift_reg_comb;
-                    bit_counter <= bit_counter_comb;
-                end
+                    S_CRC_CALC: begin
+                        crc         <= crc_comb;
+                        shift_reg   <= shift_reg_comb;
+                        bit_counter <= bit_counter_comb;
+                    end
+
+                    S_RESULT: begin
+                        crc_valid <= (crc == 'b0);
+                        done      <= 1'b1;
+                    end
+                endcase
+            end
+        end
+      end
+      else if (MODE == 1) begin : gen_par
+        // Single cycle: the whole word goes through the next-state XOR matrix
+        logic [CRC_WIDTH-1:0] crc_comb;
+
+        crc_parallel #(
+            .DATA_WIDTH (IN_WIDTH),
+            .CRC_WIDTH  (CRC_WIDTH),
+            .POLY       (POLY)
+        ) crc_par_u (
+            .crc_in     ({CRC_WIDTH{1'b0}}),
+            .data_in    (data_crc_in),
+            .crc_out    (crc_comb)
+        );
 
-                S_RESULT: begin
-                    crc_valid <= (crc == 'b0);
-                    done      <= 1'b1;
+        assign ready = 1'b1;
+
+        always_ff @(posedge clk or negedge rst_n) begin
+            if (!rst_n) begin
+                crc_valid <= 1'b0;
+                done      <= 1'b0;
+            end
+            else begin
+                done <= start;
+                if (start)
+                    crc_valid <= (crc_comb == 'b0);
+            end
+        end
+      end
+      else begin : gen_pipe
+        // Two stages, a new word every cycle: the upper bits from the seed,
+        // then the lower bits from the registered partial CRC
+        localparam int LO_WIDTH = IN_WIDTH / 2;
+
+        logic [CRC_WIDTH-1:0] crc_hi, crc_hi_r, crc_comb;
+        logic [LO_WIDTH-1:0]  data_lo_r;
+        logic                 valid_r;
+
+        crc_parallel #(
+            .DATA_WIDTH (IN_WIDTH-LO_WIDTH),
+            .CRC_WIDTH  (CRC_WIDTH),
+            .POLY       (POLY)
+        ) crc_hi_u (
+            .crc_in     ({CRC_WIDTH{1'b0}}),
+            .data_in    (data_crc_in[IN_WIDTH-1:LO_WIDTH]),
+            .crc_out    (crc_hi)
+        );
+
+        crc_parallel #(
+            .DATA_WIDTH (LO_WIDTH),
+            .CRC_WIDTH  (CRC_WIDTH),
+            .POLY       (POLY)
+        ) crc_lo_u (
+            .crc_in     (crc_hi_r),
+            .data_in    (data_lo_r),
+            .crc_out    (crc_comb)
+        );
+
+        assign ready = 1'b1;
+
+        always_ff @(posedge clk or negedge rst_n) begin
+            if (!rst_n) begin
+                crc_hi_r  <= 'b0;
+                data_lo_r <= 'b0;
+                valid_r   <= 1'b0;
+                crc_valid <= 1'b0;
+                done      <= 1'b0;
+            end
+            else begin
+                valid_r <= start;
+                done    <= valid_r;
+                if (start) begin
+                    crc_hi_r  <= crc_hi;
+                    data_lo_r <= data_crc_in[LO_WIDTH-1:0];
                 end
-            endcase
+                if (valid_r)
+                    crc_valid <= (crc_comb == 'b0);
+            end
         end
-    end
+      end
+    endgenerate
 
 endmodule
@@ -1,7 +1,12 @@
+// Frame bits go out in row order (par_in[0][0], par_in[0][1], ...). Every
+// symbol carries one bit per active lane: lane l sends the l-th bit after
+// the cursor. lanes selects 1 << lanes active lanes (1, 2 or 4 up to LANES),
+// ddr sends two symbols per clk_div period, one per half period.
 module serializer #(
   parameter integer DATA_WIDTH = 32,
   parameter integer DATA_DEPTH = 4,
-  parameter integer DIV_WIDTH  = 8
+  parameter integer DIV_WIDTH  = 8,
+  parameter integer LANES      = 1
 )(
   input  logic                                  clk,
   input  logic                                  rst_n,
@@ -10,7 +15,9 @@ module serializer #(
   input  logic [DIV_WIDTH-1:0]                  clk_div,
   input  logic [$clog2(DATA_WIDTH):0]           width,
   input  logic [$clog2(DATA_DEPTH):0]           depth,
-  output logic                                  serial_out,
+  input  logic [1:0]                            lanes,
+  input  logic                                  ddr,
+  output logic [LANES-1:0]                      serial_out,
   output logic                                  serial_en,
   output logic                                  done,
   output logic [$clog2(DATA_WIDTH):0]           bit_count,
@@ -26,8 +33,43 @@ module serializer #(
   logic [DATA_DEPTH-1:0][DATA_WIDTH-1:0] par_in_r;
   logic [$clog2(DATA_WIDTH):0]         width_r;
   logic [$clog2(DATA_DEPTH):0]         depth_r;
+  logic [1:0]                          lanes_r;
+  logic                                ddr_r;
   
   logic [DIV_WIDTH-1:0] clk_cnt;
+  logic                 half;       // DDR: second symbol of the period
+  logic                 symbol_end;
+  logic                 last_symbol;
+  
+  // Frame position of every lane, rows wrap at width_r. Entry n is the
+  // cursor of the next symbol for n active lanes.
+  logic [LANES:0][$clog2(DATA_WIDTH):0] lane_bit;
+  logic [LANES:0][$clog2(DATA_DEPTH):0] lane_sample;
+  logic [LANES-1:0]                     lane_data;
+  int                                   lane_num;
+
+  assign lane_num = (1 << lanes_r) > LANES ? LANES : (1 << lanes_r);
+
+  always_comb begin: lane_position_u
+    lane_bit[0]    = bit_count;
+    lane_sample[0] = sample_count;
+    for (int l = 1; l <= LANES; l++) begin
+      if (lane_bit[l-1] >= width_r) begin
+        lane_bit[l]    = 'b0;
+        lane_sample[l] = lane_sample[l-1] + 1'b1;
+      end
+      else begin
+        lane_bit[l]    = lane_bit[l-1] + 1'b1;
+        lane_sample[l] = lane_sample[l-1];
+      end
+    end
+    for (int l = 0; l < LANES; l++)
+      lane_data[l] = (l < lane_num && lane_sample[l] <= depth_r) ? par_in_r[lane_sample[l]][lane_bit[l]] : 1'b0;
+  end
+
+  // Symbol boundaries: end of the period, and its middle in DDR mode
+  assign symbol_end  = (clk_cnt == clk_div) || (ddr_r && !half && clk_cnt == (clk_div >> 1));
+  assign last_symbol = (lane_sample[lane_num] > depth_r);
 
   // FSM - sequential state update
   always_ff @(posedge clk or negedge rst_n) begin
@@ -48,12 +90,15 @@ module serializer #(
       serial_out    <= 0;
       serial_en     <= 0;
       clk_cnt       <= 0;
+      half          <= 0;
       bit_count     <= 0;
       sample_count  <= 0;
       done          <= 0;
       par_in_r      <= 'b0;
       width_r       <= 'b0;
       depth_r       <= 'b0;
+      lanes_r       <= 'b0;
+      ddr_r         <= 'b0;
     end
     else begin
     
@@ -62,6 +107,7 @@ module serializer #(
           serial_out    <= 0;
           serial_en     <= 0;
           clk_cnt       <= 0;
+          half          <= 0;
           bit_count     <= 0;
           sample_count  <= 0;
           done          <= 0;
@@ -69,36 +115,43 @@ module serializer #(
             par_in_r <= par_in;
             width_r  <= width;
             depth_r  <= depth;
+            lanes_r  <= lanes;
+            ddr_r    <= ddr;
           end
           else begin
             par_in_r <= par_in_r;
             width_r  <= width_r;
             depth_r  <= depth_r;
+            lanes_r  <= lanes_r;
+            ddr_r    <= ddr_r;
           end
         end
 
         S_SERIALIZE: begin
           serial_en     <= 1;
-          serial_out    <= par_in_r[sample_count][bit_count];
+          serial_out    <= lane_data;
 
-          if (clk_cnt == (clk_div)) begin  
+          if (clk_cnt == (clk_div)) begin
             clk_cnt <= 'b0;
+            half    <= 1'b0;
+          end
+          else
+            clk_cnt <= clk_cnt + 1'b1;
 
-            if (bit_count >= (width_r)) begin
-              bit_count <= 'b0;
+          if (symbol_end) begin
+            if (clk_cnt != clk_div)
+              half <= 1'b1;
 
-              if (sample_count >= (depth_r)) begin
-                sample_count <= 'b0;
-                done <= 1'b1;
-              end
-              else
-                sample_count <= sample_count + 1'b1;
+            if (last_symbol) begin
+              bit_count    <= 'b0;
+              sample_count <= 'b0;
+              done         <= 1'b1;
+            end
+            else begin
+              bit_count    <= lane_bit[lane_num];
+              sample_count <= lane_sample[lane_num];
             end
-            else
-              bit_count <= bit_count + 1'b1;
           end
-          else
-            clk_cnt <= clk_cnt + 1'b1;
         end
       endcase
     end
@@ -107,19 +160,24 @@ module serializer #(
 endmodule
 
 
+// Receive side of serializer: same lane mapping and DDR symbols. clk_div
+// is the trained period; samples are taken in the middle of every symbol.
 module deserializer #(
   parameter integer DATA_WIDTH = 32,
   parameter integer DATA_DEPTH = 4,
-  parameter integer DIV_WIDTH  = 8
+  parameter integer DIV_WIDTH  = 8,
+  parameter integer LANES      = 1
 )(
   input  logic                                  clk,
   input  logic                                  rst_n,
   input  logic                                  start,
-  input  logic                                  serial_in,
+  input  logic [LANES-1:0]                      serial_in,
   input  logic                                  serial_en,
   input  logic [DIV_WIDTH-1:0]                  clk_div,
   input  logic [$clog2(DATA_WIDTH):0]           width,
   input  logic [$clog2(DATA_DEPTH):0]           depth,
+  input  logic [1:0]                            lanes,
+  input  logic                                  ddr,
   output logic [DATA_DEPTH-1:0][DATA_WIDTH-1:0] par_out,
   output logic                                  done,
   output logic [$clog2(DATA_WIDTH):0]           bit_count,
@@ -134,13 +192,49 @@ module deserializer #(
   } state_t;
   state_t state;
 
-  logic [DIV_WIDTH-1:0] clk_cnt, clk_div_i;
+  logic [DIV_WIDTH-1:0] clk_cnt, clk_div_i, off_div, sample_div;
   logic [$clog2(DATA_WIDTH):0] width_r;
   logic [$clog2(DATA_DEPTH):0] depth_r;
+  logic [1:0] lanes_r;
+  logic ddr_r;
+  logic half;
   logic deser_done;
 
+  // Frame position of every lane, rows wrap at width_r
+  logic [LANES:0][$clog2(DATA_WIDTH):0] lane_bit;
+  logic [LANES:0][$clog2(DATA_DEPTH):0] lane_sample;
+  int                                   lane_num;
+
   assign clk_div_i = clk_div-1'b1;
 
+  // Sampling interval. DDR symbols are half a period, the longer one first
+  // as the serializer sends them; the first sample lands a quarter period
+  // earlier than in SDR, in the middle of the first half symbol.
+  assign sample_div = !ddr_r                                ? clk_div_i :
+                      (bit_count == 0 && sample_count == 0) ? (clk_div_i - (clk_div >> 2)) :
+                      !half                                 ? (clk_div - (clk_div >> 1) - 1'b1) :
+                                                              ((clk_div >> 1) - 1'b1);
+
+  // Half a symbol from the last sample to the end of the frame
+  assign off_div    = ddr_r ? (clk_div_i >> 2) : (clk_div_i >> 1);
+
+  assign lane_num = (1 << lanes_r) > LANES ? LANES : (1 << lanes_r);
+
+  always_comb begin: lane_position_u
+    lane_bit[0]    = bit_count;
+    lane_sample[0] = sample_count;
+    for (int l = 1; l <= LANES; l++) begin
+      if (lane_bit[l-1] >= width_r) begin
+        lane_bit[l]    = 'b0;
+        lane_sample[l] = lane_sample[l-1] + 1'b1;
+      end
+      else begin
+        lane_bit[l]    = lane_bit[l-1] + 1'b1;
+        lane_sample[l] = lane_sample[l-1];
+      end
+    end
+  end
+
   // FSM - sequential state update
   always_ff @(posedge clk or negedge rst_n) begin
     if (!rst_n)
@@ -150,7 +244,7 @@ module deserializer #(
         S_IDLE:          state <= (start) ? S_SAMPLE_SYNC : S_IDLE;
         S_SAMPLE_SYNC:   state <= (clk_cnt == (clk_div_i>>1)) ? S_DESERIALIZE : S_SAMPLE_SYNC;
         S_DESERIALIZE:   state <= (deser_done)  ? S_OFF_SYNC : S_DESERIALIZE;
-        S_OFF_SYNC:      state <= (clk_cnt == (clk_div_i>>1)) ? S_IDLE : S_OFF_SYNC;
+        S_OFF_SYNC:      state <= (clk_cnt == off_div) ? S_IDLE : S_OFF_SYNC;
         default:         state <= S_IDLE;
       endcase
     end
@@ -164,6 +258,9 @@ module deserializer #(
       clk_cnt       <= 'b0;
       width_r       <= 'b0;
       depth_r       <= 'b0;
+      lanes_r       <= 'b0;
+      ddr_r         <= 'b0;
+      half          <= 'b0;
       par_out       <= 'b0;
       bit_count     <= 'b0;
       sample_count  <= 'b0;
@@ -177,14 +274,19 @@ module deserializer #(
           // par_out       <= 'b0;  zeroes or par_out ??
           bit_count     <= 'b0;
           sample_count  <= 'b0;
+          half          <= 'b0;
           done          <= 1'b0;
           deser_done    <= 1'b0;
           if(start) begin
             width_r   <= width;
             depth_r   <= depth;
+            lanes_r   <= lanes;
+            ddr_r     <= ddr;
           end else begin
             width_r   <= width_r;
             depth_r   <= depth_r;
+            lanes_r   <= lanes_r;
+            ddr_r     <= ddr_r;
           end
         end
 
@@ -199,22 +301,22 @@ module deserializer #(
         S_DESERIALIZE: begin
           //par_out[sample_count][bit_count] <= serial_in;
 
-          if (serial_en && clk_cnt == (clk_div_i)) begin  
+          if (serial_en && clk_cnt == sample_div) begin  
             clk_cnt <= 'b0;
-            par_out[sample_count][bit_count] <= serial_in;
-
-            if (bit_count == width_r) begin
-              bit_count <= 'b0;
-
-              if (sample_count == depth_r) begin
-                sample_count  <= 'b0;
-                deser_done    <= 1'b1;
-              end
-              else
-                sample_count <= sample_count + 1'b1;
-            end  
-            else
-              bit_count <= bit_count + 1'b1;
+            half    <= ddr_r & ~half;
+            for (int l = 0; l < LANES; l++)
+              if (l < lane_num && lane_sample[l] <= depth_r)
+                par_out[lane_sample[l]][lane_bit[l]] <= serial_in[l];
+
+            if (lane_sample[lane_num] > depth_r) begin
+              bit_count     <= 'b0;
+              sample_count  <= 'b0;
+              deser_done    <= 1'b1;
+            end
+            else begin
+              bit_count     <= lane_bit[lane_num];
+              sample_count  <= lane_sample[lane_num];
+            end
             
           end
           else
@@ -224,8 +326,8 @@ module deserializer #(
 
         S_OFF_SYNC: begin
           deser_done <= 1'b0;
-          // Wait for half clock cycle to align sampling
-          if(clk_cnt == clk_div_i>>1) begin
+          // Wait for half a symbol to align to its end
+          if(clk_cnt == off_div) begin
             clk_cnt <= 0;
             done <= 1'b1;
           end
@@ -21,12 +21,16 @@ module dl_controller #(
   input  logic [ENC1_DATA_DEPTH-1:0]  enc1_row_p,
   input  logic [ENC1_DATA_WIDTH-1:0]  enc1_col_p,
   input  logic [SERIAL_DIV_WIDTH-1:0] ser_clk_div,
+  input  logic [1:0]                  ser_lanes,            // 1 << ser_lanes active lanes
+  input  logic                        ser_ddr,              // two symbols per ser_clk_div period
+  input  logic                        burst_mode,           // one preamble per message, delimiters in between
   input  logic [31:0]                 err_inj_mask_0,
   input  logic [31:0]                 err_inj_mask_1,
   input  logic                        err_inj_enable,
   output logic                        err_inj_enable_clear,   
+  output logic                        dl_ready,             // frame buffer free, dl_start accepted
   output logic                        dl_done,
-  output logic                        dl_out,
+  output logic [SERIAL_LANES-1:0]     dl_out,
   output logic                        dl_en
 );
   
@@ -36,7 +40,8 @@ module dl_controller #(
     S_TRAINING_START   = 3'd2,
     S_TRAINING         = 3'd3,
     S_SERIALIZER       = 3'd4,
-    S_TIME_OFF         = 3'd5
+    S_TIME_OFF         = 3'd5,
+    S_BURST_WAIT       = 3'd6
   } dl_state_t;
   
   dl_state_t dl_state, next_dl_state;
@@ -44,15 +49,73 @@ module dl_controller #(
   logic training_out;
   logic training_start;
   logic training_done;
-  logic serial_out;
+  logic [SERIAL_LANES-1:0] serial_out;
+  logic [SERIAL_LANES-1:0] lane_mask;
   logic serial_start;
   logic serial_done;
   logic enc_used_r;
   logic [SERIAL_DIV_WIDTH-1:0] clk_cnt;
   logic [2:0] training_dly_cntr;
   
-  // Auto-clear signal for err inj
-  assign err_inj_enable_clear = ~enc_used_r & serial_done;
+  // Frame buffer: the scrambled frame is captured at dl_start so the FSM can
+  // collect and encode the next frame while this one is on the line
+  logic [SERIAL_DATA_DEPTH-1:0][SERIAL_DATA_WIDTH-1:0] scrambled_data;
+  logic [SERIAL_DATA_DEPTH-1:0][SERIAL_DATA_WIDTH-1:0] frame_buf;
+  logic frame_buf_valid;
+  logic frame_buf_enc_used;
+  logic frame_load;
+  logic chained;   // frame follows the previous one without releasing dl_en
+  
+  // Burst framing: the line is held from the message ID frame to the last
+  // data frame; data frames only get a delimiter (one preamble toggle pair)
+  logic [7:0] frame_buf_msg_len;
+  logic [7:0] burst_left;    // message bytes after the frame on the line
+  logic       burst_hold;    // line held for the rest of the message
+  logic       in_burst;      // next preamble is a delimiter
+  logic       training_burst;
+  
+  assign burst_hold     = burst_mode & (burst_left != 8'd0);
+  assign training_burst = in_burst & ~enc_used_r;
+  
+  assign dl_ready   = ~frame_buf_valid;
+  assign lane_mask  = SERIAL_LANES'((1 << (1 << ser_lanes)) - 1); // 1 << ser_lanes lanes
+  assign frame_load = dl_start & dl_ready;
+  
+  // Auto-clear signal for err inj, once the injected frame is captured
+  assign err_inj_enable_clear = ~enc_used & frame_load;
+  
+  // Frame buffer
+  always_ff @(posedge clk or negedge rst_n) begin: frame_buf_u
+    if(!rst_n) begin
+      frame_buf          <= 'b0;
+      frame_buf_valid    <= 1'b0;
+      frame_buf_enc_used <= 1'b0;
+      frame_buf_msg_len  <= 8'b0;
+    end
+    else begin
+      if(frame_load) begin
+        frame_buf          <= scrambled_data;
+        frame_buf_valid    <= 1'b1;
+        frame_buf_enc_used <= enc_used;
+        frame_buf_msg_len  <= msg_len;
+      end
+      else if(serial_start) // Serializer latches par_in
+        frame_buf_valid    <= 1'b0;
+    end
+  end
+  
+  // Message bytes left in the burst: the message ID frame loads msg_len,
+  // every data frame carries up to 7 bytes
+  always_ff @(posedge clk or negedge rst_n) begin: burst_left_u
+    if(!rst_n)
+      burst_left <= 8'b0;
+    else if(serial_start) begin
+      if(enc_used_r)
+        burst_left <= frame_buf_msg_len;
+      else
+        burst_left <= (burst_left > 8'd7) ? (burst_left - 8'd7) : 8'd0;
+    end
+  end
   
   // Training delay counter
   always_ff @(posedge clk or negedge rst_n) begin: training_dly_cnt_u
@@ -85,15 +148,26 @@ module dl_controller #(
     case(dl_state)
       
       S_IDLE: begin 
-        if(dl_start)
+        if(frame_buf_valid)
           next_dl_state = S_TRAINING_DELAY;
         else
           next_dl_state = dl_state;
       end
 
       S_TRAINING_DELAY: begin
-        if(training_dly_cntr == 3'd7)
+        if(training_dly_cntr == 3'd7 && frame_buf_valid)
           next_dl_state = S_TRAINING_START;
+        else if(training_dly_cntr == 3'd7)
+          next_dl_state = S_BURST_WAIT;
+        else 
+          next_dl_state = dl_state;
+      end
+      
+      S_BURST_WAIT: begin
+        if(frame_buf_valid)
+          next_dl_state = S_TRAINING_START;
+        else if(!burst_mode) // Released by software, e.g. after an aborted message
+          next_dl_state = S_IDLE;
         else 
           next_dl_state = dl_state;
       end
@@ -110,7 +184,9 @@ module dl_controller #(
       end
 
       S_SERIALIZER: begin
-        if(serial_done)
+        if(serial_done && (frame_buf_valid || burst_hold))
+          next_dl_state = S_TRAINING_DELAY;
+        else if(serial_done)
           next_dl_state = S_IDLE;
         else 
           next_dl_state = dl_state;
@@ -133,6 +209,8 @@ module dl_controller #(
       training_start  <= 'b0;
       serial_start    <= 'b0;
       enc_used_r      <= 'b0;
+      chained         <= 'b0;
+      in_burst        <= 'b0;
     end
     else begin
             
@@ -141,8 +219,15 @@ module dl_controller #(
         S_IDLE: begin
           training_start  <= 'b0;
           serial_start    <= 'b0;
-          if(dl_start)
-            enc_used_r    <= enc_used;
+          chained         <= 'b0;
+          in_burst        <= 'b0;
+          if(frame_buf_valid)
+            enc_used_r    <= frame_buf_enc_used;
+        end
+        
+        S_BURST_WAIT: begin
+          if(frame_buf_valid)
+            enc_used_r    <= frame_buf_enc_used;
         end
         
         S_TRAINING_START: begin
@@ -169,6 +254,10 @@ module dl_controller #(
         S_SERIALIZER: begin
           if(serial_done) begin
             serial_start    <= 'b0;
+            chained         <= frame_buf_valid | burst_hold;
+            in_burst        <= burst_hold;
+            if(frame_buf_valid)
+              enc_used_r    <= frame_buf_enc_used;
           end
           else begin
             serial_start    <= 'b0;
@@ -194,8 +283,21 @@ module dl_controller #(
         dl_en   = 'b0;
         dl_done = 'b1;
       end
+      // Back-to-back frames keep the line enabled (low) up to the next
+      // preamble; the first cycle is left out so the falling edge after the
+      // last data bit is not taken as a preamble edge
+      S_TRAINING_DELAY: begin
+        dl_out  = 'b0;
+        dl_en   = chained & (training_dly_cntr != 3'd0);
+        dl_done = 'b0;
+      end
+      S_TRAINING_START: begin
+        dl_out  = 'b0;
+        dl_en   = chained;
+        dl_done = 'b0;
+      end
       S_TRAINING: begin
-        dl_out  = training_out;
+        dl_out  = {SERIAL_LANES{training_out}} & lane_mask; // Preamble on every active lane
         dl_en   = 'b1;
         dl_done = 'b0;
       end
@@ -209,6 +311,12 @@ module dl_controller #(
         dl_en   = 1'b0;
         dl_done = 1'b0;
       end
+      // Line held low between the frames of a burst
+      S_BURST_WAIT: begin
+        dl_out  = 'b0;
+        dl_en   = 'b1;
+        dl_done = 'b0;
+      end
       default: begin
         dl_out  = 'b0;
         dl_en   = 'b0;
@@ -227,6 +335,7 @@ module dl_controller #(
     .rst_n           (rst_n),
     .clk_div         (ser_clk_div),
     .start           (training_start),
+    .burst           (training_burst),
     .done            (training_done),
     .training        (training_out)
   );
@@ -246,16 +355,13 @@ module dl_controller #(
   end
   
   
-  // Connect packet_scramble and serializer
-  logic [SERIAL_DATA_DEPTH-1:0][SERIAL_DATA_WIDTH-1:0] scrambled_data;
-  
   // Packet Scrambler
 
   packet_scramble #(
     .DATA_WIDTH       (SERIAL_DATA_WIDTH),
     .DATA_DEPTH       (SERIAL_DATA_DEPTH)
   ) packet_scramble_u (
-    .enc_used       (enc_used_r),
+    .enc_used       (enc_used),
     .data_in        (data_in),
     .crc0_data      (crc0_data),
     .crc1_data      (crc1_data),
@@ -275,14 +381,17 @@ module dl_controller #(
   serializer #(
     .DATA_WIDTH  (SERIAL_DATA_WIDTH),
     .DATA_DEPTH  (SERIAL_DATA_DEPTH),
-    .DIV_WIDTH   (SERIAL_DIV_WIDTH)
+    .DIV_WIDTH   (SERIAL_DIV_WIDTH),
+    .LANES       (SERIAL_LANES)
   ) serialilzer_u (
     .clk         (clk),
     .rst_n       (rst_n),
     .start       (serial_start),
     .width       (serial_width),
     .depth       (serial_depth),
-    .par_in      (scrambled_data),
+    .lanes       (ser_lanes),
+    .ddr         (ser_ddr),
+    .par_in      (frame_buf),
     .clk_div     (ser_clk_div),
     .serial_out  (serial_out),
     .done        (serial_done)
@@ -40,7 +40,8 @@ module dl_fec_engine (
     .CRC_WIDTH          (CRC0_WIDTH),
     .POLY               (CRC0_POLY),
     .SEED               (CRC0_SEED),
-    .XOR_OPS_PER_CYCLE  (CRC0_XOR_OPS_PER_CYCLE)
+    .XOR_OPS_PER_CYCLE  (CRC0_XOR_OPS_PER_CYCLE),
+    .MODE               (CRC0_MODE)
   ) crc_gen0_u (
     .clk                (clk),
     .rst_n              (rst_n),
@@ -87,7 +88,8 @@ module dl_fec_engine (
     .CRC_WIDTH          (CRC1_WIDTH),
     .POLY               (CRC1_POLY),
     .SEED               (CRC1_SEED),
-    .XOR_OPS_PER_CYCLE  (CRC1_XOR_OPS_PER_CYCLE)
+    .XOR_OPS_PER_CYCLE  (CRC1_XOR_OPS_PER_CYCLE),
+    .MODE               (CRC1_MODE)
   ) crc_gen1_u (
     .clk                (clk),
     .rst_n              (rst_n),
@@ -66,9 +66,17 @@ module encoder # (
 endmodule
 
 
+// Decode latency, start to done, in clock cycles:
+//   MODE 0 (iterative):                4 + max(mismatching rows, mismatching
+//                                      columns), at most 4 + max(WIDTH, DEPTH):
+//                                      12 for 8x8, 8 for 4x4
+//   MODE 1 (single pass):              1 for any geometry
+//   MODE 2 (single pass + pipeline):   2 for any geometry
+// latency holds the measured count of the last decode.
 module decoder #(
     parameter int WIDTH = 4,
-    parameter int DEPTH = 4
+    parameter int DEPTH = 4,
+    parameter int MODE  = 0  // 0: iterative, 1: single pass, 2: single pass with pipeline register
 )(
   input  logic                          clk,
   input  logic                          rst_n,
@@ -79,7 +87,8 @@ module decoder #(
   output logic                          done,
   output logic [WIDTH-1:0][DEPTH-1:0]   data_corrected,
   output logic                          error_detected,
-  output logic                          error_corrected
+  output logic                          error_corrected,
+  output logic [7:0]                    latency
 );
 
   typedef enum logic [1:0] {
@@ -89,80 +98,84 @@ module decoder #(
     S_SET
   } dec_st_t;
 
-  // Iteration data
-  logic [WIDTH-1:0][DEPTH-1:0]  data_in_i;
-  logic [WIDTH-1:0][DEPTH-1:0]  data_corrected_i;
-  logic error_detected_i, error_detected_r, error_detected_r2;
-  logic error_corrected_i, error_corrected_r, error_corrected_r2;
-  logic done_i;
-  logic [DEPTH-1:0] calc_row_parity;
-  logic [WIDTH-1:0] calc_col_parity;
-  
-  // CPC FEC Instance
-  cpc_fec #(
-    .WIDTH            (WIDTH),
-    .DEPTH            (DEPTH)
-  ) cpc_fec_u (
-    .data_in          (data_in_i),
-    .row_parity       (row_parity),
-    .col_parity       (col_parity),
-    .calc_row_parity  (calc_row_parity),
-    .calc_col_parity  (calc_col_parity),
-    .data_corrected   (data_corrected_i),
-    .error_detected   (error_detected_i),
-    .error_corrected  (error_corrected_i)
-  );
-  
-  // FSM Decoder state
-  dec_st_t dec_st;
-  
-  assign done_i = (row_parity==calc_row_parity) && (col_parity==calc_col_parity) || (error_detected_i && !error_corrected_i);
-  
-  // ----------------- Decoder FSM -----------------
-  
-  // Next state logic
-  always @(posedge clk or negedge rst_n) begin
-    if (!rst_n)
-      dec_st <= S_IDLE;
-   
-    else begin
-      case (dec_st)
-        S_IDLE:    dec_st <= (start) ? S_GET : S_IDLE;
-        S_GET:     dec_st <= S_DECODE;
-        S_DECODE:  dec_st <= (done_i) ? S_SET : S_DECODE;
-        S_SET:     dec_st <= S_IDLE;
-        default:   dec_st <= S_IDLE;
-      endcase
-      
-    end
-          
-  end
+  // Latency counter
+  logic [7:0] lat_cnt;
 
-  // Output logic
-  always @ (posedge clk or negedge rst_n) begin
+  always_ff @(posedge clk or negedge rst_n) begin
     if (!rst_n) begin
-      // Decoder outputs
-      done              <= 1'b0;
-      data_corrected    <= 1'b0;
-      error_detected    <= 1'b0;
-      error_corrected   <= 1'b0;
-      // FEC instance
-      data_in_i         <=  'b0;
-      error_detected_r  <= 1'b0;
-      error_detected_r2 <= 1'b0; 
-      error_corrected_r <= 1'b0;
-      error_corrected_r2<= 1'b0;
+      lat_cnt <= 'b0;
+      latency <= 'b0;
     end
     else begin
-      case(dec_st)
-        
-        // Wait for decode task
-        S_IDLE: begin
+      if (done) begin
+        latency <= lat_cnt;
+        lat_cnt <= 'b0;
+      end
+      else if (start || lat_cnt != 'b0)
+        lat_cnt <= lat_cnt + 1'b1;
+    end
+  end
+
+  generate
+    if (MODE == 0) begin : gen_iterative
+
+      // Iteration data
+      logic [WIDTH-1:0][DEPTH-1:0]  data_in_i;
+      logic [WIDTH-1:0][DEPTH-1:0]  data_corrected_i;
+      logic error_detected_i, error_detected_r, error_detected_r2;
+      logic error_corrected_i, error_corrected_r, error_corrected_r2;
+      logic done_i;
+      logic [DEPTH-1:0] calc_row_parity;
+      logic [WIDTH-1:0] calc_col_parity;
+
+      // CPC FEC Instance
+      cpc_fec #(
+        .WIDTH            (WIDTH),
+        .DEPTH            (DEPTH)
+      ) cpc_fec_u (
+        .data_in          (data_in_i),
+        .row_parity       (row_parity),
+        .col_parity       (col_parity),
+        .calc_row_parity  (calc_row_parity),
+        .calc_col_parity  (calc_col_parity),
+        .data_corrected   (data_corrected_i),
+        .error_detected   (error_detected_i),
+        .error_corrected  (error_corrected_i)
+      );
+
+      // FSM Decoder state
+      dec_st_t dec_st;
+
+      assign done_i = (row_parity==calc_row_parity) && (col_parity==calc_col_parity) || (error_detected_i && !error_corrected_i);
+
+      // ----------------- Decoder FSM -----------------
+
+      // Next state logic
+      always @(posedge clk or negedge rst_n) begin
+        if (!rst_n)
+          dec_st <= S_IDLE;
+
+        else begin
+          case (dec_st)
+            S_IDLE:    dec_st <= (start) ? S_GET : S_IDLE;
+            S_GET:     dec_st <= S_DECODE;
+            S_DECODE:  dec_st <= (done_i) ? S_SET : S_DECODE;
+            S_SET:     dec_st <= S_IDLE;
+            default:   dec_st <= S_IDLE;
+          endcase
+
+        end
+
+      end
+
+      // Output logic
+      always @ (posedge clk or negedge rst_n) begin
+        if (!rst_n) begin
           // Decoder outputs
           done              <= 1'b0;
-          data_corrected    <= data_corrected;
-          error_detected    <= error_detected;
-          error_corrected   <= error_corrected;
+          data_corrected    <= 1'b0;
+          error_detected    <= 1'b0;
+          error_corrected   <= 1'b0;
           // FEC instance
           data_in_i         <=  'b0;
           error_detected_r  <= 1'b0;
@@ -170,63 +183,183 @@ module decoder #(
           error_corrected_r <= 1'b0;
           error_corrected_r2<= 1'b0;
         end
-        
-        // Get data from decoder ports
-        S_GET: begin
-          // Decoder outputs
-          done              <= 1'b0;
-          data_corrected    <= data_corrected;
-          error_detected    <= error_detected;
-          error_corrected   <= error_corrected;
-          // FEC instance
-          data_in_i         <= data_in;
-          error_detected_r  <= 'b0;
-          error_detected_r2 <= 'b0; 
-          error_corrected_r <= 'b0;
-          error_corrected_r2<= 'b0;
+        else begin
+          case(dec_st)
+
+            // Wait for decode task
+            S_IDLE: begin
+              // Decoder outputs
+              done              <= 1'b0;
+              data_corrected    <= data_corrected;
+              error_detected    <= error_detected;
+              error_corrected   <= error_corrected;
+              // FEC instance
+              data_in_i         <=  'b0;
+              error_detected_r  <= 1'b0;
+              error_detected_r2 <= 1'b0; 
+              error_corrected_r <= 1'b0;
+              error_corrected_r2<= 1'b0;
+            end
+
+            // Get data from decoder ports
+            S_GET: begin
+              // Decoder outputs
+              done              <= 1'b0;
+              data_corrected    <= data_corrected;
+              error_detected    <= error_detected;
+              error_corrected   <= error_corrected;
+              // FEC instance
+              data_in_i         <= data_in;
+              error_detected_r  <= 'b0;
+              error_detected_r2 <= 'b0; 
+              error_corrected_r <= 'b0;
+              error_corrected_r2<= 'b0;
+            end
+
+            // Decoding state
+            S_DECODE: begin
+              // Decoder outputs
+              done              <= 1'b0;
+              data_corrected    <= data_corrected;
+              error_detected    <= error_detected;
+              error_corrected   <= error_corrected;
+              // FEC instance
+              data_in_i         <= data_corrected_i;
+              error_detected_r  <= error_detected_i;
+              error_detected_r2 <= error_detected_r;
+              error_corrected_r <= error_corrected_i;
+              error_corrected_r2<= error_corrected_r;
+            end
+
+            // Decode done, set data to decoder ports
+            S_SET: begin
+               // Decoder outputs
+                done         <= done_i;
+              // Handle when error was able / unable to correct
+              if(error_detected_i && !error_corrected_i) begin
+                data_corrected   <= data_in;
+                error_detected   <= error_detected_r;
+                error_corrected  <= error_corrected_r;
+              end else begin
+                data_corrected   <= data_corrected_i;
+                error_detected   <= error_detected_r2;
+                error_corrected  <= error_corrected_r2;
+              end
+
+                // FEC instance
+                data_in_i         <= data_in_i;
+                error_detected_r  <= error_detected_i;
+                error_detected_r2 <= error_detected_r;
+                error_corrected_r <= error_corrected_i;
+                error_corrected_r2<= error_corrected_r;
+            end
+          endcase
+
         end
-        
-        // Decoding state
-        S_DECODE: begin
-          // Decoder outputs
-          done              <= 1'b0;
-          data_corrected    <= data_corrected;
-          error_detected    <= error_detected;
-          error_corrected   <= error_corrected;
-          // FEC instance
-          data_in_i         <= data_corrected_i;
-          error_detected_r  <= error_detected_i;
-          error_detected_r2 <= error_detected_r;
-          error_corrected_r <= error_corrected_i;
-          error_corrected_r2<= error_corrected_r;
+      end
+
+    end else begin : gen_single_pass
+
+      // Syndromes are computed once and every correctable pattern is fixed
+      // in one combinational pass. The k-th highest mismatching row is
+      // paired with the k-th highest mismatching column, unpaired rows
+      // (columns) with column (row) 0: the same bits the iterative decoder
+      // ends up flipping.
+      logic [WIDTH-1:0][DEPTH-1:0]  dec_data;
+      logic [WIDTH-1:0][DEPTH-1:0]  flip;
+      logic [DEPTH-1:0]             row_syn, dec_row_syn;
+      logic [WIDTH-1:0]             col_syn, dec_col_syn;
+      logic                         total_parity, dec_total_parity;
+      logic                         syn_found;
+      logic                         dec_valid;
+      int                           row_rank [DEPTH];
+      int                           col_rank [WIDTH];
+      int                           row_cnt, col_cnt;
+
+      for (genvar si = 0; si < DEPTH; si = si + 1) begin : gen_row_syn
+        assign row_syn[si] = ^data_in[si] ^ row_parity[si];
+      end
+
+      for (genvar sj = 0; sj < WIDTH; sj = sj + 1) begin : gen_col_syn
+        wire [DEPTH-1:0] col_bits;
+        for (genvar si2 = 0; si2 < DEPTH; si2 = si2 + 1) begin : gen_col_bits
+          assign col_bits[si2] = data_in[si2][sj];
+        end
+        assign col_syn[sj] = ^col_bits ^ col_parity[sj];
+      end
+
+      assign total_parity = ^row_parity ^ ^col_parity;
+
+      if (MODE == 1) begin : gen_comb
+        assign dec_data         = data_in;
+        assign dec_row_syn      = row_syn;
+        assign dec_col_syn      = col_syn;
+        assign dec_total_parity = total_parity;
+        assign dec_valid        = start;
+      end else begin : gen_pipe
+        // Pipeline register between the syndromes and the correction
+        always_ff @(posedge clk or negedge rst_n) begin
+          if (!rst_n) begin
+            dec_data         <= 'b0;
+            dec_row_syn      <= 'b0;
+            dec_col_syn      <= 'b0;
+            dec_total_parity <= 1'b0;
+            dec_valid        <= 1'b0;
+          end
+          else begin
+            dec_valid <= start;
+            if (start) begin
+              dec_data         <= data_in;
+              dec_row_syn      <= row_syn;
+              dec_col_syn      <= col_syn;
+              dec_total_parity <= total_parity;
+            end
+          end
         end
-        
-        // Decode done, set data to decoder ports
-        S_SET: begin
-           // Decoder outputs
-            done         <= done_i;
-          // Handle when error was able / unable to correct
-          if(error_detected_i && !error_corrected_i) begin
-            data_corrected   <= data_in;
-            error_detected   <= error_detected_r;
-            error_corrected  <= error_corrected_r;
-          end else begin
-            data_corrected   <= data_corrected_i;
-            error_detected   <= error_detected_r2;
-            error_corrected  <= error_corrected_r2;
+      end
+
+      always_comb begin : single_pass_correction
+        row_cnt = 0;
+        for (int i = DEPTH-1; i >= 0; i--) begin
+          row_rank[i] = row_cnt;
+          row_cnt     = row_cnt + dec_row_syn[i];
+        end
+        col_cnt = 0;
+        for (int j = WIDTH-1; j >= 0; j--) begin
+          col_rank[j] = col_cnt;
+          col_cnt     = col_cnt + dec_col_syn[j];
+        end
+
+        for (int i = 0; i < DEPTH; i++)
+          for (int j = 0; j < WIDTH; j++)
+            flip[i][j] = (dec_row_syn[i] && dec_col_syn[j] && row_rank[i] == col_rank[j])
+                       ^ (j == 0 && dec_row_syn[i] && row_rank[i] >= col_cnt)
+                       ^ (i == 0 && dec_col_syn[j] && col_rank[j] >= row_cnt);
+      end
+
+      assign syn_found = (|dec_row_syn) || (|dec_col_syn);
+
+      // Output register
+      always_ff @(posedge clk or negedge rst_n) begin
+        if (!rst_n) begin
+          done            <= 1'b0;
+          data_corrected  <=  'b0;
+          error_detected  <= 1'b0;
+          error_corrected <= 1'b0;
+        end
+        else begin
+          done <= dec_valid;
+          if (dec_valid) begin
+            // Odd total parity is uncorrectable, data is passed through
+            data_corrected  <= dec_total_parity ? dec_data : dec_data ^ flip;
+            error_detected  <= syn_found || dec_total_parity;
+            error_corrected <= syn_found && !dec_total_parity;
           end
-            
-            // FEC instance
-            data_in_i         <= data_in_i;
-            error_detected_r  <= error_detected_i;
-            error_detected_r2 <= error_detected_r;
-            error_corrected_r <= error_corrected_i;
-            error_corrected_r2<= error_corrected_r;
         end
-      endcase
+      end
 
     end
-  end
+  endgenerate
 
 endmodule
 
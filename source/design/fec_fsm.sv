@@ -8,6 +8,7 @@ module dl_fec_fsm(
   // UART Control
   input  logic [2**UART_RX_FAW-1:0][UART_MDW-1:0] uart_rx_array,
   input  logic                        uart_rx_done,
+  output logic                        uart_rx_accept,
   input  logic [UART_RX_FAW-1:0]      uart_rx_level,
   output logic                        uart_rx_fifo_flush,
   output logic                        uart_rx_fifo_reg,
@@ -26,7 +27,7 @@ module dl_fec_fsm(
   input  logic                        dl_fec_enc1_done,
   output logic [1:0]                  dl_ctrl_enc_used,
   output logic                        dl_ctrl_start,
-  input  logic                        dl_ctrl_ser_en,
+  input  logic                        dl_ctrl_ready,
   // Register access
   output  logic                       psel,
   output  logic                       penable,
@@ -34,50 +35,68 @@ module dl_fec_fsm(
   output  logic [APB_ADDR_WIDTH-1:0]  paddr,
   output  logic [APB_DATA_WIDTH-1:0]  pwdata,  
   input   logic [APB_DATA_WIDTH-1:0]  prdata,
-  input   logic                       pslverr
+  input   logic                       pslverr,
+  // Performance counters
+  output  logic [1:0]                 uart_err_event, // {frame error, timeout} aborting a command
+  output  logic                       dl_ctrl_stall   // Encoded frame waiting on the serializer
   );
   
-  typedef enum logic [4:0] {
-    //S_UNDEF                   = 5'bx,
-    S_IDLE                    = 5'd0,
-    S_COMMAND                 = 5'd1,
-    S_CMD_ERR_UART_TX_REQUEST = 5'd2,
-    S_CMD_ERR_UART_TX_WRITE   = 5'd3,
+  typedef enum logic [5:0] {
+    //S_UNDEF                   = 6'bx,
+    S_IDLE                    = 6'd0,
+    S_COMMAND                 = 6'd1,
+    S_CMD_ERR_UART_TX_REQUEST = 6'd2,
+    S_CMD_ERR_UART_TX_WRITE   = 6'd3,
     
     // FEC Message transmit
-    S_MESSAGE_LENGHT_WAIT     = 5'd4, // Wait Message lenght
-    S_MESSAGE_LENGHT          = 5'd5,
-    S_MESSAGE_LENGHT_CHECK    = 5'd6,
-    S_MESSAGE_TAG_WAIT        = 5'd7, // Wait Message tag
-    S_MESSAGE_TAG             = 5'd8,
-    S_FEC_START_ENCODE_1      = 5'd9, // Start 16-bit encoder
-    S_FEC_DONE_ENCODE_1       = 5'd10,
-    S_DLCTL_ENC1_START        = 5'd11,
-    S_DLCTL_ENC1_EXIT         = 5'd12,
+    S_MESSAGE_LENGHT_WAIT     = 6'd4, // Wait Message lenght
+    S_MESSAGE_LENGHT          = 6'd5,
+    S_MESSAGE_LENGHT_CHECK    = 6'd6,
+    S_MESSAGE_TAG_WAIT        = 6'd7, // Wait Message tag
+    S_MESSAGE_TAG             = 6'd8,
+    S_FEC_START_ENCODE_1      = 6'd9, // Start 16-bit encoder
+    S_FEC_DONE_ENCODE_1       = 6'd10,
+    S_DLCTL_ENC1_START        = 6'd11,
+    S_DLCTL_ENC1_EXIT         = 6'd12,
     
-    S_MESSAGE_DATA_WAIT       = 5'd13,
-    S_MESSAGE_DATA            = 5'd14,
-    S_UART_RX_FIFO_REG        = 5'd15,
-    S_FEC_START_ENCODE_0      = 5'd16, // Start 64-bit encoder
-    S_FEC_DONE_ENCODE_0       = 5'd17,
-    S_DLCTL_ENC0_START        = 5'd18,
-    S_DLCTL_ENC0_EXIT         = 5'd19,
+    S_MESSAGE_DATA_WAIT       = 6'd13,
+    S_MESSAGE_DATA            = 6'd14,
+    S_UART_RX_FIFO_REG        = 6'd15,
+    S_FEC_START_ENCODE_0      = 6'd16, // Start 64-bit encoder
+    S_FEC_DONE_ENCODE_0       = 6'd17,
+    S_DLCTL_ENC0_START        = 6'd18,
+    S_DLCTL_ENC0_EXIT         = 6'd19,
     
-    S_MESSAGE_UART_TX_REQUEST = 5'd20,
-    S_MESSAGE_UART_TX_WRITE   = 5'd21,
+    S_MESSAGE_UART_TX_REQUEST = 6'd20,
+    S_MESSAGE_UART_TX_WRITE   = 6'd21,
     
     // Register Access
-    S_REG_ADDRESS_WAIT        = 5'd22, // Wait Register address
-    S_REG_ADDRESS             = 5'd23,
+    S_REG_ADDRESS_WAIT        = 6'd22, // Wait Register address
+    S_REG_ADDRESS             = 6'd23,
     
-    S_REG_WRITE_DATA_WAIT     = 5'd24, // Register Write
-    S_REG_WRITE_APB_SET_DATA  = 5'd25, // S_REG_APB_WRITE_DATA relpaced
-    S_REG_WRITE_TX_REQUEST    = 5'd26, // 
-    S_REG_WRITE_TX_WRITE      = 5'd27, // 
-        
-    S_REG_READ_APB_GET_DATA   = 5'd28, // Register Read S_REG_APB_READ_DATA replaced
-    S_REG_READ_TX_REQUEST     = 5'd29, // S_REG_UART_TX_REQUEST replaced
-    S_REG_READ_TX_WRITE       = 5'd30  // S_REG_UART_TX_WRITE
+    S_REG_WRITE_DATA_WAIT     = 6'd24, // Register Write
+    S_REG_WRITE_APB_SET_DATA  = 6'd25, // S_REG_APB_WRITE_DATA relpaced
+    S_REG_WRITE_TX_REQUEST    = 6'd26, // 
+    S_REG_WRITE_TX_WRITE      = 6'd27, // 
+        
+    S_REG_READ_APB_GET_DATA   = 6'd28, // Register Read S_REG_APB_READ_DATA replaced
+    S_REG_READ_TX_REQUEST     = 6'd29, // S_REG_UART_TX_REQUEST replaced
+    S_REG_READ_TX_WRITE       = 6'd30, // S_REG_UART_TX_WRITE
+    
+    // Register burst access
+    S_BURST_COUNT_WAIT        = 6'd31, // Wait burst mode and count
+    S_BURST_COUNT             = 6'd32,
+    S_BURST_ADDRESS_WAIT      = 6'd33, // Wait (start or listed) register address
+    S_BURST_ADDRESS           = 6'd34,
+    S_BURST_WRITE_DATA_WAIT   = 6'd35, // Burst write
+    S_BURST_WRITE_APB         = 6'd36,
+    S_BURST_WRITE_APB_END     = 6'd37,
+    S_BURST_READ_APB          = 6'd38, // Burst read
+    S_BURST_READ_APB_DATA     = 6'd39,
+    S_BURST_READ_TX_WRITE     = 6'd40,
+    S_BURST_NEXT              = 6'd41,
+    S_BURST_TX_REQUEST        = 6'd42, // Response header
+    S_BURST_TX_WRITE          = 6'd43
     
    } state_fsm_dl_t;
     state_fsm_dl_t state, next_state;
@@ -88,6 +107,9 @@ module dl_fec_fsm(
   logic [31:0] dl_reg_rdata;
   logic dl_txn_done, dl_ready, dl_cmd_error;
   logic pslverr_r;
+  logic        dl_burst_list;  // Burst addresses: 0: start address + 4, 1: one per register
+  logic [7:0]  dl_burst_err;   // Burst write accesses answered with pslverr
+  logic [2:0]  dl_burst_byte;  // Read data bytes written to the UART TX FIFO
     
   logic                uart_tx_wr;
   logic [UART_MDW-1:0] uart_tx_wdata;
@@ -107,6 +129,40 @@ module dl_fec_fsm(
   
   assign dl_ready = (uart_rx_level < 'd7);
   
+  // Buffered UART bytes are only taken into the RX FIFO in the states
+  // waiting for them, so a byte never lands beyond the current field
+  always_comb begin
+    case(state)
+      S_IDLE,
+      S_MESSAGE_LENGHT_WAIT,
+      S_MESSAGE_TAG_WAIT,
+      S_MESSAGE_DATA_WAIT,
+      S_REG_ADDRESS_WAIT,
+      S_BURST_COUNT_WAIT:    uart_rx_accept = 1'b1;
+      S_BURST_ADDRESS_WAIT:  uart_rx_accept = (uart_rx_level == 'd0);
+      S_REG_WRITE_DATA_WAIT,
+      S_BURST_WRITE_DATA_WAIT: uart_rx_accept = (uart_rx_level < 'd4);
+      default:               uart_rx_accept = 1'b0;
+    endcase
+  end
+  
+  // Performance events: UART errors seen in the states that abort on them
+  // and cycles an encoded frame waits for dl_ctrl
+  always_comb begin
+    case(state)
+      S_MESSAGE_LENGHT_WAIT,
+      S_MESSAGE_TAG_WAIT,
+      S_MESSAGE_DATA_WAIT,
+      S_REG_ADDRESS_WAIT,
+      S_BURST_COUNT_WAIT,
+      S_BURST_ADDRESS_WAIT,
+      S_BURST_WRITE_DATA_WAIT: uart_err_event = uart_fatal_errors;
+      default:                 uart_err_event = 2'b0;
+    endcase
+  end
+  
+  assign dl_ctrl_stall = ((state == S_DLCTL_ENC0_START) | (state == S_DLCTL_ENC1_START)) & ~dl_ctrl_ready;
+  
   // Current state logic
   always_ff @(posedge clk or negedge rst_n) begin
     if(!rst_n)
@@ -136,6 +192,9 @@ module dl_fec_fsm(
           CMD_REG_READ:   next_state = S_REG_ADDRESS_WAIT;
           CMD_REG_WRITE:  next_state = S_REG_ADDRESS_WAIT;
           CMD_TX_MSG:     next_state = S_MESSAGE_LENGHT_WAIT;
+          CMD_TX_STREAM:  next_state = S_MESSAGE_LENGHT_WAIT;
+          CMD_REG_BURST_READ:  next_state = S_BURST_COUNT_WAIT;
+          CMD_REG_BURST_WRITE: next_state = S_BURST_COUNT_WAIT;
           default:                   next_state = S_CMD_ERR_UART_TX_REQUEST;
         endcase       
       end
@@ -199,14 +258,17 @@ module dl_fec_fsm(
       end
       
       S_FEC_DONE_ENCODE_1:begin
-        if(dl_fec_enc1_done && !dl_ctrl_ser_en)
+        if(dl_fec_enc1_done)
           next_state = S_DLCTL_ENC1_START;
         else
           next_state = state;
       end
       
       S_DLCTL_ENC1_START: begin
-        next_state = S_DLCTL_ENC1_EXIT;
+        if(dl_ctrl_ready)
+          next_state = S_DLCTL_ENC1_EXIT;
+        else
+          next_state = state;
       end
             
       S_DLCTL_ENC1_EXIT: begin
@@ -234,10 +296,7 @@ module dl_fec_fsm(
       end
       
       S_FEC_START_ENCODE_0: begin // 64-bit encoder
-      //if(!dl_ctrl_ser_en)
-          next_state = S_FEC_DONE_ENCODE_0;
-      //else
-      //  next_state = state;
+        next_state = S_FEC_DONE_ENCODE_0;
       end
       
       S_FEC_DONE_ENCODE_0:begin
@@ -248,7 +307,7 @@ module dl_fec_fsm(
       end
       
       S_DLCTL_ENC0_START: begin
-        if(!dl_ctrl_ser_en)
+        if(dl_ctrl_ready)
           next_state = S_DLCTL_ENC0_EXIT;
         else
           next_state = state;
@@ -256,8 +315,9 @@ module dl_fec_fsm(
             
       S_DLCTL_ENC0_EXIT: begin
       //if(dl_msg_cnt>=dl_msg_len)
-        if(dl_txn_done)
-          //next_state = S_IDLE;
+        if(dl_txn_done & dl_cmd==CMD_TX_STREAM) // Streamed messages are not answered
+          next_state = S_IDLE;
+        else if(dl_txn_done)
           next_state = S_MESSAGE_UART_TX_REQUEST;
         else
           next_state = S_MESSAGE_DATA;
@@ -348,6 +408,102 @@ module dl_fec_fsm(
       else
         next_state = state;
 	  end
+      
+      
+      // Register burst access ===================
+      
+      
+      S_BURST_COUNT_WAIT: begin
+        if(uart_fatal_errors)
+          next_state = S_CMD_ERR_UART_TX_REQUEST;
+        else if(uart_rx_done)
+          next_state = S_BURST_COUNT;
+        else
+          next_state = state;
+      end
+      
+      S_BURST_COUNT: begin
+        if(uart_rx_array_0[6:0]=='d0)
+          next_state = S_CMD_ERR_UART_TX_REQUEST;
+        else if(dl_cmd==CMD_REG_BURST_READ) // Read data follows the response header
+          next_state = S_BURST_TX_REQUEST;
+        else
+          next_state = S_BURST_ADDRESS_WAIT;
+      end
+      
+      // Level based: with no RX buffer the address may arrive before this state
+      S_BURST_ADDRESS_WAIT: begin
+        if(uart_fatal_errors)
+          next_state = S_CMD_ERR_UART_TX_REQUEST;
+        else if(uart_rx_level!='d0 & ~uart_rx_fifo_flush)
+          next_state = S_BURST_ADDRESS;
+        else
+          next_state = state;
+      end
+      
+      S_BURST_ADDRESS: begin
+        if(dl_cmd==CMD_REG_BURST_READ)
+          next_state = S_BURST_READ_APB;
+        else
+          next_state = S_BURST_WRITE_DATA_WAIT;
+      end
+      
+      S_BURST_WRITE_DATA_WAIT: begin
+        if(uart_fatal_errors)
+          next_state = S_CMD_ERR_UART_TX_REQUEST;
+        else if(uart_rx_level=='d4)
+          next_state = S_BURST_WRITE_APB;
+        else
+          next_state = state;
+      end
+      
+      S_BURST_WRITE_APB: begin
+        next_state = S_BURST_WRITE_APB_END;
+      end
+      
+      S_BURST_WRITE_APB_END: begin
+        next_state = S_BURST_NEXT;
+      end
+      
+      S_BURST_READ_APB: begin
+        next_state = S_BURST_READ_APB_DATA;
+      end
+      
+      S_BURST_READ_APB_DATA: begin
+        next_state = S_BURST_READ_TX_WRITE;
+      end
+      
+      S_BURST_READ_TX_WRITE: begin
+        if(dl_burst_byte=='d4)
+          next_state = S_BURST_NEXT;
+        else
+          next_state = state;
+      end
+      
+      S_BURST_NEXT: begin
+        if(dl_msg_cnt>=dl_msg_len)
+          next_state = (dl_cmd==CMD_REG_BURST_READ) ? S_IDLE : S_BURST_TX_REQUEST;
+        else if(dl_burst_list)
+          next_state = S_BURST_ADDRESS_WAIT;
+        else
+          next_state = (dl_cmd==CMD_REG_BURST_READ) ? S_BURST_READ_APB : S_BURST_WRITE_DATA_WAIT;
+      end
+      
+      S_BURST_TX_REQUEST: begin
+        if(uart_tx_grant)
+          next_state = S_BURST_TX_WRITE;
+        else
+          next_state = state;
+      end
+      
+      S_BURST_TX_WRITE: begin
+        if(dl_cmd==CMD_REG_BURST_READ & uart_tx_level=='d2)
+          next_state = S_BURST_ADDRESS_WAIT;
+        else if(dl_cmd==CMD_REG_BURST_WRITE & uart_tx_level=='d3)
+          next_state = S_IDLE;
+        else
+          next_state = state;
+      end
 	        
     endcase
   end
@@ -363,6 +519,9 @@ module dl_fec_fsm(
       dl_reg_addr        <= 'b0;
       dl_reg_rdata       <= 'b0;
       dl_txn_done        <= 'b0;
+      dl_burst_list      <= 1'b0;
+      dl_burst_err       <= 'b0;
+      dl_burst_byte      <= 'b0;
       
       uart_rx_fifo_flush <= 'b0;
       uart_rx_fifo_reg   <= 'b0;
@@ -396,6 +555,9 @@ module dl_fec_fsm(
           dl_reg_addr        <= 'b0;
           dl_reg_rdata       <= 'b0;
           dl_txn_done        <= 'b0;
+          dl_burst_list      <= 1'b0;
+          dl_burst_err       <= 'b0;
+          dl_burst_byte      <= 'b0;
           
           uart_rx_fifo_flush <= 'b0;
           uart_rx_fifo_reg   <= 'b0;
@@ -424,6 +586,9 @@ module dl_fec_fsm(
             CMD_REG_READ:  dl_cmd_error <= 1'b0;
             CMD_REG_WRITE: dl_cmd_error <= 1'b0;
             CMD_TX_MSG:    dl_cmd_error <= 1'b0;
+            CMD_TX_STREAM: dl_cmd_error <= 1'b0;
+            CMD_REG_BURST_READ:  dl_cmd_error <= 1'b0;
+            CMD_REG_BURST_WRITE: dl_cmd_error <= 1'b0;
             default:       dl_cmd_error <= 1'b1;
           endcase
         end
@@ -486,14 +651,21 @@ module dl_fec_fsm(
         S_FEC_DONE_ENCODE_1: begin
           dl_ctrl_enc_used   <= 'b1;
           dl_fec_crc1_start  <= 'b0;
+          if(uart_rx_done)
+            dl_msg_cnt <= dl_msg_cnt + 8'b1;
         end
         
+        // Hand the frame over as soon as the downlink buffer is free
         S_DLCTL_ENC1_START: begin
-          dl_ctrl_start      <= 'b1;
+          dl_ctrl_start      <= dl_ctrl_ready;
+          if(uart_rx_done)
+            dl_msg_cnt <= dl_msg_cnt + 8'b1;
         end
         
         S_DLCTL_ENC1_EXIT: begin
           dl_ctrl_start      <= 'b0;
+          if(uart_rx_done)
+            dl_msg_cnt <= dl_msg_cnt + 8'b1;
         end
                 
         S_MESSAGE_DATA_WAIT: begin
@@ -505,6 +677,8 @@ module dl_fec_fsm(
         end
         
         S_MESSAGE_DATA: begin
+         if(uart_rx_done)
+           dl_msg_cnt <= dl_msg_cnt + 8'b1;
          if(/*uart_rx_level=='d7 ||*/ dl_msg_cnt>=dl_msg_len) begin
            dl_txn_done        <= 'b1;
           //  uart_rx_fifo_flush <= 'b1;
@@ -520,24 +694,32 @@ module dl_fec_fsm(
           uart_rx_fifo_reg   <= 'b1;
         end
         
+        // The chunk is registered, the RX FIFO is freed for the next one
+        // while this frame is encoded and waits for the downlink
         S_FEC_START_ENCODE_0: begin // 64-bit encoding cluster
           uart_rx_fifo_reg   <= 'b0;
+          uart_rx_fifo_flush <= 'b1;
           dl_fec_crc0_start  <= 'b1;
         end
         
         S_FEC_DONE_ENCODE_0: begin
+          uart_rx_fifo_flush <= 'b0;
           dl_ctrl_enc_used   <= 'b0;
           dl_fec_crc0_start  <= 'b0;
+          if(uart_rx_done)
+            dl_msg_cnt <= dl_msg_cnt + 8'b1;
         end
         
         S_DLCTL_ENC0_START: begin
-          uart_rx_fifo_flush <= 'b1;
-          dl_ctrl_start      <= 'b1;
+          dl_ctrl_start      <= dl_ctrl_ready;
+          if(uart_rx_done)
+            dl_msg_cnt <= dl_msg_cnt + 8'b1;
         end
         
         S_DLCTL_ENC0_EXIT: begin
-          uart_rx_fifo_flush <= 'b0;
           dl_ctrl_start      <= 'b0;
+          if(uart_rx_done)
+            dl_msg_cnt <= dl_msg_cnt + 8'b1;
         end
         
         S_MESSAGE_UART_TX_REQUEST: begin
@@ -678,6 +860,126 @@ module dl_fec_fsm(
           end
         end
         
+        
+        // Register burst access ===================
+        
+        
+        S_BURST_COUNT_WAIT: begin
+          uart_fatal_errors_r<= uart_fatal_errors;
+          uart_rx_fifo_flush <= 'b0;
+        end
+        
+        S_BURST_COUNT: begin
+          dl_burst_list      <= uart_rx_array_0[7];
+          dl_msg_len         <= {1'b0, uart_rx_array_0[6:0]};
+          uart_rx_fifo_flush <= 'b1;
+        end
+        
+        S_BURST_ADDRESS_WAIT: begin
+          uart_fatal_errors_r<= uart_fatal_errors;
+          uart_rx_fifo_flush <= 'b0;
+          uart_tx_wr         <= 1'b0;
+          uart_tx_wdata      <= 'b0;
+        end
+        
+        S_BURST_ADDRESS: begin
+          dl_reg_addr        <= uart_rx_array_0;
+          uart_rx_fifo_flush <= 'b1;
+        end
+        
+        S_BURST_WRITE_DATA_WAIT: begin
+          uart_fatal_errors_r<= uart_fatal_errors;
+          uart_rx_fifo_flush <= 'b0;
+        end
+        
+        S_BURST_WRITE_APB: begin
+          psel               <= 'b1;
+          penable            <= 'b1;
+          pwrite             <=  REG_WRITE; // register_op
+          paddr              <=  dl_reg_addr;
+          pwdata             <=  {uart_rx_array[0],  // MSB
+                                  uart_rx_array[1],
+                                  uart_rx_array[2],
+                                  uart_rx_array[3]}; // LSB
+          uart_rx_fifo_flush <= 'b1;
+          dl_msg_cnt         <= dl_msg_cnt + 8'b1;
+        end
+        
+        S_BURST_WRITE_APB_END: begin
+          psel               <= 'b0;
+          penable            <= 'b0;
+          pwrite             <= 'b0;
+          paddr              <= 8'b0;
+          pwdata             <= 32'b0;
+          uart_rx_fifo_flush <= 'b0;
+        end
+        
+        S_BURST_READ_APB: begin
+          psel               <= 'b1;
+          penable            <= 'b1;
+          pwrite             <=  REG_READ; // register_op
+          paddr              <=  dl_reg_addr;
+          uart_rx_fifo_flush <= 'b0;
+          dl_msg_cnt         <= dl_msg_cnt + 8'b1;
+        end
+        
+        S_BURST_READ_APB_DATA: begin
+          psel               <= 'b0;
+          penable            <= 'b0;
+          pwrite             <= 'b0;
+          paddr              <= 8'b0;
+          dl_reg_rdata       <= prdata;
+          dl_burst_byte      <= 'b0;
+        end
+        
+        // MSB first, one byte whenever the TX FIFO has room
+        S_BURST_READ_TX_WRITE: begin
+          if(dl_burst_byte<'d4 & uart_tx_wr==1'b0 & uart_tx_level<(2**UART_TX_FAW-2)) begin
+            uart_tx_wr    <= 1'b1;
+            uart_tx_wdata <= dl_reg_rdata[31:24];
+            dl_reg_rdata  <= {dl_reg_rdata[23:0], 8'b0};
+            dl_burst_byte <= dl_burst_byte + 3'b1;
+          end
+          else begin
+            uart_tx_wr    <= 1'b0;
+            uart_tx_wdata <= 'b0;
+          end
+        end
+        
+        // Write errors are taken once reg_cfg has registered pslverr
+        S_BURST_NEXT: begin
+          uart_tx_wr         <= 1'b0;
+          uart_tx_wdata      <= 'b0;
+          if(dl_cmd==CMD_REG_BURST_WRITE & pslverr)
+            dl_burst_err <= dl_burst_err + 8'b1;
+          if(~dl_burst_list)
+            dl_reg_addr <= dl_reg_addr + 8'd4;
+        end
+        
+        S_BURST_TX_REQUEST: begin
+          uart_rx_fifo_flush <= 'b0;
+          uart_tx_req        <= 1'b1;
+        end
+        
+        S_BURST_TX_WRITE: begin
+          if(uart_tx_level=='d0 & uart_tx_wr==1'b0) begin       // Command ID (command_t)
+            uart_tx_wr    <= 1'b1;
+            uart_tx_wdata <= (dl_cmd==CMD_REG_BURST_READ) ? RSP_BURST_READ_RES : RSP_BURST_WRITE_RES;
+          end
+          else if(uart_tx_level=='d1 & uart_tx_wr==1'b0) begin  // Register count
+            uart_tx_wr    <= 1'b1;
+            uart_tx_wdata <= dl_msg_len;
+          end
+          else if(uart_tx_level=='d2 & uart_tx_wr==1'b0 & dl_cmd==CMD_REG_BURST_WRITE) begin // Access errors
+            uart_tx_wr    <= 1'b1;
+            uart_tx_wdata <= dl_burst_err;
+          end
+          else begin
+            uart_tx_wr    <= 1'b0;
+            uart_tx_wdata <= 'b0;
+          end
+        end
+        
         default: begin
           dl_cmd             <= 'b0;
           dl_cmd_error       <= 1'b0;
@@ -687,6 +989,9 @@ module dl_fec_fsm(
           dl_reg_addr        <= 'b0;
           dl_reg_rdata       <= 'b0;
           dl_txn_done        <= 'b0;
+          dl_burst_list      <= 1'b0;
+          dl_burst_err       <= 'b0;
+          dl_burst_byte      <= 'b0;
           
           uart_rx_fifo_flush <= 'b0;
           uart_rx_fifo_reg   <= 'b0;
@@ -10,12 +10,13 @@ module fec_top(
   // UART
   input  logic  uart_rx,
   output logic  uart_tx,
+  output logic  uart_cts,
    // Downlink
   output logic  dl_ready,
-  output logic  dl_out,
+  output logic  [SERIAL_LANES-1:0] dl_out,
   output logic  dl_en,
   // Uplink
-  input  logic  ul_in,
+  input  logic  [SERIAL_LANES-1:0] ul_in,
   input  logic  ul_en
   );
   
@@ -35,7 +36,10 @@ module fec_top(
   logic                dl_fec_enc1_done;
   logic                dl_ctrl_start;
   logic                dl_ctrl_done;
+  logic                dl_ctrl_ready;
   logic [1:0]          dl_ctrl_enc_used;
+  logic                dl_ctrl_stall;
+  logic [1:0]          dl_uart_err_event;
   logic                uart_tx_flush_fsm;
   logic                uart_rx_flush_fsm;
     
@@ -65,6 +69,7 @@ module fec_top(
   logic                uart_rx_empty;
   logic                uart_rx_full;
   logic                uart_rx_done;
+  logic                uart_rx_accept;
   logic [2**UART_RX_FAW-1:0][UART_MDW-1:0] uart_rx_array_reg;
   logic [UART_RX_FAW-1:0] uart_rx_level;
   logic                uart_rx_level_above;
@@ -78,6 +83,7 @@ module fec_top(
   logic                uart_overrun_flag;
   logic                uart_timeout_flag;
   logic [1:0]          uart_fatal_errors;
+  logic [7:0]          uart_rx_buf_count;
   
   // Downlink FEC signals
   logic [2**UART_RX_FAW-1:0][UART_MDW-1:0] dl_fec_data_out;
@@ -90,6 +96,8 @@ module fec_top(
   logic [CRC0_WIDTH-1:0]       dl_fec_crc0_data;
   logic [CRC1_WIDTH-1:0]       dl_fec_crc1_data;
   logic [SERIAL_DIV_WIDTH-1:0] dl_ctrl_clk_div;
+  logic [6:0]                  ser_lane_cfg;
+  logic [1:0]                  ser_burst_cfg;
   
   logic                        dl_uart_tx_wr;
   logic [UART_MDW-1:0]         dl_uart_tx_wdata;  
@@ -114,9 +122,12 @@ module fec_top(
   logic [31:0] dl_err_inj_mask_0;
   logic [31:0] dl_err_inj_mask_1;
   logic dl_err_inj_enable, dl_err_inj_enable_clear;
+  logic [1:0] perf_ctrl;
+  logic [PERF_CNT_NUM-1:0][31:0] perf_cnt;
   reg_cfg #(
     .ADDR_WIDTH             (APB_ADDR_WIDTH),
-    .DATA_WIDTH             (APB_DATA_WIDTH)
+    .DATA_WIDTH             (APB_DATA_WIDTH),
+    .PERF_CNT_NUM           (PERF_CNT_NUM)
   ) reg_cfg_u (
     .pclk                   (clk),
     .presetn                (rst_n),
@@ -128,13 +139,17 @@ module fec_top(
     .prdata                 (apb_prdata),
     .pslverr                (apb_pslverr),
     .DL_SER_CLK_DIV         (dl_ctrl_clk_div),
+    .SER_LANE_CFG           (ser_lane_cfg),
+    .SER_BURST_CFG          (ser_burst_cfg),
     .DL_ERR_INJ_MASK_0      (dl_err_inj_mask_0),
     .DL_ERR_INJ_MASK_1      (dl_err_inj_mask_1),
     .DL_ERR_INJ_ENABLE      (dl_err_inj_enable),
     .DL_ERR_INJ_ENABLE_CLEAR(dl_err_inj_enable_clear),
     .UART_PR                (uart_prescaler_reg),
     .UART_CTRL              (uart_ctrl_reg),
-    .UART_CFG               (uart_cfg_reg)
+    .UART_CFG               (uart_cfg_reg),
+    .PERF_CTRL              (perf_ctrl),
+    .PERF_CNT               (perf_cnt)
   );
   
   // ===========   UART   ===========
@@ -158,6 +173,8 @@ module fec_top(
     .MDW              (UART_MDW), 
     .TX_FAW           (UART_TX_FAW),
     .RX_FAW           (UART_RX_FAW),
+    .RX_BUF_FAW       (UART_RX_BUF_FAW),
+    .CTS_MARGIN       (UART_CTS_MARGIN),
     .SC               (UART_SC),
     .GFLEN            (UART_GFLEN)
     ) uart_u (
@@ -200,6 +217,9 @@ module fec_top(
     .rx_level         (uart_rx_level),
     .rx_level_above   (uart_rx_level_above),
     .rx_done          (uart_rx_done),
+    .rx_accept        (uart_rx_accept),
+    .cts              (uart_cts),
+    .rx_buf_count     (uart_rx_buf_count),
     .rx_array_reg     (uart_rx_array_reg),
     .rx_fifo_flush    (uart_rx_flush),
       
@@ -239,6 +259,7 @@ module fec_top(
     // UART Control
     .uart_rx_array          (uart_rx_array_reg),
     .uart_rx_done           (uart_rx_done),
+    .uart_rx_accept         (uart_rx_accept),
     .uart_rx_level          (uart_rx_level),
     .uart_rx_fifo_flush     (uart_rx_flush_fsm),
     .uart_rx_fifo_reg       (uart_rx_fifo_reg),
@@ -257,7 +278,7 @@ module fec_top(
     .dl_fec_enc1_done       (dl_fec_enc1_done),
     .dl_ctrl_enc_used       (dl_ctrl_enc_used),
     .dl_ctrl_start          (dl_ctrl_start),
-    .dl_ctrl_ser_en         (dl_en),
+    .dl_ctrl_ready          (dl_ctrl_ready),
     // Register Access
     .psel                   (apb_psel),
     .penable                (apb_penable),
@@ -265,7 +286,10 @@ module fec_top(
     .paddr                  (apb_paddr),
     .pwdata                 (apb_pwdata),
     .prdata                 (apb_prdata),
-    .pslverr                (apb_pslverr)
+    .pslverr                (apb_pslverr),
+    // Performance counters
+    .uart_err_event         (dl_uart_err_event),
+    .dl_ctrl_stall          (dl_ctrl_stall)
   );
 
   // ========= DL FEC Engine =========
@@ -300,6 +324,7 @@ module fec_top(
     .msg_len              (dl_msg_len),
     .enc_used             (dl_ctrl_enc_used[0]),
     .dl_start             (dl_ctrl_start),
+    .dl_ready             (dl_ctrl_ready),
     .dl_done              (dl_ctrl_done),
     .dl_out               (dl_out),
     .dl_en                (dl_en),
@@ -310,6 +335,9 @@ module fec_top(
     .enc1_row_p           (dl_fec_enc1_row_p),
     .enc1_col_p           (dl_fec_enc1_col_p),
     .ser_clk_div          (dl_ctrl_clk_div),
+    .ser_lanes            (ser_lane_cfg[1:0]),
+    .ser_ddr              (ser_lane_cfg[2]),
+    .burst_mode           (ser_burst_cfg[0]),
     .err_inj_mask_0       (dl_err_inj_mask_0),
     .err_inj_mask_1       (dl_err_inj_mask_1),
     .err_inj_enable       (dl_err_inj_enable),
@@ -337,6 +365,7 @@ module fec_top(
   logic                                 ul_mon_enc_used;
   logic                                 ul_mon_data_rd;
   logic [UL_FIFO_FAW-1:0]               ul_mon_data_level;
+  logic                                 ul_mon_data_full;
   logic [2**UART_RX_FAW-2:0][UART_MDW-1:0] ul_mon_data_out;
   logic [CRC0_WIDTH-1:0]                ul_mon_crc0_data;
   logic [ENC0_DATA_DEPTH-1:0]           ul_mon_cenc0_row_p;
@@ -385,6 +414,9 @@ module fec_top(
     .rst_n            (rst_n),
     .ul_in            (ul_in),
     .ul_en            (ul_en),
+    .ul_lanes         (ser_lane_cfg[5:4]),
+    .ul_ddr           (ser_lane_cfg[6]),
+    .ul_burst         (ser_burst_cfg[1]),
     .msg_cnt          (ul_mon_msg_cnt),
     .ul_fec_enc_used  (ul_fec_enc_used),
     .ul_fec_done      (ul_fec_crc1_done),
@@ -393,6 +425,7 @@ module fec_top(
     .enc_used         (ul_mon_enc_used),
     .data_rd          (ul_mon_data_rd),
     .data_level       (ul_mon_data_level),
+    .data_full        (ul_mon_data_full),
     .data_out         (ul_mon_data_out),
     .crc0_data        (ul_mon_crc0_data),
     .enc0_row_p       (ul_mon_cenc0_row_p),
@@ -432,4 +465,43 @@ module fec_top(
     .crc1_valid       (ul_fec_crc1_valid)
   );
 
+  // =========================================================
+  // =                 Performance counters                  =
+  // =========================================================
+
+  // Events and levels of reg_cfg REG_ADDR_PERF_*
+  logic [PERF_CNT_NUM-3:0] perf_events;
+  logic [2:0][7:0]         perf_levels;
+  logic                    ul_frame_done;
+  
+  assign ul_frame_done   = ul_fec_crc0_done | ul_fec_crc1_done;
+  assign perf_events[0]  = dl_fec_enc0_done;                          // DL_ENC0_FRAMES
+  assign perf_events[1]  = dl_fec_enc1_done;                          // DL_ENC1_FRAMES
+  assign perf_events[2]  = ul_frame_done;                             // UL_FRAMES
+  assign perf_events[3]  = (ul_fec_crc0_done & ul_fec_enc0_err_cor) |
+                           (ul_fec_crc1_done & ul_fec_enc1_err_cor);  // UL_CORRECTED
+  assign perf_events[4]  = ul_frame_done & ul_fec_uncor_err;          // UL_UNCORRECTABLE
+  assign perf_events[5]  = (ul_fec_crc0_done & ~ul_fec_crc0_valid) |
+                           (ul_fec_crc1_done & ~ul_fec_crc1_valid);   // UL_CRC_ERRORS
+  assign perf_events[6]  = uart_frame_error_flag;                     // UART_FRAME_ERR, every bad byte
+  assign perf_events[7]  = dl_uart_err_event[0];                      // UART_TIMEOUT, aborted commands
+  assign perf_events[8]  = dl_uart_tx_req & ~dl_uart_tx_grant;        // STALL_UART_TX
+  assign perf_events[9]  = dl_ctrl_stall;                             // STALL_DL_CTRL
+  assign perf_levels[0]  = uart_rx_buf_count;
+  assign perf_levels[1]  = uart_tx_full     ? 8'(2**UART_TX_FAW) : 8'(uart_tx_level);
+  assign perf_levels[2]  = ul_mon_data_full ? 8'(2**UL_FIFO_FAW) : 8'(ul_mon_data_level);
+  
+  perf_counters #(
+    .EVENTS                 (PERF_CNT_NUM-2),
+    .LEVELS                 (3)
+  ) perf_counters_u (
+    .clk                    (clk),
+    .rst_n                  (rst_n),
+    .snapshot               (perf_ctrl[0]),
+    .clear                  (perf_ctrl[1]),
+    .events                 (perf_events),
+    .levels                 (perf_levels),
+    .cnt                    (perf_cnt)
+  );
+
 endmodule
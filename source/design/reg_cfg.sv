@@ -1,7 +1,8 @@
 // Auto-generated APB Register Module
 module reg_cfg #(
     parameter ADDR_WIDTH = 8,
-    parameter DATA_WIDTH = 32
+    parameter DATA_WIDTH = 32,
+    parameter PERF_CNT_NUM = 12
 )(
   // AMBA APB interface
     input  logic                  pclk,
@@ -16,6 +17,8 @@ module reg_cfg #(
   
     // Regiters
     output logic [15:0] DL_SER_CLK_DIV,
+    output logic [6:0]  SER_LANE_CFG,
+    output logic [1:0]  SER_BURST_CFG,
   
     // Err inject registers
     output logic [31:0] DL_ERR_INJ_MASK_0,
@@ -25,7 +28,10 @@ module reg_cfg #(
     // UART
   output logic [15:0] UART_PR,
   output logic [4:0]  UART_CTRL,
-  output logic [13:0] UART_CFG
+  output logic [13:0] UART_CFG,
+    // Performance counters
+    output logic [1:0]  PERF_CTRL,
+    input  logic [PERF_CNT_NUM-1:0][31:0] PERF_CNT
 );
 
     // -------------------------
@@ -33,6 +39,10 @@ module reg_cfg #(
     // -------------------------
     // DL_SER_CLK_DIV register
     // Serializer clock divisor for downlink transmission.
+    // SER_LANE_CFG register
+    // Serial lanes: [1:0] DL lanes (1 << n), [2] DL DDR, [5:4] UL lanes, [6] UL DDR.
+    // SER_BURST_CFG register
+    // Burst framing, one preamble per message: [0] DL, [1] UL.
     // UART_RXDATA register
     // RX Data register; the interface to the ReceiveFIFO.
     // UART_TXDATA register
@@ -43,6 +53,10 @@ module reg_cfg #(
     // UART Control Register
     // UART_CFG register
     // UART Configuration Register
+    // PERF_CTRL register
+    // Performance counters control, self clearing: [0] snapshot, [1] clear.
+    // PERF_CNT registers (read only)
+    // Performance counter snapshot k at 8'h40 + 4*k.
 
     // -------------------------
     // Reset & Write Logic
@@ -51,6 +65,8 @@ module reg_cfg #(
         if (!presetn) begin
             pslverr           <= 1'b0;
             DL_SER_CLK_DIV    <= 16'h4;
+            SER_LANE_CFG      <= 7'h0;
+            SER_BURST_CFG     <= 2'h0;
             DL_ERR_INJ_MASK_0 <= 32'h0;
             DL_ERR_INJ_MASK_1 <= 32'h0;
             DL_ERR_INJ_ENABLE <= 1'h0;
@@ -58,8 +74,10 @@ module reg_cfg #(
             UART_PR           <= 16'h35; // 115,741 baud
             UART_CTRL         <= 5'h7;
             UART_CFG          <= 14'h3F28;
+            PERF_CTRL         <= 2'h0;
         end
         else begin
+          PERF_CTRL <= 2'h0; // Single cycle pulses
           
           // Clear registers logic
           if(DL_ERR_INJ_ENABLE_CLEAR) begin
@@ -75,12 +93,17 @@ module reg_cfg #(
                   8'h04: DL_ERR_INJ_MASK_0[31:0] <= pwdata[31:0];
                   8'h08: DL_ERR_INJ_MASK_1[31:0] <= pwdata[31:0];
                   8'h0c: DL_ERR_INJ_ENABLE[0:0]  <= pwdata[0:0];
+                  8'h10: SER_LANE_CFG[6:0]       <= pwdata[6:0];
+                  8'h18: SER_BURST_CFG[1:0]      <= pwdata[1:0];
                   8'h20: UART_PR[15:0]           <= pwdata[15:0];
                   8'h24: UART_CTRL[4:0]          <= pwdata[4:0];
                   8'h28: UART_CFG[13:0]          <= pwdata[13:0];
+                  8'h30: PERF_CTRL[1:0]          <= pwdata[1:0];
                   default: begin
                     pslverr           <= 1'b1;
                     DL_SER_CLK_DIV    <= DL_SER_CLK_DIV;
+                    SER_LANE_CFG      <= SER_LANE_CFG;
+                    SER_BURST_CFG     <= SER_BURST_CFG;
                     DL_ERR_INJ_MASK_0 <= DL_ERR_INJ_MASK_0;
                     DL_ERR_INJ_MASK_1 <= DL_ERR_INJ_MASK_1;
                     DL_ERR_INJ_ENABLE <= DL_ERR_INJ_ENABLE;
@@ -96,6 +119,8 @@ module reg_cfg #(
           else begin
             pslverr           <= 1'b0;
             DL_SER_CLK_DIV    <= DL_SER_CLK_DIV;
+            SER_LANE_CFG      <= SER_LANE_CFG;
+            SER_BURST_CFG     <= SER_BURST_CFG;
             DL_ERR_INJ_MASK_0 <= DL_ERR_INJ_MASK_0;
             DL_ERR_INJ_MASK_1 <= DL_ERR_INJ_MASK_1;
             DL_ERR_INJ_ENABLE <= DL_ERR_INJ_ENABLE;
@@ -120,9 +145,24 @@ module reg_cfg #(
             8'h04: prdata = DL_ERR_INJ_MASK_0;
             8'h08: prdata = DL_ERR_INJ_MASK_1;
             8'h0C: prdata = {31'b0, DL_ERR_INJ_ENABLE};
+            8'h10: prdata = {25'h0, SER_LANE_CFG};
+            8'h18: prdata = {30'h0, SER_BURST_CFG};
             8'h20: prdata = {16'h0, UART_PR};
             8'h24: prdata = {27'h0, UART_CTRL};
             8'h28: prdata = {18'h0, UART_CFG};
+            8'h30: prdata = 32'h0;
+            8'h40: prdata = PERF_CNT[0];
+            8'h44: prdata = PERF_CNT[1];
+            8'h48: prdata = PERF_CNT[2];
+            8'h4C: prdata = PERF_CNT[3];
+            8'h50: prdata = PERF_CNT[4];
+            8'h54: prdata = PERF_CNT[5];
+            8'h58: prdata = PERF_CNT[6];
+            8'h5C: prdata = PERF_CNT[7];
+            8'h60: prdata = PERF_CNT[8];
+            8'h64: prdata = PERF_CNT[9];
+            8'h68: prdata = PERF_CNT[10];
+            8'h6C: prdata = PERF_CNT[11];
             default: prdata = 32'hCAFE_CAFE;
           endcase
           //$display("[%0t][DE-REG_CFG] Register read addr: 0x%0h data: 0x%0h", $time, paddr, prdata);
@@ -130,3 +170,56 @@ module reg_cfg #(
     end
 
 endmodule
+
+
+// Performance counters: saturating live counters restarted by clear and
+// copied to the registers read over APB by snapshot (both in the same
+// cycle take the snapshot first)
+//   cnt[0]          cycles
+//   cnt[1..EVENTS]  events, one count per cycle the event input is high
+//   cnt[EVENTS+1]   FIFO high-water marks, one byte per levels entry
+module perf_counters #(
+    parameter EVENTS = 10,
+    parameter LEVELS = 3
+)(
+    input  logic                      clk,
+    input  logic                      rst_n,
+    input  logic                      snapshot,
+    input  logic                      clear,
+    input  logic [EVENTS-1:0]         events,
+    input  logic [LEVELS-1:0][7:0]    levels,
+    output logic [EVENTS+1:0][31:0]   cnt
+);
+
+    logic [EVENTS:0][31:0]   live;
+    logic [LEVELS-1:0][7:0]  hwm;
+
+    always_ff @(posedge clk or negedge rst_n) begin
+        if (!rst_n) begin
+            live <= '0;
+            hwm  <= '0;
+        end
+        else if (clear) begin
+            live <= '0;
+            hwm  <= '0;
+        end
+        else begin
+            if (~&live[0])
+              live[0] <= live[0] + 32'd1;
+            for (int k = 0; k < EVENTS; k++)
+              if (events[k] && ~&live[k+1])
+                live[k+1] <= live[k+1] + 32'd1;
+            for (int k = 0; k < LEVELS; k++)
+              if (levels[k] > hwm[k])
+                hwm[k] <= levels[k];
+        end
+    end
+
+    always_ff @(posedge clk or negedge rst_n) begin
+        if (!rst_n)
+            cnt <= '0;
+        else if (snapshot)
+            cnt <= {32'(hwm), live};
+    end
+
+endmodule
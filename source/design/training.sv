@@ -6,6 +6,7 @@ module training_preamble #(
   input logic rst_n,
   input logic [DIV_WIDTH-1:0] clk_div,
   input logic start,
+  input logic burst,    // Delimiter of a frame within a burst: one toggle pair
   output logic done,
   output logic training
 );
@@ -21,6 +22,7 @@ module training_preamble #(
   //logic [$clog2(PREAMBLE_COUNT):0] bit_count;
   logic done_int;
   logic [4:0] bit_count;
+  logic [4:0] last_bit;
   logic [DIV_WIDTH-1:0] clk_cnt;
   
   // -------------------------------
@@ -31,7 +33,8 @@ module training_preamble #(
  // end
 
   // Calculate done signal combinationally
-  assign done = (state == S_TRAINING) && (bit_count == PREAMBLE_COUNT_INT) && (clk_cnt == clk_div);
+  assign last_bit = burst ? 5'd1 : 5'(PREAMBLE_COUNT_INT);
+  assign done = (state == S_TRAINING) && (bit_count == last_bit) && (clk_cnt == clk_div);
 
   // FSM - Combinational state update
   always_comb begin
@@ -69,7 +72,7 @@ module training_preamble #(
             clk_cnt <= 0;
             training <= ~training;
 
-            if (bit_count == PREAMBLE_COUNT_INT) begin  
+            if (bit_count == last_bit) begin  
               bit_count <= 'b0;
               done_int      <= 'b1;
             end else begin
@@ -97,6 +100,7 @@ module training_detector #(
   input  logic rst_n,
   output logic [DIV_WIDTH-1:0] clk_div,
   input  logic start,
+  input  logic resync,  // Frame within a burst: one falling edge, clk_div is kept
   output logic done,
   input  logic training,
   input  logic enable
@@ -128,7 +132,7 @@ module training_detector #(
 
   // Calculate done signal combinationally
 
-  assign done = (state == S_TRAINING) && (training_negedge_count == PREAMBLE_COUNT);
+  assign done = (state == S_TRAINING) && (training_negedge_count == (resync ? 1 : PREAMBLE_COUNT));
   
 
   // Training posedge detection
@@ -173,7 +177,7 @@ module training_detector #(
       if (state == S_TRAINING) begin
         if (enable == 1'b1 && training == 1'b1)
           clk_cnt <= clk_cnt + 1'b1;
-        else if (done == 1'b1)
+        else if (done == 1'b1 && resync == 1'b0)
           clk_div <= clk_cnt >> $clog2(PREAMBLE_COUNT); // Average clock count per bit
         else
           clk_cnt <= clk_cnt;
@@ -174,6 +174,8 @@ module EF_UART #(
     parameter MDW = 9,      // Max data size/width
     parameter TX_FAW = 4,   // TX FIFO Address width; Depth=2^AW
     parameter RX_FAW = 4,   // RX FIFO Address width; Depth=2^AW
+    parameter RX_BUF_FAW = 0, // RX buffer Address width ahead of the RX FIFO; 0: no buffer
+    parameter CTS_MARGIN = 4, // Free RX buffer entries when cts drops
     parameter SC  = 8,   // Number of samples per bit/baud
     parameter GFLEN = 8  // Length (number of stages) of the glitch filter
   ) (
@@ -215,6 +217,9 @@ module EF_UART #(
     output  wire [RX_FAW-1:0]  rx_level,
     output  wire            rx_level_above,
     output  wire            rx_done,
+    input   wire            rx_accept,
+    output  wire            cts,
+    output  wire [7:0]      rx_buf_count,   // Bytes held ahead of the consumer (full = depth)
     input   wire            rx_fifo_flush,
     output  wire [2**RX_FAW-1:0][MDW-1:0]  rx_array_reg,
 
@@ -236,6 +241,11 @@ module EF_UART #(
 
     wire [MDW-1:0]  tx_data;
     wire [MDW-1:0]  rx_data;
+    wire [MDW-1:0]  rx_wdata;
+    wire            rx_line_done;
+    wire            rx_timeout;
+    wire            rx_buf_empty;
+    wire            rx_buf_full;
     
     localparam FIFO_DW = MDW;
 
@@ -329,7 +339,7 @@ module EF_UART #(
         .rst_n(rst_n),
         .rd(rd),
         .wr(rx_done),
-        .wdata(rx_data),
+        .wdata(rx_wdata),
         .empty(rx_empty),
         .full(rx_full),
         .rdata(rdata),
@@ -354,10 +364,50 @@ module EF_UART #(
         .match_flag(match_flag),
         .parity_error(parity_error_flag),
         .frame_error(frame_error_flag),
-        .rx_done(rx_done),
+        .rx_done(rx_line_done),
         .dout(rx_data)
     );
 
+    // RX buffer: received bytes wait here until the consumer accepts them
+    // into the RX FIFO, one per cycle while rx_accept is high
+    generate
+      if (RX_BUF_FAW > 0) begin : gen_rx_buf
+        wire [RX_BUF_FAW-1:0]  rx_buf_level;
+        wire                   rx_buf_rd;
+
+        assign rx_buf_rd = rx_accept & ~rx_buf_empty & ~rx_full & ~rx_fifo_flush;
+
+        fifo #(
+            .DW(FIFO_DW),
+            .AW(RX_BUF_FAW)
+        ) fifo_rx_buf (
+            .clk(clk),
+            .rst_n(rst_n),
+            .rd(rx_buf_rd),
+            .wr(rx_line_done),
+            .wdata(rx_data),
+            .empty(rx_buf_empty),
+            .full(rx_buf_full),
+            .rdata(rx_wdata),
+            .level(rx_buf_level),
+            .flush(1'b0),
+            .array_reg()
+        );
+
+        assign rx_done = rx_buf_rd;
+        assign cts     = ~rx_buf_full & (rx_buf_level < (2**RX_BUF_FAW - CTS_MARGIN));
+        assign rx_buf_count = rx_buf_full ? 8'(2**RX_BUF_FAW) : 8'(rx_buf_level);
+      end
+      else begin : gen_rx_direct
+        assign rx_buf_empty = 1'b1;
+        assign rx_buf_full  = rx_full;
+        assign rx_wdata     = rx_data;
+        assign rx_done      = rx_line_done;
+        assign cts          = ~rx_full;
+        assign rx_buf_count = rx_full ? 8'(2**RX_FAW) : 8'(rx_level);
+      end
+    endgenerate
+
     reg [5:0]   bits_count;
     reg [4:0]   samples_count;
     always @ (posedge clk, negedge rst_n) begin
@@ -366,10 +416,10 @@ module EF_UART #(
             samples_count <= 0;
         end
         else if(b_tick)
-            if(rx_done) bits_count <= 0;
+            if(rx_line_done) bits_count <= 0;
             else if(samples_count == (SC - 1)) begin
                 samples_count <= 0;
-                if(timeout_flag)
+                if(rx_timeout)
                     bits_count <= 0;
                 else
                     bits_count <= bits_count + 1;
@@ -379,8 +429,10 @@ module EF_UART #(
 
     assign tx_level_below = (tx_level < txfifotr) & ~tx_full;
     assign rx_level_above = (rx_level > rxfifotr) | rx_full;
-    assign overrun_flag = rx_full & rx_done;
-    assign timeout_flag = (bits_count == timeout_bits);
+    assign overrun_flag = rx_buf_full & rx_line_done;
+    assign rx_timeout   = (bits_count == timeout_bits);
+    // A quiet line is only a timeout once every buffered byte has been taken
+    assign timeout_flag = rx_timeout & rx_buf_empty;
 
 endmodule
 
@@ -58,7 +58,8 @@ module ul_fec_engine (
 
   decoder #(
     .WIDTH           (ENC0_DATA_WIDTH),
-    .DEPTH           (ENC0_DATA_DEPTH)
+    .DEPTH           (ENC0_DATA_DEPTH),
+    .MODE            (ENC0_DEC_MODE)
   ) decoder0_u (
     .clk             (clk),
     .rst_n           (rst_n),
@@ -69,14 +70,16 @@ module ul_fec_engine (
     .done            (enc0_done),
     .data_corrected  (enc0_data_cor),
     .error_detected  (enc0_err_det),
-    .error_corrected (enc0_err_cor)
+    .error_corrected (enc0_err_cor),
+    .latency         ()
   );
 
   crc_verify_seq #(
     .DATA_WIDTH         (CRC0_DATA_WIDTH),
     .CRC_WIDTH          (CRC0_WIDTH),
     .POLY               (CRC0_POLY),
-    .XOR_OPS_PER_CYCLE  (CRC0_XOR_OPS_PER_CYCLE)
+    .XOR_OPS_PER_CYCLE  (CRC0_XOR_OPS_PER_CYCLE),
+    .MODE               (CRC0_MODE)
   ) crc_verify0_u (
     .clk                (clk),
     .rst_n              (rst_n),
@@ -108,7 +111,8 @@ module ul_fec_engine (
 
   decoder #(
     .WIDTH           (ENC1_DATA_WIDTH),
-    .DEPTH           (ENC1_DATA_DEPTH)
+    .DEPTH           (ENC1_DATA_DEPTH),
+    .MODE            (ENC1_DEC_MODE)
   ) decoder1_u (
     .clk             (clk),
     .rst_n           (rst_n),
@@ -119,14 +123,16 @@ module ul_fec_engine (
     .done            (enc1_done),
     .data_corrected  (enc1_data_cor),
     .error_detected  (enc1_err_det),
-    .error_corrected (enc1_err_cor)
+    .error_corrected (enc1_err_cor),
+    .latency         ()
   );
 
   crc_verify_seq #(
     .DATA_WIDTH         (CRC1_DATA_WIDTH),
     .CRC_WIDTH          (CRC1_WIDTH),
     .POLY               (CRC1_POLY),
-    .XOR_OPS_PER_CYCLE  (CRC1_XOR_OPS_PER_CYCLE)
+    .XOR_OPS_PER_CYCLE  (CRC1_XOR_OPS_PER_CYCLE),
+    .MODE               (CRC1_MODE)
   ) crc_verify1_u (
     .clk                (clk),
     .rst_n              (rst_n),
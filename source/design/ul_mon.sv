@@ -5,8 +5,11 @@ module uplink_monitor #(
 )(
   input  logic                                  clk,
   input  logic                                  rst_n,
-  input  logic                                  ul_in,
+  input  logic [SERIAL_LANES-1:0]               ul_in,
   input  logic                                  ul_en,
+  input  logic [1:0]                            ul_lanes,   // 1 << ul_lanes active lanes
+  input  logic                                  ul_ddr,     // two symbols per trained period
+  input  logic                                  ul_burst,   // data frames follow a delimiter, not a preamble
   // FEC UL FSM
   output logic [7:0]                            msg_cnt,
   // Input from UL FEC engine
@@ -21,6 +24,7 @@ module uplink_monitor #(
   output logic [2**UART_RX_FAW-2:0][UART_MDW-1:0] data_out,   // 56 bits = d0 to d55
   input  logic                                  data_rd,
   output logic [UL_FIFO_FAW-1:0]                data_level,
+  output logic                                  data_full,
   // Output to 64-bit Decoding cluster
   output logic [CRC0_WIDTH-1:0]                 crc0_data,  // d56 to d63
   output logic [ENC0_DATA_DEPTH-1:0]            enc0_row_p, // r0 to r7
@@ -70,6 +74,7 @@ logic                           fifo_rd, fifo_wr;
 // logic [1:0]                     fifo_cnt;
 logic [UL_FIFO_WIDTH-1:0]       fifo_out;
 logic [UL_FIFO_FAW-1:0]         fifo_level;
+logic                           fifo_full;
 logic [CRC0_WIDTH-1:0]                 crc0_data_i;
 logic [ENC0_DATA_DEPTH-1:0]            enc0_row_p_i;
 logic [ENC0_DATA_WIDTH-1:0]            enc0_col_p_i;
@@ -79,6 +84,7 @@ logic [ENC1_DATA_WIDTH-1:0]            enc1_col_p_i;
 
 assign fifo_rd    = data_rd;
 assign data_level = fifo_level;
+assign data_full  = fifo_full;
 assign msg_cnt_p7 = msg_cnt + 8'd7;
 
 // Current state
@@ -277,8 +283,9 @@ training_detector #(
   .rst_n      (rst_n),
   .clk_div    (deser_clk_div),
   .start      (training_start),
+  .resync     (ul_burst && sampling == MESSAGE_DATA), // Trained on the message ID preamble
   .done       (training_done),
-  .training   (ul_in),
+  .training   (ul_in[0]), // Preamble is timed on lane 0
   .enable     (ul_en)
 );
 
@@ -307,7 +314,8 @@ end
 deserializer #(
   .DATA_WIDTH  (SERIAL_DATA_WIDTH),
   .DATA_DEPTH  (SERIAL_DATA_DEPTH),
-  .DIV_WIDTH   (SERIAL_DIV_WIDTH)
+  .DIV_WIDTH   (SERIAL_DIV_WIDTH),
+  .LANES       (SERIAL_LANES)
 ) deserializer_u (
   .clk          (clk),
   .rst_n        (rst_n),
@@ -317,6 +325,8 @@ deserializer #(
   .clk_div      (deser_clk_div),
   .width        (deser_width),
   .depth        (deser_depth),
+  .lanes        (ul_lanes),
+  .ddr          (ul_ddr),
   .par_out      (deser_par_out),
   .done         (deser_done)
 );
@@ -357,6 +367,7 @@ fifo #(
                     enc_row_p_mux,
                     enc_col_p_mux}),
   .rdata          (fifo_out),               // Data out
+  .full           (fifo_full),
   .level          (fifo_level)
 );
 
@@ -0,0 +1,6 @@
+"""
+Python reference models of the P_FEC_ASIC datapaths and host-side tools.
+
+The models read their parameters from source/design/defines.svh and are
+meant to be run from the source/ directory, e.g. python -m model.dl_fec
+"""
@@ -0,0 +1,370 @@
+"""
+Monte Carlo BER/FER characterization of the CPC+CRC code of both encoding
+clusters (ENC0: 56b data + CRC0, ENC1: 12b header + CRC1).
+
+The receive side follows ul_fec_engine bit for bit:
+  - decoder/cpc_fec (source/design/fec.sv): the received row/column parity
+    is held while the data block is corrected one bit per iteration (highest
+    mismatching row and column, 0 when none) until the calculated parity
+    matches. An odd overall parity of the received parity bits is
+    uncorrectable: the raw block is returned with ERROR_DETECTED only.
+  - crc_verify_seq over {corrected data, crc}; ENC0 checks the raw CRC0
+    byte, ENC1 the corrected CRC1 row (source/design/ul_fec.sv).
+
+CPC syndromes and CRC remainders are linear, so the outcome of a frame only
+depends on its error pattern and the all-zero codeword is simulated.
+Channel errors are counted in events (flipped bits, bursts); the frame
+outcome probabilities are estimated for a fixed number of events k and
+weighted with the exact probability of k events at each channel error
+probability. Low-k strata are enumerated exhaustively, which resolves
+rates far below 1e-9 without simulating 1e9 frames.
+
+Usage (from source/):
+    python -m model.ber --out ber.csv --plot ber.png
+    python -m model.ber --channel burst --burst-len 8 --cluster enc0
+"""
+import argparse
+import csv
+import itertools
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .crc import CrcModel
+from .dl_fec import FORMAT1_DATA_ORDER, frame_layout
+from .params import load_params
+
+# Per-frame outcomes counted by the simulation
+OUTCOMES = ("corrected", "detected", "miscorrected", "escaped", "failed")
+# Rates written to the CSV (and plotted)
+RATES = ("fer", "miscorrection", "crc_escape", "detected", "corrected")
+
+
+class Cluster:
+    """Codeword geometry and receive semantics of one encoding cluster"""
+
+    def __init__(self, name, crc, width, depth, layout, frame_width, raw_crc):
+        self.name = name
+        self.crc = crc
+        self.width, self.depth = width, depth
+        self.raw_crc = raw_crc
+        self.block_bits = crc.data_width + crc.crc_width
+        # Serial order of the codeword bits: frame row 0 bit 0 first, as dl_ctrl sends them.
+        # Entries index [data, crc, row parity, col parity]
+        self.serial = layout[:depth, :frame_width].reshape(-1)
+        self.bits = self.serial.size
+        assert self.bits == self.block_bits + depth + width, "frame does not hold the whole codeword"
+
+    @classmethod
+    def from_params(cls, params, name):
+        p = params
+        if name == "enc0":
+            crc = CrcModel.from_params(p, "CRC0")
+            layout = frame_layout(
+                p["CRC0_DATA_WIDTH"], p["ENC0_PAR_DATA_DEPTH"], p["ENC0_PAR_DATA_WIDTH"],
+                p["SERIAL_DATA_DEPTH"], p["SERIAL_DATA_WIDTH"])
+            return cls(name, crc, p["ENC0_DATA_WIDTH"], p["ENC0_DATA_DEPTH"], layout,
+                       p["ENC0_PAR_DATA_WIDTH"], raw_crc=True)
+        crc = CrcModel.from_params(p, "CRC1")
+        layout = frame_layout(
+            p["CRC1_DATA_WIDTH"], p["ENC1_PAR_DATA_DEPTH"], p["ENC1_PAR_DATA_WIDTH"],
+            p["SERIAL_DATA_DEPTH"], p["SERIAL_DATA_WIDTH"], data_order=FORMAT1_DATA_ORDER)
+        return cls(name, crc, p["ENC1_DATA_WIDTH"], p["ENC1_DATA_DEPTH"], layout,
+                   p["ENC1_PAR_DATA_WIDTH"], raw_crc=False)
+
+    def decode(self, errors):
+        """
+        Receive a batch of error patterns (frames, bits) in serial order.
+        Returns a dict of boolean arrays: the decoder flags, crc_valid and
+        whether the delivered data bits are wrong.
+        """
+        count = errors.shape[0]
+        received = np.zeros((count, self.bits), dtype=np.uint8)
+        received[:, self.serial] = errors
+        b, d, w = self.block_bits, self.depth, self.width
+        # Block row i is byte/nibble i of {crc, data}: bit i*DEPTH+j is data_in[i][j]
+        raw = received[:, :b].reshape(count, d, w)
+        row_p, col_p = received[:, b:b + d], received[:, b + d:]
+
+        block = raw.copy()
+        total = (row_p.sum(axis=1) + col_p.sum(axis=1)) & 1
+        flipped = np.zeros(count, dtype=bool)
+        active = np.flatnonzero(total == 0)
+        rows, cols = np.arange(d), np.arange(w)
+        for _ in range(d * w + d + w):
+            x = block[active]
+            row_mis = (x.sum(axis=2) & 1) != row_p[active]
+            col_mis = (x.sum(axis=1) & 1) != col_p[active]
+            mismatch = row_mis.any(axis=1) | col_mis.any(axis=1)
+            active = active[mismatch]
+            if active.size == 0:
+                break
+            # cpc_fec keeps the last (highest) mismatching row and column, 0 when none
+            error_row = np.where(row_mis[mismatch], rows, 0).max(axis=1)
+            error_col = np.where(col_mis[mismatch], cols, 0).max(axis=1)
+            block[active, error_row, error_col] ^= 1
+            flipped[active] = True
+        else:
+            raise RuntimeError("CPC correction loop did not converge")
+
+        uncorrectable = total == 1
+        data_out = np.where(uncorrectable[:, None, None], raw, block).reshape(count, b)
+        data_bits = self.crc.data_width
+        crc_in = received[:, data_bits:b] if self.raw_crc else data_out[:, data_bits:]
+        crc_valid = self.crc.verify(np.concatenate([data_out[:, :data_bits], crc_in], axis=1))
+        return {
+            "error_detected": uncorrectable | flipped,
+            "error_corrected": flipped & ~uncorrectable,
+            "crc_valid": crc_valid,
+            "data_error": data_out[:, :data_bits].any(axis=1),
+        }
+
+
+def classify(result):
+    """Per-frame outcome flags, in OUTCOMES order"""
+    uncorrectable = result["error_detected"] & ~result["error_corrected"]
+    detected = ~result["crc_valid"] | uncorrectable
+    wrong = result["data_error"]
+    return np.stack([
+        result["error_corrected"] & ~wrong & ~detected,  # corrected
+        detected,                                        # detected
+        result["error_corrected"] & wrong,               # miscorrected
+        wrong & result["crc_valid"] & ~uncorrectable,    # escaped
+        wrong | ~result["crc_valid"],                    # failed
+    ], axis=1)
+
+
+class IidChannel:
+    """Binary symmetric channel: every bit flips independently with probability p"""
+
+    name = "iid"
+    deterministic = True
+
+    def sites(self, bits):
+        return bits
+
+    def bit_errors(self, p):
+        return p
+
+    def pattern(self, starts, bits, rng):
+        errors = np.zeros((starts.shape[0], bits), dtype=np.uint8)
+        np.put_along_axis(errors, starts, 1, axis=1)
+        return errors
+
+
+class BurstChannel:
+    """
+    Bursts of length L start at every bit independently with probability p;
+    the first and last bits of a burst flip, the others with probability
+    density. Bursts starting before the frame count if they reach into it.
+    """
+
+    name = "burst"
+
+    def __init__(self, length, density=0.5):
+        self.length = length
+        self.density = density
+        # Patterns are fixed by the burst positions unless inner bits are random
+        self.deterministic = length <= 2 or density in (0, 1)
+
+    def sites(self, bits):
+        return bits + self.length - 1
+
+    def bit_errors(self, p):
+        return p * (min(self.length, 2) + max(self.length - 2, 0) * self.density)
+
+    def pattern(self, starts, bits, rng):
+        count, events = starts.shape
+        span = self.length
+        errors = np.zeros((count, bits + 2 * span), dtype=np.uint8)
+        rows = np.arange(count)
+        for e in range(events):
+            burst = (rng.random((count, span)) < self.density).astype(np.uint8)
+            burst[:, 0] = burst[:, -1] = 1
+            for o in range(span):
+                errors[rows, starts[:, e] + o + 1] ^= burst[:, o]
+        return errors[:, span:span + bits]
+
+
+def make_channel(args):
+    if args.channel == "burst":
+        return BurstChannel(args.burst_len, args.burst_density)
+    return IidChannel()
+
+
+def stratum_worker(params, cluster_name, channel, events, chunk, seed):
+    """Outcome counts of one chunk of frames with a fixed number of events"""
+    cluster = Cluster.from_params(params, cluster_name)
+    sites = channel.sites(cluster.bits)
+    rng = np.random.default_rng(seed)
+    if isinstance(chunk, tuple):
+        # Exhaustive enumeration of the event positions, slice [start, stop)
+        combos = itertools.islice(itertools.combinations(range(sites), events), *chunk)
+        starts = np.array(list(combos), dtype=np.intp).reshape(-1, events)
+    else:
+        keys = rng.random((chunk, sites))
+        starts = np.argpartition(keys, events - 1, axis=1)[:, :events]
+    errors = channel.pattern(starts, cluster.bits, rng)
+    return classify(cluster.decode(errors)).sum(axis=0), starts.shape[0]
+
+
+def event_pmf(sites, p, events):
+    """Probability of exactly `events` events among `sites` Bernoulli(p) sites"""
+    if p <= 0:
+        return float(events == 0)
+    log = (math.lgamma(sites + 1) - math.lgamma(events + 1) - math.lgamma(sites - events + 1)
+           + events * math.log(p) + (sites - events) * math.log1p(-p))
+    return math.exp(log)
+
+
+def characterize(cluster, channel, max_events, samples, chunk_size, jobs, seed):
+    """
+    Run every event stratum 1..max_events of a cluster over a process pool.
+    Strata of a deterministic channel with at most `samples` event
+    placements are enumerated and exact.
+    Returns {events: (counts, frames, exact)}.
+    """
+    sites = channel.sites(cluster.bits)
+    params = load_params()
+    seeds = iter(np.random.SeedSequence([seed, cluster.bits]).spawn(max_events * (samples // chunk_size + 2)))
+    tasks = []
+    for events in range(1, min(max_events, sites) + 1):
+        total = math.comb(sites, events)
+        if channel.deterministic and total <= samples:
+            chunks = [(start, min(start + chunk_size, total)) for start in range(0, total, chunk_size)]
+        else:
+            chunks = [min(chunk_size, samples - start) for start in range(0, samples, chunk_size)]
+        tasks += [(events, chunk, next(seeds)) for chunk in chunks]
+
+    strata = {}
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = [
+            (events, pool.submit(stratum_worker, params, cluster.name, channel, events, chunk, s))
+            for events, chunk, s in tasks
+        ]
+        for events, future in futures:
+            counts, frames = future.result()
+            prev = strata.get(events, (0, 0))
+            strata[events] = (prev[0] + counts, prev[1] + frames)
+    for events, (counts, frames) in strata.items():
+        exact = channel.deterministic and math.comb(sites, events) <= samples
+        strata[events] = (counts, frames, exact)
+    return strata
+
+
+def rates(strata, sites, p):
+    """
+    Outcome rates at event probability p with their standard errors, and the
+    probability mass of the strata that were not simulated.
+    """
+    rate = np.zeros(len(OUTCOMES))
+    var = np.zeros(len(OUTCOMES))
+    for events, (counts, frames, exact) in strata.items():
+        weight = event_pmf(sites, p, events)
+        q = counts / frames
+        rate += weight * q
+        if not exact:
+            var += weight ** 2 * q * (1 - q) / frames
+    untested = sum(event_pmf(sites, p, k) for k in range(max(strata, default=0) + 1, sites + 1))
+    return rate, np.sqrt(var), untested
+
+
+def rate_row(rate, err):
+    """Map OUTCOMES rates to the RATES columns"""
+    index = {name: i for i, name in enumerate(OUTCOMES)}
+    source = {"fer": "failed", "miscorrection": "miscorrected", "crc_escape": "escaped",
+              "detected": "detected", "corrected": "corrected"}
+    return {name: (rate[index[source[name]]], err[index[source[name]]]) for name in RATES}
+
+
+def plot_curves(rows, path):
+    """Log-log plot of the rates vs bit-error probability, one panel per cluster"""
+    try:
+        import matplotlib
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+    except ImportError:
+        print("matplotlib is not installed, skipping the plot")
+        return
+    clusters = sorted({r["cluster"] for r in rows})
+    fig, axes = plt.subplots(1, len(clusters), figsize=(6 * len(clusters), 4.5), squeeze=False)
+    for ax, name in zip(axes[0], clusters):
+        points = [r for r in rows if r["cluster"] == name]
+        ber = [r["ber"] for r in points]
+        for rate in ("fer", "miscorrection", "crc_escape", "detected"):
+            values = [r[rate] if r[rate] > 0 else np.nan for r in points]
+            ax.loglog(ber, values, marker="o", markersize=3, label=rate)
+        ax.set_title(f"{name} ({points[0]['channel']})")
+        ax.set_xlabel("Channel bit-error probability")
+        ax.set_ylabel("Rate per frame")
+        ax.grid(True, which="both", alpha=0.3)
+        ax.legend()
+    fig.tight_layout()
+    fig.savefig(path, dpi=120)
+    print(f"Curves written to {path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Monte Carlo BER/FER characterization of the CPC+CRC clusters")
+    parser.add_argument("--cluster", choices=["enc0", "enc1", "both"], default="both", help="Encoding cluster(s) to characterize")
+    parser.add_argument("--channel", choices=["iid", "burst"], default="iid", help="Channel error model")
+    parser.add_argument("--burst-len", type=int, default=4, help="Burst length in bits (burst channel)")
+    parser.add_argument("--burst-density", type=float, default=0.5, help="Flip probability of the inner bits of a burst")
+    parser.add_argument("--p-min", type=float, default=1e-7, help="Lowest event probability of the sweep")
+    parser.add_argument("--p-max", type=float, default=1e-1, help="Highest event probability of the sweep")
+    parser.add_argument("--points", type=int, default=25, help="Sweep points (log spaced)")
+    parser.add_argument("--max-events", type=int, default=12, help="Highest number of error events per frame simulated")
+    parser.add_argument("--samples", type=int, default=1_000_000, help="Frames per stratum (strata with fewer patterns are enumerated)")
+    parser.add_argument("--chunk", type=int, default=100_000, help="Frames per pool task")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count(), help="Worker processes")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    parser.add_argument("--out", default="ber.csv", help="Output CSV")
+    parser.add_argument("--plot", help="Write the curves to this image (needs matplotlib)")
+    args = parser.parse_args()
+
+    params = load_params()
+    channel = make_channel(args)
+    names = ["enc0", "enc1"] if args.cluster == "both" else [args.cluster]
+    sweep = np.logspace(np.log10(args.p_min), np.log10(args.p_max), args.points)
+
+    rows = []
+    for name in names:
+        cluster = Cluster.from_params(params, name)
+        sites = channel.sites(cluster.bits)
+        start = time.perf_counter()
+        strata = characterize(cluster, channel, args.max_events, args.samples, args.chunk, args.jobs, args.seed)
+        frames = sum(f for _, f, _ in strata.values())
+        print(f"{name}: {cluster.bits} bits/frame, {frames} frames in {time.perf_counter() - start:.1f} s")
+        for events, (counts, n, exact) in sorted(strata.items()):
+            share = ", ".join(f"{o} {c / n:.3g}" for o, c in zip(OUTCOMES, counts))
+            print(f"  {events:2d} event(s){' (exact)' if exact else ''}: {share}")
+        for p in sweep:
+            rate, err, untested = rates(strata, sites, p)
+            row = {"cluster": name, "channel": channel.name, "p": p, "ber": channel.bit_errors(p)}
+            for rate_name, (value, se) in rate_row(rate, err).items():
+                row[rate_name] = value
+                row[f"{rate_name}_se"] = se
+            row["untested"] = untested
+            rows.append(row)
+
+    columns = ["cluster", "channel", "p", "ber"] + [c for r in RATES for c in (r, f"{r}_se")] + ["untested"]
+    with open(args.out, "w", encoding="utf8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=columns)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow({k: (f"{v:.6e}" if isinstance(v, float) else v) for k, v in row.items()})
+    print(f"Rates written to {args.out}")
+
+    print(f"{'cluster':8} {'ber':>10} {'fer':>10} {'miscorr':>10} {'escape':>10} {'untested':>10}")
+    for row in rows:
+        print(f"{row['cluster']:8} {row['ber']:10.3e} {row['fer']:10.3e} {row['miscorrection']:10.3e} "
+              f"{row['crc_escape']:10.3e} {row['untested']:10.3e}")
+    if args.plot:
+        plot_curves(rows, args.plot)
+
+
+if __name__ == "__main__":
+    main()
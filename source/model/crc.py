@@ -0,0 +1,293 @@
+"""
+CRC library of crc_generator_seq/crc_verify_seq (source/design/crc.sv).
+
+The RTL shifts the data MSB first through a Galois LFSR:
+    feedback = data[msb] ^ crc[CRC_WIDTH-1]
+    crc      = (crc << 1) ^ (feedback ? POLY[CRC_WIDTH-1:0] : 0)
+starting from SEED (generator) or 0 (verifier, over {data, crc}).
+Three implementations give the same results:
+  - serial: the LFSR bit by bit (reference)
+  - table:  slicing-by-N lookup tables over integer words
+  - matrix: the LFSR is linear over GF(2), so a whole batch is one matrix
+            product of the data bits with the LFSR's transfer matrix
+The same transfer matrices give the next-state XOR equations of an LFSR
+consuming N bits per cycle, emitted as SystemVerilog functions.
+
+Bit arrays are uint8 arrays whose last axis is the SV bit index
+(column k holds bit k of the vector).
+
+Usage (from source/):
+    python -m model.crc --crc CRC0 --count 1000000
+    python -m model.crc --crc CRC0 --bits-per-cycle 8 --sv crc0_next.svh
+"""
+import argparse
+import time
+
+import numpy as np
+
+from .params import load_params
+
+
+def crc_bitserial(value, data_width, crc_width, poly, seed=0):
+    """CRC of one data word, bit by bit exactly as the RTL LFSR"""
+    mask = (1 << crc_width) - 1
+    crc = seed & mask
+    for i in reversed(range(data_width)):
+        feedback = ((value >> i) & 1) ^ (crc >> (crc_width - 1))
+        crc = ((crc << 1) & mask) ^ (poly & mask if feedback else 0)
+    return crc
+
+
+def crc_transfer(bits, crc_width, poly):
+    """
+    Transfer matrices of the LFSR over `bits` data bits:
+    crc' = crc * A ^ data * B over GF(2), A is (CRC_WIDTH, CRC_WIDTH) and
+    B (bits, CRC_WIDTH). Row k of B is data bit k (bit bits-1 shifted first).
+    """
+    a = np.array([
+        [(crc_bitserial(0, bits, crc_width, poly, 1 << i) >> j) & 1 for j in range(crc_width)]
+        for i in range(crc_width)
+    ], dtype=np.uint8)
+    b = np.array([
+        [(crc_bitserial(1 << k, bits, crc_width, poly) >> j) & 1 for j in range(crc_width)]
+        for k in range(bits)
+    ], dtype=np.uint8)
+    return a, b
+
+
+def to_bits(values, width):
+    """Unpack integers (any shape, up to 64 bits) into bit arrays with a trailing axis of width bits"""
+    values = np.array(values, dtype="<u8", order="C")
+    bits = np.unpackbits(values[..., None].view(np.uint8), axis=-1, bitorder="little")
+    return bits[..., :width]
+
+
+def from_bits(bits):
+    """Pack bit arrays (trailing axis, bit 0 first, up to 64 bits) into integers"""
+    packed = np.packbits(np.asarray(bits, dtype=np.uint8), axis=-1, bitorder="little")
+    size = next(n for n in (1, 2, 4, 8) if packed.shape[-1] <= n)
+    if packed.shape[-1] < size:
+        padded = np.zeros(packed.shape[:-1] + (size,), dtype=np.uint8)
+        padded[..., :packed.shape[-1]] = packed
+        packed = padded
+    return np.ascontiguousarray(packed).view(f"<u{size}")[..., 0].astype(np.uint64)
+
+
+def gf2_matmul(bits, matrix):
+    """
+    Product over GF(2) of bit arrays (..., n) with an (n, m) 0/1 matrix.
+    Runs as a float32 BLAS product, exact while n < 2**24.
+    """
+    product = np.asarray(bits, dtype=np.float32) @ np.asarray(matrix, dtype=np.float32)
+    if np.shape(matrix)[0] < 256:
+        return product.astype(np.uint8) & 1
+    return (product.astype(np.int64) & 1).astype(np.uint8)
+
+
+class CrcTable:
+    """
+    Slicing-by-N table CRC over integer words up to 64 bits, MSB first like
+    the RTL LFSR. Table m holds the CRC of a byte followed by m zero bytes,
+    so N bytes are consumed per step with N lookups; the running CRC is
+    folded into the top of the next N-byte chunk.
+    """
+
+    def __init__(self, crc_width, poly, slices=4):
+        assert 8 * slices >= crc_width and slices <= 8, "slices must cover the CRC and fit 64 bits"
+        self.crc_width = crc_width
+        self.poly = poly
+        self.slices = slices
+        self.tables = np.array([
+            [crc_bitserial(v << (8 * m), 8 * (m + 1), crc_width, poly) for v in range(256)]
+            for m in range(slices)
+        ], dtype=np.uint64)
+
+    def crc(self, values, width, seed=0):
+        """CRC of `width`-bit integer words (any shape) starting from seed"""
+        values = np.asarray(values, dtype=np.uint64)
+        chunk = 8 * self.slices
+        chunk_mask = np.uint64((1 << chunk) - 1)
+        fold = np.uint64(chunk - self.crc_width)
+        crc = np.zeros(values.shape, dtype=np.uint64)
+        # Zero bits above the word leave a zero LFSR unchanged, the seed adds
+        # a constant (linearity), so the word is padded to whole chunks
+        for step in reversed(range((width + chunk - 1) // chunk)):
+            part = ((values >> np.uint64(chunk * step)) & chunk_mask) ^ (crc << fold)
+            crc = self.tables[0][part & np.uint64(0xFF)]
+            for m in range(1, self.slices):
+                crc = crc ^ self.tables[m][(part >> np.uint64(8 * m)) & np.uint64(0xFF)]
+        return crc ^ np.uint64(crc_bitserial(0, width, self.crc_width, self.poly, seed))
+
+
+class CrcModel:
+    """Vectorized CRC with the parameters of crc_generator_seq/crc_verify_seq"""
+
+    def __init__(self, data_width, crc_width, poly, seed=0, slices=4):
+        self.data_width = data_width
+        self.crc_width = crc_width
+        self.poly = poly
+        self.seed = seed
+        self.table = CrcTable(crc_width, poly, max(slices, (crc_width + 7) // 8))
+        # Row k: CRC of a word with only bit k set (seed 0)
+        self.matrix = np.array([
+            [(crc_bitserial(1 << k, data_width, crc_width, poly) >> j) & 1 for j in range(crc_width)]
+            for k in range(data_width)
+        ], dtype=np.uint8)
+        self.seed_bits = to_bits(crc_bitserial(0, data_width, crc_width, poly, seed), crc_width)
+        # Verifier: LFSR over {data, crc} from 0, valid when the remainder is 0
+        width = data_width + crc_width
+        self.check_matrix = np.array([
+            [(crc_bitserial(1 << k, width, crc_width, poly) >> j) & 1 for j in range(crc_width)]
+            for k in range(width)
+        ], dtype=np.uint8)
+
+    def generate(self, data_bits):
+        """crc_out of crc_generator_seq for data bit arrays (..., DATA_WIDTH)"""
+        return gf2_matmul(data_bits, self.matrix) ^ self.seed_bits
+
+    def remainder(self, data_crc_bits):
+        """LFSR state of crc_verify_seq after {data, crc} bit arrays (..., DATA_WIDTH+CRC_WIDTH)"""
+        return gf2_matmul(data_crc_bits, self.check_matrix)
+
+    def verify(self, data_crc_bits):
+        """crc_valid of crc_verify_seq for {data, crc} bit arrays"""
+        return ~self.remainder(data_crc_bits).any(axis=-1)
+
+    def compute(self, data, method="table"):
+        """crc_out for integer data words, by the 'serial', 'table' or 'matrix' implementation"""
+        if method == "serial":
+            return np.array([crc_bitserial(int(v), self.data_width, self.crc_width, self.poly, self.seed)
+                             for v in np.ravel(data)], dtype=np.uint64).reshape(np.shape(data))
+        if method == "matrix":
+            return from_bits(self.generate(to_bits(data, self.data_width)))
+        return self.table.crc(data, self.data_width, self.seed)
+
+    def check(self, data_crc, method="table"):
+        """crc_valid for integer {data, crc} words, by the 'serial', 'table' or 'matrix' implementation"""
+        width = self.data_width + self.crc_width
+        if method == "serial":
+            return np.array([crc_bitserial(int(v), width, self.crc_width, self.poly) == 0
+                             for v in np.ravel(data_crc)]).reshape(np.shape(data_crc))
+        if method == "matrix":
+            return self.verify(to_bits(data_crc, width))
+        return self.table.crc(data_crc, width) == 0
+
+    @classmethod
+    def from_params(cls, params, prefix):
+        """CRC of a cluster of defines.svh, prefix 'CRC0' or 'CRC1'"""
+        return cls(
+            params[f"{prefix}_DATA_WIDTH"], params[f"{prefix}_WIDTH"],
+            params[f"{prefix}_POLY"], params.get(f"{prefix}_SEED", 0),
+        )
+
+
+def next_state_equations(crc_width, poly, bits):
+    """
+    XOR equations of the LFSR state after `bits` data bits: for every CRC
+    bit j, the (crc bits, data bits) whose XOR gives crc'[j].
+    Data bit bits-1 is shifted in first, as from the RTL shift register.
+    """
+    a, b = crc_transfer(bits, crc_width, poly)
+    return [
+        (list(np.flatnonzero(a[:, j])), list(np.flatnonzero(b[:, j])))
+        for j in range(crc_width)
+    ]
+
+
+def check_equations(equations, crc_width, poly, bits, trials=1000, seed=0):
+    """Compare the equations with the bit-serial LFSR on random states and data"""
+    rng = np.random.default_rng(seed)
+    for _ in range(trials):
+        crc = int(rng.integers(0, 1 << crc_width))
+        data = int(rng.integers(0, 1 << min(bits, 63))) | (int(rng.integers(0, 2)) << (bits - 1))
+        expected = crc_bitserial(data, bits, crc_width, poly, crc)
+        got = 0
+        for j, (crc_terms, data_terms) in enumerate(equations):
+            bit = 0
+            for i in crc_terms:
+                bit ^= (crc >> int(i)) & 1
+            for k in data_terms:
+                bit ^= (data >> int(k)) & 1
+            got |= bit << j
+        if got != expected:
+            return False
+    return True
+
+
+def sv_next_state(name, crc_width, poly, bits):
+    """SystemVerilog function computing the CRC state after `bits` data bits in one cycle"""
+    lines = [
+        f"// CRC next state after {bits} data bits, d[{bits - 1}] shifted first",
+        f"// POLY[{crc_width - 1}:0] = {crc_width}'h{poly & ((1 << crc_width) - 1):x}, generated by model/crc.py",
+        f"function automatic logic [{crc_width - 1}:0] {name}(",
+        f"  input logic [{crc_width - 1}:0] c,",
+        f"  input logic [{bits - 1}:0] d",
+        ");",
+    ]
+    for j, (crc_terms, data_terms) in enumerate(next_state_equations(crc_width, poly, bits)):
+        terms = [f"c[{i}]" for i in crc_terms] + [f"d[{k}]" for k in data_terms]
+        expression = " ^ ".join(terms) or "1'b0"
+        lines.append(f"  {name}[{j}] = {expression};")
+    lines.append("endfunction")
+    return "\n".join(lines) + "\n"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CRC library of crc_generator_seq/crc_verify_seq")
+    parser.add_argument("--crc", choices=["CRC0", "CRC1"], default="CRC0", help="CRC of defines.svh")
+    parser.add_argument("--count", type=int, default=1_000_000, help="Random words of the cross-check and throughput run")
+    parser.add_argument("--slices", type=int, default=4, help="Bytes per step of the table implementation")
+    parser.add_argument("--bits-per-cycle", type=int, help="Emit the next-state XOR equations for this many bits per cycle")
+    parser.add_argument("--sv", help="Write the equations as SystemVerilog functions to this file (default: stdout)")
+    parser.add_argument("--seed", type=int, default=0, help="Random stimulus seed")
+    args = parser.parse_args()
+
+    p = load_params()
+    model = CrcModel(p[f"{args.crc}_DATA_WIDTH"], p[f"{args.crc}_WIDTH"], p[f"{args.crc}_POLY"],
+                     p.get(f"{args.crc}_SEED", 0), slices=args.slices)
+
+    if args.bits_per_cycle:
+        bits = args.bits_per_cycle
+        prefix = args.crc.lower()
+        text = sv_next_state(f"{prefix}_next_{bits}", model.crc_width, model.poly, bits)
+        # Words that are not a multiple of the step end with a shorter step
+        tails = {model.data_width % bits, (model.data_width + model.crc_width) % bits} - {0}
+        for tail in sorted(tails):
+            text += "\n" + sv_next_state(f"{prefix}_next_{tail}", model.crc_width, model.poly, tail)
+        for step in [bits, *sorted(tails)]:
+            equations = next_state_equations(model.crc_width, model.poly, step)
+            assert check_equations(equations, model.crc_width, model.poly, step), "equations do not match the LFSR"
+            xors = sum(max(len(c) + len(d) - 1, 0) for c, d in equations)
+            print(f"// {step} bits/cycle: {xors} two-input XORs, checked against the bit-serial LFSR")
+        if args.sv:
+            with open(args.sv, "w", encoding="utf8") as f:
+                f.write(text)
+            print(f"Equations written to {args.sv}")
+        else:
+            print(text, end="")
+        return
+
+    rng = np.random.default_rng(args.seed)
+    data = rng.integers(0, 1 << model.data_width, args.count, dtype=np.uint64)
+    results = {}
+    for method in ("table", "matrix", "serial"):
+        words = data if method != "serial" else data[:min(args.count, 20_000)]
+        start = time.perf_counter()
+        results[method] = model.compute(words, method)
+        elapsed = time.perf_counter() - start
+        print(f"{method:6}: {len(words) / elapsed / 1e6:8.2f} M words/s")
+    serial = len(results["serial"])
+    assert np.array_equal(results["table"], results["matrix"]), "table and matrix CRCs differ"
+    assert np.array_equal(results["table"][:serial], results["serial"]), "table and serial CRCs differ"
+
+    # Verifier: clean words pass, words with one flipped bit fail
+    words = (data << np.uint64(model.crc_width)) | results["table"]
+    flips = np.uint64(1) << rng.integers(0, model.data_width + model.crc_width, args.count, dtype=np.uint64)
+    for method in ("table", "matrix"):
+        assert model.check(words, method).all() and not model.check(words ^ flips, method).any(), \
+            f"{method} verifier mismatch"
+    print(f"{args.crc}: {args.count} words, all implementations agree")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+"""
+Bit-exact golden model of the downlink FEC datapath: dl_fec_engine
+(CRC0/CRC1 generators and CPC encoders, source/design/dl_fec.sv) and
+packet_scramble (frame layout and error injection, source/design/packet.sv).
+
+Every function works on whole batches of frames with NumPy, the first axis
+of every array being the frame index.
+
+Usage (from source/):
+    python -m model.dl_fec --count 1000000
+    python -m model.dl_fec --vectors stimulus.txt --out expected.csv
+"""
+import argparse
+import csv
+import time
+
+import numpy as np
+
+from .crc import CrcModel, from_bits, gf2_matmul, to_bits
+from .params import load_params
+
+# Bits of {msg_len, msg_tag} (the CRC1 data word) in the order packet_scramble
+# places them in format 1 frames: the msg_len nibbles are swapped
+FORMAT1_DATA_ORDER = (8, 9, 10, 11, 4, 5, 6, 7, 0, 1, 2, 3)
+
+
+def cpc_parity_matrix(width, depth):
+    """
+    GF(2) matrix of the encoder module over data_in bits (bit i*DEPTH+j is
+    data_in[i][j]): columns 0..DEPTH-1 are the row parities, columns
+    DEPTH..DEPTH+WIDTH-1 the column parities.
+    """
+    matrix = np.zeros((width * depth, depth + width), dtype=np.uint8)
+    for i in range(depth):
+        for j in range(depth):
+            matrix[i * depth + j, i] = 1
+    for j in range(min(width, depth)):
+        for i in range(depth):
+            matrix[i * depth + j, depth + j] = 1
+    return matrix
+
+
+def cluster_generator(crc, width, depth):
+    """
+    Generator of an encoding cluster: CRC and CPC parity are linear in the
+    data bits, so [crc, row parity, col parity] = data * G ^ c over GF(2).
+    Returns (G, c).
+    """
+    parity = cpc_parity_matrix(width, depth)
+    data_parity, crc_parity = parity[:crc.data_width], parity[crc.data_width:]
+    generator = np.concatenate([crc.matrix, data_parity ^ gf2_matmul(crc.matrix, crc_parity)], axis=1)
+    constant = np.concatenate([crc.seed_bits, gf2_matmul(crc.seed_bits, crc_parity)])
+    return generator, constant
+
+
+def frame_layout(data_bits, rows, row_width, frame_rows, frame_width, data_order=None):
+    """
+    Gather table of a packet_scramble frame format. Row k of the frame holds,
+    from bit 0: the lower half of its data bits, row parity k, the upper half
+    of its data bits, CRC bit k and column parity k; unused bits are 0.
+    Indices point into the concatenation [data, crc, row parity, col parity, 0],
+    data_order gives the data bit carried by each frame data position.
+    """
+    order = list(data_order or range(data_bits))
+    per_row = data_bits // rows
+    split = (per_row + 1) // 2
+    zero = data_bits + 3 * rows
+    table = np.full((frame_rows, frame_width), zero, dtype=np.intp)
+    for k in range(rows):
+        data = [order[k * per_row + j] for j in range(per_row)]
+        row = data[:split] + [data_bits + rows + k] + data[split:] + [data_bits + k, data_bits + 2 * rows + k]
+        assert len(row) == row_width, "frame row width does not match the encoder geometry"
+        table[k, :row_width] = row
+    return table
+
+
+class DlFecModel:
+    """Downlink FEC datapath with the parameters of defines.svh"""
+
+    def __init__(self, params=None):
+        p = params or load_params()
+        self.params = p
+        self.crc0 = CrcModel.from_params(p, "CRC0")
+        self.crc1 = CrcModel.from_params(p, "CRC1")
+        self.enc0_shape = (p["ENC0_DATA_WIDTH"], p["ENC0_DATA_DEPTH"])
+        self.enc1_shape = (p["ENC1_DATA_WIDTH"], p["ENC1_DATA_DEPTH"])
+        self.frame_shape = (p["SERIAL_DATA_DEPTH"], p["SERIAL_DATA_WIDTH"])
+        self.layout0 = frame_layout(
+            p["CRC0_DATA_WIDTH"], p["ENC0_PAR_DATA_DEPTH"], p["ENC0_PAR_DATA_WIDTH"], *self.frame_shape)
+        self.layout1 = frame_layout(
+            p["CRC1_DATA_WIDTH"], p["ENC1_PAR_DATA_DEPTH"], p["ENC1_PAR_DATA_WIDTH"], *self.frame_shape,
+            data_order=FORMAT1_DATA_ORDER)
+        self.gen0 = cluster_generator(self.crc0, *self.enc0_shape)
+        self.gen1 = cluster_generator(self.crc1, *self.enc1_shape)
+        # Error injection covers the data and CRC0 bits of format 0 frames
+        self.err_inj_width = p["CRC0_DATA_WIDTH"] + p["CRC0_WIDTH"]
+
+    def encode(self, data, msg_len, msg_tag, err_inj_mask=0, err_inj_enable=0):
+        """
+        Encode a batch of messages.
+        data are the 56-bit dl_fec_engine data_in words (byte k = data_in[k]),
+        msg_len/msg_tag the message header; err_inj_mask (64 bits, mask_1 in
+        the upper half) and err_inj_enable are the packet_scramble inputs.
+        All arguments are scalars or arrays of the batch size.
+        Returns a dict of arrays: the dl_fec_engine outputs as integers and
+        both frame formats as bit arrays (frames, SERIAL_DATA_DEPTH, SERIAL_DATA_WIDTH).
+        """
+        data = np.atleast_1d(np.asarray(data, dtype=np.uint64))
+        count = data.shape[0]
+        msg_len = np.broadcast_to(np.asarray(msg_len, dtype=np.uint64), (count,))
+        msg_tag = np.broadcast_to(np.asarray(msg_tag, dtype=np.uint64), (count,))
+
+        # 64-bit cluster: CRC0 over the data, CPC over {crc0, data}
+        data_bits = to_bits(data, self.crc0.data_width)
+        check0 = gf2_matmul(data_bits, self.gen0[0]) ^ self.gen0[1]
+
+        # 16-bit cluster: CRC1 over {msg_len, msg_tag}, CPC over {crc1, msg_len, msg_tag}
+        header_bits = to_bits((msg_len << np.uint64(4)) | msg_tag, self.crc1.data_width)
+        check1 = gf2_matmul(header_bits, self.gen1[0]) ^ self.gen1[1]
+
+        # Error injection flips data/CRC0 bits after encoding
+        d0, c0 = self.crc0.data_width, self.crc0.crc_width
+        flip = to_bits(err_inj_mask, self.err_inj_width) & np.asarray(err_inj_enable, dtype=np.uint8)[..., None]
+        zero = np.zeros((count, 1), dtype=np.uint8)
+        src0 = np.concatenate([data_bits, check0, zero], axis=-1)
+        src0[:, :d0 + c0] ^= flip
+        src1 = np.concatenate([header_bits, check1, zero], axis=-1)
+
+        r0, r1 = self.enc0_shape[1], self.enc1_shape[1]
+        c1 = self.crc1.crc_width
+        return {
+            "crc0": from_bits(check0[:, :c0]),
+            "enc0_row_p": from_bits(check0[:, c0:c0 + r0]),
+            "enc0_col_p": from_bits(check0[:, c0 + r0:]),
+            "crc1": from_bits(check1[:, :c1]),
+            "enc1_row_p": from_bits(check1[:, c1:c1 + r1]),
+            "enc1_col_p": from_bits(check1[:, c1 + r1:]),
+            "format0": np.take(src0, self.layout0, axis=1),
+            "format1": np.take(src1, self.layout1, axis=1),
+        }
+
+
+def par_out(frames):
+    """Pack frames (..., rows, width) into the rows of packet_scramble's par_out"""
+    return from_bits(frames)
+
+
+def frame_hex(frames):
+    """par_out of every frame as the hex string SystemVerilog prints with %h"""
+    rows = par_out(frames)
+    width = frames.shape[-1]
+    digits = (rows.shape[-1] * width + 3) // 4
+    return [
+        format(sum(int(v) << (width * k) for k, v in enumerate(frame_rows)), f"0{digits}x")
+        for frame_rows in rows
+    ]
+
+
+def read_vectors(path):
+    """Read stimulus lines 'data msg_len msg_tag [err_inj_mask err_inj_enable]' in hex"""
+    columns = [[], [], [], [], []]
+    with open(path, "r", encoding="utf8") as f:
+        for line in f:
+            fields = line.split("#", 1)[0].split()
+            if not fields:
+                continue
+            fields += ["0"] * (5 - len(fields))
+            for column, field in zip(columns, fields):
+                column.append(int(field, 16))
+    return [np.array(c, dtype=np.uint64) for c in columns]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Downlink FEC golden model")
+    parser.add_argument("--vectors", help="Stimulus file, one 'data msg_len msg_tag [err_inj_mask err_inj_enable]' line in hex per message")
+    parser.add_argument("--out", help="CSV of the expected dl_fec_engine outputs and frames (default: stdout summary)")
+    parser.add_argument("--count", type=int, default=1_000_000, help="Number of random messages when no vectors are given")
+    parser.add_argument("--seed", type=int, default=0, help="Random stimulus seed")
+    args = parser.parse_args()
+
+    model = DlFecModel()
+    if args.vectors:
+        data, msg_len, msg_tag, mask, enable = read_vectors(args.vectors)
+    else:
+        rng = np.random.default_rng(args.seed)
+        data = rng.integers(0, 1 << model.crc0.data_width, args.count, dtype=np.uint64)
+        msg_len = rng.integers(0, 256, args.count, dtype=np.uint64)
+        msg_tag = rng.integers(0, 16, args.count, dtype=np.uint64)
+        mask, enable = 0, 0
+
+    start = time.perf_counter()
+    result = model.encode(data, msg_len, msg_tag, mask, enable)
+    elapsed = time.perf_counter() - start
+    print(f"Encoded {len(data)} messages in {elapsed:.3f} s ({len(data) / elapsed / 1e6:.2f} M frames/s)")
+
+    if args.out:
+        names = ["crc0", "enc0_row_p", "enc0_col_p", "crc1", "enc1_row_p", "enc1_col_p"]
+        with open(args.out, "w", encoding="utf8", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["data", "msg_len", "msg_tag", *names, "format0", "format1"])
+            for i, (f0, f1) in enumerate(zip(frame_hex(result["format0"]), frame_hex(result["format1"]))):
+                writer.writerow([
+                    f"{int(data[i]):014x}", f"{int(np.broadcast_to(msg_len, data.shape)[i]):02x}",
+                    f"{int(np.broadcast_to(msg_tag, data.shape)[i]):x}",
+                    *(f"{int(result[n][i]):x}" for n in names), f0, f1,
+                ])
+        print(f"Expected outputs written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
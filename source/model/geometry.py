@@ -0,0 +1,443 @@
+"""
+Generator of FEC block geometries: the encoding cluster parameters of
+defines.svh, packet_scramble/packet_unscramble (source/design/packet.sv)
+and the golden-model tables of model.dl_fec, all from one description.
+
+Cluster 0 (message data) is an N x N CPC block protected by a CRC-N: every
+frame row carries N-1 data bits, row parity, one CRC bit and column parity
+(frame_layout of model.dl_fec), so a frame is N rows of N+2 bits holding
+N*(N-1) data bits, which must be whole bytes. Cluster 1 (message ID) carries
+the 12-bit {msg_len, msg_tag} in a 4 x 4 block with a CRC-4 and keeps its
+geometry (ul_mon decodes msg_len from fixed frame bits); only its polynomial
+can change. Seeds must be 0: crc_verify_seq checks {data, crc} from a zero
+LFSR state, so a seeded CRC would never verify.
+
+The outputs are written to a directory (or over source/design with --apply):
+  defines.svh  the current defines.svh with the cluster parameters replaced
+  packet.sv    packet_scramble/packet_unscramble for the geometry
+  tables.npz   gather tables layout0/layout1 into [data, crc, row parity,
+               col parity, 0], cluster generators gen0/gen1 with constants
+               const0/const1 ([crc, row parity, col parity] = data * G ^ c)
+               and the CRC matrices crc0/crc1
+fec_fsm, dl_fec_engine, ul_fec_engine and dl_ctrl still move 7 message
+bytes per frame; other cluster 0 sizes are reported with a warning.
+
+Usage (from source/):
+    python -m model.geometry --out geometry
+    python -m model.geometry --enc0 16 --crc0-poly 0x18005 --out geometry16
+    python -m model.geometry --crc0-poly 0x107 --apply
+"""
+import argparse
+import math
+import re
+from pathlib import Path
+
+import numpy as np
+
+from .crc import CrcModel, gf2_matmul
+from .dl_fec import FORMAT1_DATA_ORDER, cluster_generator, frame_layout
+from .params import DEFINES_SVH, load_params
+
+PACKET_SV = DEFINES_SVH.parent / "packet.sv"
+
+# Message ID cluster: {msg_len, msg_tag} in a 4 x 4 block
+ENC1_SIZE = 4
+HEADER_FIELDS = (("msg_tag", 4), ("msg_len", 8))
+HEADER_WIDTH = sum(width for _, width in HEADER_FIELDS)
+ERR_INJ_WIDTH = 64
+
+
+def cluster_params(size, poly, seed, prefix, enc):
+    """
+    Parameters of an N x N cluster with a CRC-N, as {name: (value, literal,
+    comment)}; comment None keeps the one of defines.svh
+    """
+    if poly >> (size + 1):
+        raise ValueError(f"{prefix}_POLY 0x{poly:x} is wider than a CRC-{size} polynomial")
+    if seed:
+        raise ValueError(f"{prefix}_SEED 0x{seed:x}: crc_verify_seq only checks CRCs with a zero seed")
+    data_width = size * (size - 1)
+    return {
+        f"{prefix}_DATA_WIDTH": (
+            data_width, str(data_width), f"// {data_width}b data + {size}b CRC = {size * size}b"),
+        f"{prefix}_WIDTH": (size, str(size), None),
+        f"{prefix}_POLY": (poly, f"{size + 1}'b{poly:0{size + 1}b}", None),
+        f"{prefix}_SEED": (seed, "'0" if seed == 0 else f"{size}'h{seed:x}", None),
+        f"{prefix}_XOR_OPS_PER_CYCLE": (size, str(size), None),
+        f"{enc}_DATA_WIDTH": (size, str(size), f"// {size}x{size}={size * size}bits"),
+        f"{enc}_DATA_DEPTH": (size, str(size), None),
+        f"{enc}_PAR_DATA_WIDTH": (size + 2, str(size + 2), None),
+        f"{enc}_PAR_DATA_DEPTH": (size, str(size), None),
+    }
+
+
+def geometry_params(enc0_size, crc0_poly, crc0_seed=0, crc1_poly=0b10011, crc1_seed=0):
+    """
+    defines.svh parameters of a geometry as {name: (value, literal, comment)}.
+    Raises ValueError for geometries the frame format cannot carry.
+    """
+    if enc0_size < ENC1_SIZE + 2:
+        raise ValueError(f"cluster 0 must be at least {ENC1_SIZE + 2}x{ENC1_SIZE + 2} to carry the message ID frame")
+    data_width = enc0_size * (enc0_size - 1)
+    if data_width % 8:
+        raise ValueError(f"{enc0_size}x{enc0_size} cluster carries {data_width} data bits, not whole bytes")
+    chunk = data_width // 8
+    rx_faw = math.ceil(math.log2(chunk + 1))
+    return {
+        "UART_RX_FAW": (rx_faw, str(rx_faw), f"// Depth = {2**rx_faw}, one {data_width}-bit message chunk"),
+        **cluster_params(enc0_size, crc0_poly, crc0_seed, "CRC0", "ENC0"),
+        **cluster_params(ENC1_SIZE, crc1_poly, crc1_seed, "CRC1", "ENC1"),
+    }
+
+
+def render_defines(text, params, current):
+    """
+    defines.svh text with the values (and geometry comments) of params
+    replaced, values equal to the current parameters keep their literal
+    """
+    for name, (value, literal, comment) in params.items():
+        decl = re.compile(rf"(\bparameter\b[^=;\n]*\b{name}\s*=\s*)([^;]*)(;)([ \t]*//[^\n]*)?")
+        m = decl.search(text)
+        if m is None:
+            raise KeyError(f"parameter {name} not found in defines.svh")
+        tail = m.group(4) or ""
+        if comment is not None:
+            tail = " " + comment
+        if current.get(name) == value:
+            literal = m.group(2)
+        text = text[:m.start()] + m.group(1) + literal + m.group(3) + tail + text[m.end():]
+    return text
+
+
+def _ranges(items):
+    """Join (signal, index) items of a row, MSB first, into SV concatenation terms"""
+    terms = []
+    for name, index in items:
+        if terms and terms[-1][0] == name and name is not None and terms[-1][2] - 1 == index:
+            terms[-1][2] = index
+        elif terms and terms[-1][0] is None and name is None:
+            terms[-1][1] += 1
+        else:
+            terms.append([name, index if name else 1, index])
+    out = []
+    for name, hi, lo in terms:
+        if name is None:
+            out.append(f"{hi}'b0")
+        elif hi == lo:
+            out.append(f"{name}[{lo}]")
+        else:
+            out.append(f"{name}[{hi}:{lo}]")
+    return out
+
+
+class PacketGeometry:
+    """Frame mapping of packet_scramble/packet_unscramble for defines.svh parameters"""
+
+    def __init__(self, params):
+        p = params
+        self.params = p
+        self.frame_shape = (p["SERIAL_DATA_DEPTH"], p["SERIAL_DATA_WIDTH"])
+        self.data0, self.crc0 = p["CRC0_DATA_WIDTH"], p["CRC0_WIDTH"]
+        self.rows0, self.rows1 = p["ENC0_PAR_DATA_DEPTH"], p["ENC1_PAR_DATA_DEPTH"]
+        self.data1, self.crc1 = p["CRC1_DATA_WIDTH"], p["CRC1_WIDTH"]
+        self.enc1_width = p["ENC1_DATA_WIDTH"]
+        if self.data1 != HEADER_WIDTH:
+            raise ValueError(f"CRC1_DATA_WIDTH must be {HEADER_WIDTH}, the {{msg_len, msg_tag}} width")
+        self.layout0 = frame_layout(self.data0, self.rows0, p["ENC0_PAR_DATA_WIDTH"], *self.frame_shape)
+        self.layout1 = frame_layout(
+            self.data1, self.rows1, p["ENC1_PAR_DATA_WIDTH"], *self.frame_shape,
+            data_order=FORMAT1_DATA_ORDER)
+        # Frame data positions of format 1, as packet_unscramble hands them to ul_fec_engine
+        self.positions1 = frame_layout(self.data1, self.rows1, p["ENC1_PAR_DATA_WIDTH"], *self.frame_shape)
+
+    def _source0(self, index):
+        """Signal of packet_scramble format 0 for a layout0 index"""
+        d, c, r = self.data0, self.crc0, self.rows0
+        if index < d + c:
+            return "d", index
+        if index < d + c + r:
+            return "enc0_row_p", index - d - c
+        if index < d + c + 2 * r:
+            return "enc0_col_p", index - d - c - r
+        return None, 0
+
+    def _source1(self, index):
+        """Signal of packet_scramble format 1 for a layout1 index"""
+        d, r = self.data1, self.rows1
+        if index < d:
+            for name, width in HEADER_FIELDS:
+                if index < width:
+                    return name, index
+                index -= width
+        for k, name in enumerate(("crc1_data", "enc1_row_p", "enc1_col_p")):
+            if index < d + (k + 1) * r:
+                return name, index - d - k * r
+        return None, 0
+
+    def scramble_rows(self, layout, source):
+        """Rows of a frame format as SV concatenations, row DATA_DEPTH-1 first"""
+        rows = []
+        digits = len(str(layout.shape[0] - 1))
+        for k in reversed(range(layout.shape[0])):
+            items = [source(int(i)) for i in reversed(layout[k])]
+            rows.append(f"/* {k:>{digits}} */ {{{', '.join(_ranges(items))}}}")
+        return rows
+
+    def unscramble0(self):
+        """(target, par_in bit, comment) assignments of the format 0 frame"""
+        d, c, r = self.data0, self.crc0, self.rows0
+        found = {}
+        for (row, col), index in np.ndenumerate(self.layout0):
+            found[int(index)] = (row, col)
+        out = []
+        for i in range(d):
+            out.append((f"data_out[{i // 8}][{i % 8}]", found[i], f"d{i}"))
+        for k in range(c):
+            out.append((f"crc0_data[{k}]", found[d + k], f"d{d + k}"))
+        for k in range(r):
+            out.append((f"enc0_row_p[{k}]", found[d + c + k], f"r{k}"))
+        for k in range(r):
+            out.append((f"enc0_col_p[{k}]", found[d + c + r + k], f"c{k}"))
+        return out
+
+    def unscramble1(self):
+        """(target, par_in bit, comment) assignments of the format 1 frame"""
+        d, r, w = self.data1, self.rows1, self.enc1_width
+        found = {}
+        for (row, col), index in np.ndenumerate(self.positions1):
+            found[int(index)] = (row, col)
+        out = []
+        for j in range(d):
+            out.append((f"data_out[{j // w}][{j % w}]", found[j], f"d{j}"))
+        for k, name in enumerate(("crc1_data", "enc1_row_p", "enc1_col_p")):
+            for i in range(r):
+                label = (f"d{d + i}", f"r{i}", f"c{i}")[k]
+                out.append((f"{name}[{i}]", found[d + k * r + i], label))
+        return out
+
+    def render(self, title):
+        """packet.sv source"""
+        def assigns(items):
+            width = max(len(t) for t, _, _ in items)
+            return "\n".join(f"      {t:<{width}} = par_in[{row}][{col}]; // {label}"
+                             for t, (row, col), label in items)
+
+        d, c = self.data0, self.crc0
+        injected = min(d + c, ERR_INJ_WIDTH)
+        return PACKET_TEMPLATE.format(
+            title=title,
+            data_msb=d - 1, crc_lsb=d, crc_msb=d + c - 1, row0_msb=self.rows0 - 1,
+            crc1_lsb=self.data1, crc1_msb=self.data1 + self.crc1 - 1, row1_msb=self.rows1 - 1,
+            inj_msb=injected - 1,
+            format0=",\n".join("    " + row for row in self.scramble_rows(self.layout0, self._source0)),
+            format1=",\n".join("    " + row for row in self.scramble_rows(self.layout1, self._source1)),
+            unscramble1=assigns(self.unscramble1()),
+            unscramble0=assigns(self.unscramble0()),
+        )
+
+
+PACKET_TEMPLATE = """\
+`include "defines.svh"
+
+// {title}
+// Generated by source/model/geometry.py, regenerate instead of editing
+
+module packet_scramble #(
+  parameter int DATA_WIDTH = 10,
+  parameter int DATA_DEPTH = 8
+)(
+  input  logic  enc_used,
+
+  // From FEC engine
+  // Encoding cluster 0 signals
+  input  logic [2**UART_RX_FAW-2:0][UART_MDW-1:0] data_in, // d0 to d{data_msb}
+  input  logic [CRC0_WIDTH-1:0]      crc0_data,          // d{crc_lsb} to d{crc_msb}
+  input  logic [ENC0_DATA_DEPTH-1:0] enc0_row_p,         // r0 to r{row0_msb}
+  input  logic [ENC0_DATA_WIDTH-1:0] enc0_col_p,         // c0 to c{row0_msb}
+
+  // Encoding cluster 1 signals
+  input  logic [7:0] msg_len,
+  input  logic [3:0] msg_tag,
+  input  logic [CRC1_WIDTH-1:0]      crc1_data,          // d{crc1_lsb} to d{crc1_msb}
+  input  logic [ENC1_DATA_DEPTH-1:0] enc1_row_p,         // r0 to r{row1_msb}
+  input  logic [ENC1_DATA_WIDTH-1:0] enc1_col_p,         // c0 to c{row1_msb}
+
+  // Err inject registers
+  input logic [63:0] err_inj_mask,
+  input logic        err_inj_enable,
+
+  // Output to serializer
+  output logic [DATA_DEPTH-1:0][DATA_WIDTH-1:0] par_out
+);
+
+  // Data and CRC0 bits (d0 to d{crc_msb}), err_inj_mask flips d0 to d{inj_msb}
+  localparam int D_WIDTH = CRC0_DATA_WIDTH + CRC0_WIDTH;
+
+  logic [UART_RX_WIDTH-1:0] data;
+  logic [D_WIDTH-1:0]       d;
+
+  assign data = data_in;
+  assign d    = {{crc0_data, data[CRC0_DATA_WIDTH-1:0]}} ^
+                (D_WIDTH'(err_inj_mask) & {{D_WIDTH{{err_inj_enable}}}});
+
+  // Frame format 0 (cluster 0 frame)
+  logic [DATA_DEPTH-1:0][DATA_WIDTH-1:0] format0;
+
+  assign format0 = {{
+{format0}
+  }};
+
+  // Frame format 1 (cluster 1 frame)
+  logic [DATA_DEPTH-1:0][DATA_WIDTH-1:0] format1;
+
+  assign format1 = {{
+{format1}
+  }};
+
+  // Output multiplexer
+  assign par_out = (enc_used)? format1 : format0;
+
+endmodule
+
+
+module packet_unscramble #(
+  parameter int DATA_WIDTH = 10,
+  parameter int DATA_DEPTH = 8
+)(
+  input  logic  enc_used,
+  // Output to UL FEC engine
+  output logic [2**UART_RX_FAW-2:0][UART_MDW-1:0] data_out, // d0 to d{data_msb}
+  // Decoding cluster 0 signals
+  output logic [CRC0_WIDTH-1:0]      crc0_data,          // d{crc_lsb} to d{crc_msb}
+  output logic [ENC0_DATA_DEPTH-1:0] enc0_row_p,         // r0 to r{row0_msb}
+  output logic [ENC0_DATA_WIDTH-1:0] enc0_col_p,         // c0 to c{row0_msb}
+  // Decoding cluster 1 signals
+  output logic [CRC1_WIDTH-1:0]      crc1_data,          // d{crc1_lsb} to d{crc1_msb}
+  output logic [ENC1_DATA_DEPTH-1:0] enc1_row_p,         // r0 to r{row1_msb}
+  output logic [ENC1_DATA_WIDTH-1:0] enc1_col_p,         // c0 to c{row1_msb}
+  // Input from deserializer
+  input  logic [DATA_DEPTH-1:0][DATA_WIDTH-1:0] par_in
+);
+
+  always_comb begin
+    // Unused bits
+    data_out   = 'b0;
+    crc0_data  = 'b0;
+    enc0_row_p = 'b0;
+    enc0_col_p = 'b0;
+    crc1_data  = 'b0;
+    enc1_row_p = 'b0;
+    enc1_col_p = 'b0;
+
+    // Encoding cluster 1 frame, data in the low ENC1_DATA_WIDTH bits of each byte
+    if(enc_used) begin
+{unscramble1}
+    end
+    // Encoding cluster 0 frame
+    else begin
+{unscramble0}
+    end
+  end
+
+endmodule
+"""
+
+
+def geometry_tables(params):
+    """Golden-model tables of a geometry as {name: array}"""
+    packet = PacketGeometry(params)
+    crc0 = CrcModel.from_params(params, "CRC0")
+    crc1 = CrcModel.from_params(params, "CRC1")
+    gen0 = cluster_generator(crc0, params["ENC0_DATA_WIDTH"], params["ENC0_DATA_DEPTH"])
+    gen1 = cluster_generator(crc1, params["ENC1_DATA_WIDTH"], params["ENC1_DATA_DEPTH"])
+    return {
+        "layout0": packet.layout0, "layout1": packet.layout1,
+        "gen0": gen0[0], "const0": gen0[1], "gen1": gen1[0], "const1": gen1[1],
+        "crc0": crc0.matrix, "crc1": crc1.matrix,
+    }
+
+
+def check_tables(tables, params, count=1000, seed=0):
+    """
+    Round trip of random cluster 0 data through the tables: the frame must
+    carry every data, CRC and parity bit once, and the CRC must verify
+    """
+    rng = np.random.default_rng(seed)
+    crc0 = CrcModel.from_params(params, "CRC0")
+    data = rng.integers(0, 2, (count, crc0.data_width), dtype=np.uint8)
+    check = gf2_matmul(data, tables["gen0"]) ^ tables["const0"]
+    src = np.concatenate([data, check, np.zeros((count, 1), dtype=np.uint8)], axis=-1)
+    frames = np.take(src, tables["layout0"], axis=1)
+    carried = np.sort(tables["layout0"][tables["layout0"] < src.shape[1] - 1])
+    assert np.array_equal(carried, np.arange(src.shape[1] - 1)), "format 0 does not carry every bit once"
+    received = np.zeros_like(src)
+    received[:, tables["layout0"].ravel()] = frames.reshape(count, -1)
+    data_crc = np.concatenate([received[:, crc0.data_width:crc0.data_width + crc0.crc_width],
+                               received[:, :crc0.data_width]], axis=-1)
+    assert crc0.verify(data_crc).all(), "CRC0 does not verify"
+
+
+def summary(params):
+    """Printable figures of a geometry"""
+    frame = params["SERIAL_DATA_WIDTH"] * params["SERIAL_DATA_DEPTH"]
+    data = params["CRC0_DATA_WIDTH"]
+    lines = [
+        f"Cluster 0: {params['ENC0_DATA_WIDTH']}x{params['ENC0_DATA_DEPTH']} CPC, "
+        f"CRC-{params['CRC0_WIDTH']} 0x{params['CRC0_POLY']:x} seed 0x{params['CRC0_SEED']:x}",
+        f"Cluster 1: {params['ENC1_DATA_WIDTH']}x{params['ENC1_DATA_DEPTH']} CPC, "
+        f"CRC-{params['CRC1_WIDTH']} 0x{params['CRC1_POLY']:x} seed 0x{params['CRC1_SEED']:x}",
+        f"Frame: {params['SERIAL_DATA_DEPTH']} x {params['SERIAL_DATA_WIDTH']} bits, "
+        f"{data} data bits ({data // 8} bytes), efficiency {100 * data / frame:.1f} %",
+    ]
+    return lines
+
+
+def main():
+    defaults = load_params()
+    parser = argparse.ArgumentParser(description="FEC block geometry generator")
+    parser.add_argument("--enc0", type=int, default=defaults["ENC0_DATA_DEPTH"],
+                        help="Cluster 0 size N (N x N data block, CRC-N, N*(N-1) data bits)")
+    parser.add_argument("--crc0-poly", type=lambda v: int(v, 0), default=defaults["CRC0_POLY"],
+                        help="CRC0 polynomial, the x^N term is optional (default: defines.svh)")
+    parser.add_argument("--crc0-seed", type=lambda v: int(v, 0), default=defaults["CRC0_SEED"], help="CRC0 seed, must be 0")
+    parser.add_argument("--crc1-poly", type=lambda v: int(v, 0), default=defaults["CRC1_POLY"],
+                        help="CRC1 polynomial, the x^4 term is optional (default: defines.svh)")
+    parser.add_argument("--crc1-seed", type=lambda v: int(v, 0), default=defaults["CRC1_SEED"], help="CRC1 seed, must be 0")
+    parser.add_argument("--out", default="geometry", help="Output directory")
+    parser.add_argument("--apply", action="store_true",
+                        help="Write defines.svh and packet.sv over source/design (tables to --out)")
+    args = parser.parse_args()
+
+    try:
+        values = geometry_params(args.enc0, args.crc0_poly, args.crc0_seed, args.crc1_poly, args.crc1_seed)
+    except ValueError as e:
+        parser.error(str(e))
+    defines = render_defines(DEFINES_SVH.read_text(encoding="utf8"), values, defaults)
+
+    out = Path(args.out)
+    out.mkdir(parents=True, exist_ok=True)
+    defines_path = DEFINES_SVH if args.apply else out / "defines.svh"
+    packet_path = PACKET_SV if args.apply else out / "packet.sv"
+    defines_path.write_text(defines, encoding="utf8")
+    params = load_params(defines_path)
+
+    size0 = params["ENC0_DATA_DEPTH"]
+    title = (f"Frame formats of a {size0}x{size0} cluster 0 with CRC-{size0} and a "
+             f"{ENC1_SIZE}x{ENC1_SIZE} cluster 1 with CRC-{ENC1_SIZE}")
+    packet_path.write_text(PacketGeometry(params).render(title), encoding="utf8")
+    tables = geometry_tables(params)
+    check_tables(tables, params)
+    np.savez(out / "tables.npz", **tables)
+
+    for line in summary(params):
+        print(line)
+    print(f"Wrote {defines_path}, {packet_path} and {out / 'tables.npz'}")
+    if params["CRC0_DATA_WIDTH"] != 56:
+        print("Warning: fec_fsm, dl_fec_engine, ul_fec_engine and dl_ctrl move 7 message bytes per frame")
+    if params["UART_RX_WIDTH"] != params["CRC0_DATA_WIDTH"]:
+        print(f"Warning: UART RX chunk of {params['UART_RX_WIDTH']} bits is wider than the "
+              f"{params['CRC0_DATA_WIDTH']} data bits of a frame")
+
+
+if __name__ == "__main__":
+    main()
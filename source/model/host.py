@@ -0,0 +1,164 @@
+"""
+Host side of the UART control protocol of dl_fec_fsm (source/design/fec_fsm.sv):
+single and burst register access and message transmission.
+
+Command codes and register addresses are read from the command_t and
+reg_addr_t enums of defines.svh; registers are given by address or by
+name without the REG_ADDR_ prefix (e.g. "DL_SER_CLK_DIV").
+
+Burst commands carry a count byte: bits [6:0] the number of registers
+(1..127) and bit 7 the address mode, 0 for a start address incremented
+by 4 per register and 1 for one address per register.
+  CMD_REG_BURST_WRITE, count, addr, data(4) [, addr], data(4) ...
+      -> RSP_BURST_WRITE_RES, count, writes answered with pslverr
+  CMD_REG_BURST_READ, count, addr [, addr ...]
+      -> RSP_BURST_READ_RES, count, data(4) ...
+Data words are sent MSB first.
+
+The link is any object with write(bytes) and read(n) -> bytes, e.g. a
+pyserial Serial port.
+
+Usage (from source/):
+    python -m model.host --port /dev/ttyUSB0 --read DL_SER_CLK_DIV UART_PR UART_CTRL UART_CFG
+    python -m model.host --port /dev/ttyUSB0 --write DL_ERR_INJ_MASK_0=0xdeadbeef DL_ERR_INJ_ENABLE=1
+"""
+import argparse
+
+from .params import load_enum, load_params
+
+BURST_MAX = 127
+BURST_LIST = 0x80
+
+
+class ProtocolError(RuntimeError):
+    """Unexpected or error response from the FEC"""
+
+
+class FecHost:
+    """UART control protocol with the command codes of defines.svh"""
+
+    def __init__(self, link):
+        self.link = link
+        self.cmd = load_enum("command_t")
+        self.registers = {
+            name[len("REG_ADDR_"):]: addr for name, addr in load_enum("reg_addr_t").items()
+        }
+
+    def address(self, reg):
+        """Register address of a reg_addr_t name or address"""
+        return self.registers[reg] if isinstance(reg, str) else int(reg)
+
+    def _response(self, rsp, length):
+        """Read a length byte response starting with the rsp command_t"""
+        head = self.link.read(1)
+        if not head:
+            raise ProtocolError("no response")
+        if head[0] == self.cmd["RSP_CMD_ERR"]:
+            code = self.link.read(1)
+            raise ProtocolError(f"command error, code 0x{code[0] if code else 0:02x}")
+        if head[0] != self.cmd[rsp]:
+            raise ProtocolError(f"expected {rsp}, got 0x{head[0]:02x}")
+        body = self.link.read(length - 1)
+        if len(body) != length - 1:
+            raise ProtocolError(f"{rsp} truncated")
+        return body
+
+    def read_register(self, reg):
+        """CMD_REG_READ of a single register"""
+        self.link.write(bytes([self.cmd["CMD_REG_READ"], self.address(reg)]))
+        return int.from_bytes(self._response("RSP_READ_RES", 5), "big")
+
+    def write_register(self, reg, value):
+        """CMD_REG_WRITE of a single register, returns the pslverr flag"""
+        addr = self.address(reg)
+        self.link.write(bytes([self.cmd["CMD_REG_WRITE"], addr]) + int(value).to_bytes(4, "big"))
+        return bool(self._response("RSP_WRITE_RES", 3)[1] & 1)
+
+    @staticmethod
+    def _bursts(addrs):
+        """Split addresses into (addresses, count byte) bursts"""
+        for start in range(0, len(addrs), BURST_MAX):
+            chunk = addrs[start:start + BURST_MAX]
+            contiguous = all(b - a == 4 for a, b in zip(chunk, chunk[1:]))
+            yield chunk, len(chunk) | (0 if contiguous else BURST_LIST)
+
+    def read_registers(self, regs):
+        """Read registers with CMD_REG_BURST_READ, one command per 127 registers"""
+        addrs = [self.address(r) for r in regs]
+        values = []
+        for chunk, count in self._bursts(addrs):
+            listed = chunk if count & BURST_LIST else chunk[:1]
+            self.link.write(bytes([self.cmd["CMD_REG_BURST_READ"], count, *listed]))
+            body = self._response("RSP_BURST_READ_RES", 2 + 4 * len(chunk))
+            values += [int.from_bytes(body[1 + 4 * k:5 + 4 * k], "big") for k in range(len(chunk))]
+        return values
+
+    def write_registers(self, items):
+        """
+        Write {reg: value} or (reg, value) pairs with CMD_REG_BURST_WRITE.
+        Returns the number of writes answered with pslverr.
+        """
+        items = list(items.items() if isinstance(items, dict) else items)
+        addrs = [self.address(r) for r, _ in items]
+        errors, start = 0, 0
+        for chunk, count in self._bursts(addrs):
+            frame = bytearray([self.cmd["CMD_REG_BURST_WRITE"], count])
+            for k, addr in enumerate(chunk):
+                if k == 0 or count & BURST_LIST:
+                    frame.append(addr)
+                frame += int(items[start + k][1]).to_bytes(4, "big")
+            self.link.write(bytes(frame))
+            errors += self._response("RSP_BURST_WRITE_RES", 3)[1]
+            start += len(chunk)
+        return errors
+
+    def transmit(self, data, tag=0, stream=False):
+        """
+        Send a message over the downlink (1..255 bytes). CMD_TX_MSG waits for
+        RSP_TX_RES and returns its result code; CMD_TX_STREAM is not answered.
+        """
+        data = bytes(data)
+        cmd = "CMD_TX_STREAM" if stream else "CMD_TX_MSG"
+        self.link.write(bytes([self.cmd[cmd], len(data), tag & 0xF]) + data)
+        if stream:
+            return None
+        return self._response("RSP_TX_RES", 3)[1]
+
+
+def open_port(port, baud):
+    """pyserial port with the UART_PARITY_TYPE of defines.svh"""
+    try:
+        import serial
+    except ImportError:
+        raise SystemExit("pyserial is not installed: pip install pyserial")
+
+    parity = [serial.PARITY_NONE, serial.PARITY_ODD, serial.PARITY_EVEN, serial.PARITY_SPACE,
+              serial.PARITY_MARK][load_params()["UART_PARITY_TYPE"]]
+    return serial.Serial(port, baud, parity=parity, timeout=1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="FEC UART host")
+    parser.add_argument("--port", required=True, help="Serial port of the FEC UART")
+    parser.add_argument("--baud", type=int, default=115200, help="Baud rate (UART_PR reset value: 115741)")
+    parser.add_argument("--read", nargs="*", default=[], help="Registers to read (name or address)")
+    parser.add_argument("--write", nargs="*", default=[], help="NAME=VALUE register writes")
+    args = parser.parse_args()
+
+    with open_port(args.port, args.baud) as port:
+        host = FecHost(port)
+        if args.write:
+            items = []
+            for item in args.write:
+                name, _, value = item.partition("=")
+                items.append((name if name in host.registers else int(name, 0), int(value, 0)))
+            errors = host.write_registers(items)
+            print(f"Wrote {len(items)} registers, {errors} errors")
+        if args.read:
+            regs = [r if r in host.registers else int(r, 0) for r in args.read]
+            for reg, value in zip(args.read, host.read_registers(regs)):
+                print(f"{reg:<20} 0x{value:08x}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Parameters of the RTL, parsed from the `parameter`/`localparam`
+declarations and `typedef enum`s of source/design/defines.svh.
+"""
+import math
+import re
+from pathlib import Path
+
+DEFINES_SVH = Path(__file__).resolve().parent.parent / "design" / "defines.svh"
+
+# parameter/localparam [type] [[msb:lsb]] NAME = expression;
+_DECL = re.compile(
+    r"\b(?:parameter|localparam)\s+(?:int|integer|logic|bit)?\s*"
+    r"(?:\[(?P<msb>[^:\]]+):(?P<lsb>[^\]]+)\])?\s*(?P<name>\w+)\s*=\s*(?P<expr>[^;]+);"
+)
+# Sized or unsized based literals: 9'b10000111, 'b10011, 8'h0c, 'd7
+_LITERAL = re.compile(r"(\d+)?'([sS]?)([bodhBODH])([0-9a-fA-F_xXzZ]+)")
+_BASES = {"b": 2, "o": 8, "d": 10, "h": 16}
+# typedef enum [type] { NAME = value, ... } type_name;
+_ENUM = re.compile(r"\btypedef\s+enum\b[^{]*\{(?P<body>[^}]*)\}\s*(?P<name>\w+)\s*;")
+
+
+def _strip_comments(text):
+    text = re.sub(r"/\*.*?\*/", "", text, flags=re.S)
+    return re.sub(r"//[^\n]*", "", text)
+
+
+def _evaluate(expr, params, width=None):
+    """Evaluate a constant SV expression over the parameters parsed so far"""
+    expr = " ".join(expr.split())
+    # Fill literals: '0 and '1 (all ones over the declared width)
+    if expr == "'0":
+        return 0
+    if expr == "'1":
+        return (1 << width) - 1 if width else 1
+    expr = _LITERAL.sub(
+        lambda m: str(int(m.group(4).replace("_", ""), _BASES[m.group(3).lower()])), expr
+    )
+    expr = expr.replace("$clog2", "clog2").replace("/", "//")
+    namespace = {"clog2": lambda v: max(0, math.ceil(math.log2(v))), **params}
+    return eval(expr, {"__builtins__": {}}, namespace)
+
+
+def load_params(defines_svh=DEFINES_SVH):
+    """Return {name: int} for every integer parameter of defines.svh"""
+    text = _strip_comments(Path(defines_svh).read_text(encoding="utf8"))
+    params = {}
+    for m in _DECL.finditer(text):
+        width = None
+        if m.group("msb") is not None:
+            width = _evaluate(m.group("msb"), params) - _evaluate(m.group("lsb"), params) + 1
+        try:
+            params[m.group("name")] = int(_evaluate(m.group("expr"), params, width))
+        except (NameError, SyntaxError, TypeError, ValueError):
+            # Non-integer parameters (e.g. real or string) are not modeled
+            continue
+    return params
+
+
+def load_enum(type_name, defines_svh=DEFINES_SVH):
+    """Return {name: int} for the explicitly valued members of a typedef enum of defines.svh"""
+    text = _strip_comments(Path(defines_svh).read_text(encoding="utf8"))
+    for m in _ENUM.finditer(text):
+        if m.group("name") == type_name:
+            members = {}
+            for item in m.group("body").split(","):
+                name, _, expr = item.partition("=")
+                if expr.strip():
+                    members[name.strip()] = int(_evaluate(expr, {}))
+            return members
+    raise KeyError(f"enum {type_name} not found in {defines_svh}")
@@ -0,0 +1,108 @@
+"""
+Readout of the performance counters of reg_cfg (REG_ADDR_PERF_*, module
+perf_counters in source/design/reg_cfg.sv) over the UART control protocol,
+decoded into totals and rates per second.
+
+PERF_CTRL bits are single cycle pulses: [0] copies the live counters to the
+PERF_* registers (snapshot), [1] restarts them (clear). Both in one write
+read out the interval since the previous clear and start the next one.
+  PERF_CYCLES            clock cycles, the time base of the rates
+  PERF_DL_ENC0_FRAMES    64-bit frames encoded (7 message bytes each)
+  PERF_DL_ENC1_FRAMES    16-bit frames encoded (message ID, one per message)
+  PERF_UL_FRAMES         UL frames decoded, of them
+  PERF_UL_CORRECTED        with a corrected error
+  PERF_UL_UNCORRECTABLE    flagged ul_fec_uncor_err
+  PERF_UL_CRC_ERRORS       failing the CRC check
+  PERF_UART_FRAME_ERR    received bytes with a frame error
+  PERF_UART_TIMEOUT      commands aborted by an RX timeout
+  PERF_STALL_UART_TX     cycles dl_fec_fsm waited on dl_uart_tx_grant
+  PERF_STALL_DL_CTRL     cycles an encoded frame waited on the serializer
+  PERF_FIFO_HWM          high-water marks, [7:0] RX buffer, [15:8] TX FIFO,
+                         [23:16] UL FIFO
+Counters saturate at 2**32-1 (PERF_CYCLES after 85.9 s at 50 MHz).
+
+Usage (from source/):
+    python -m model.perf --port /dev/ttyUSB0 --clear
+    python -m model.perf --port /dev/ttyUSB0 --interval 1 --repeat 10
+"""
+import argparse
+import time
+
+from .host import FecHost, open_port
+from .params import load_params
+
+SNAPSHOT = 0x1
+CLEAR = 0x2
+SATURATED = 2**32 - 1
+
+STALLS = ("STALL_UART_TX", "STALL_DL_CTRL")
+# High-water mark bytes of PERF_FIFO_HWM: (name, address width parameter)
+FIFOS = (("RX buffer", "UART_RX_BUF_FAW"), ("TX FIFO", "UART_TX_FAW"), ("UL FIFO", "UL_FIFO_FAW"))
+
+
+def counter_names(host):
+    """PERF_* counter registers in address order, without the PERF_ prefix"""
+    regs = sorted((addr, name) for name, addr in host.registers.items()
+                  if name.startswith("PERF_") and name != "PERF_CTRL")
+    return [name[len("PERF_"):] for _, name in regs]
+
+
+def snapshot(host, clear=False):
+    """Snapshot (and optionally clear) the counters, returns {name: value}"""
+    host.write_register("PERF_CTRL", SNAPSHOT | (CLEAR if clear else 0))
+    names = counter_names(host)
+    return dict(zip(names, host.read_registers(["PERF_" + n for n in names])))
+
+
+def fifo_depths(params):
+    """Depth of each PERF_FIFO_HWM FIFO, RX FIFO when there is no RX buffer"""
+    faws = [params[faw] for _, faw in FIFOS]
+    if faws[0] == 0:
+        faws[0] = params["UART_RX_FAW"]
+    return [2**faw for faw in faws]
+
+
+def decode(counters, clk_hz, params):
+    """Rows of (counter, value, decoded) of a snapshot"""
+    cycles = counters["CYCLES"]
+    seconds = cycles / clk_hz
+    rows = []
+    for name, value in counters.items():
+        mark = " (saturated)" if value == SATURATED else ""
+        if name == "CYCLES":
+            text = f"{seconds:.6f} s"
+        elif name == "FIFO_HWM":
+            text = ", ".join(f"{fifo} {(value >> 8 * k) & 0xFF}/{depth}"
+                             for k, ((fifo, _), depth) in enumerate(zip(FIFOS, fifo_depths(params))))
+        elif name in STALLS:
+            text = f"{100 * value / cycles:.2f} % of cycles" if cycles else "-"
+        else:
+            text = f"{value / seconds:.1f} /s" if cycles else "-"
+        rows.append((name, value, text + mark))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="FEC performance counters readout")
+    parser.add_argument("--port", required=True, help="Serial port of the FEC UART")
+    parser.add_argument("--baud", type=int, default=115200, help="Baud rate (UART_PR reset value: 115741)")
+    parser.add_argument("--clk-mhz", type=float, default=50.0, help="System clock (SYS_CLK_PERIOD: 20 ns)")
+    parser.add_argument("--clear", action="store_true", help="Restart the counters after the first snapshot")
+    parser.add_argument("--interval", type=float, default=0.0, help="Seconds between snapshots, each clears the counters")
+    parser.add_argument("--repeat", type=int, default=1, help="Number of snapshots")
+    args = parser.parse_args()
+
+    params = load_params()
+    with open_port(args.port, args.baud) as port:
+        host = FecHost(port)
+        for k in range(args.repeat):
+            if k:
+                time.sleep(args.interval)
+            counters = snapshot(host, clear=args.clear or args.repeat > 1)
+            for name, value, text in decode(counters, args.clk_mhz * 1e6, params):
+                print(f"{name:<18} {value:>10}  {text}")
+            print()
+
+
+if __name__ == "__main__":
+    main()
@@ -21,6 +21,12 @@
  *   io_out[2] -> dl_en    (Downlink enable)
  *   io_out[3] -> dl_ready (Downlink data ready flag)
  *
+ * dl_out/ul_in are one lane wide with the default SERIAL_LANES = 1;
+ * SER_LANE_CFG must keep one lane on this harness.
+ *
+ * uart_cts has no spare pad on this harness and is left open: the
+ * host must pace its bytes by itself, the RX buffer absorbs bursts.
+ *
  *-------------------------------------------------------------
  */
 
@@ -62,6 +68,7 @@ module fec_wrapper #(
     // IO Pads
     .uart_rx  (io_in[0]),
     .uart_tx  (io_out[0]),
+    .uart_cts (),
     .dl_out   (io_out[1]),
     .dl_en    (io_out[2]),
     .dl_ready (io_out[3]),
@@ -11,10 +11,26 @@
 import os
 import sys
 import shutil
+import gzip
 import subprocess
+import re
 import json
+import csv
+import time
+import sqlite3
+import hashlib
+import itertools
 import logging
 import argparse
+import signal
+import fcntl
+import resource
+import threading
+import multiprocessing
+from collections import deque
+from collections.abc import Mapping
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
 from pathlib import Path
 
 # Global variables for OpenLane configuration
@@ -32,6 +48,86 @@ klayout_opengui     = True
 verilog_files       = []
 clock_port          = None
 clock_period        = None
+design_config       = {}
+resume_mode         = False
+checkpoint_dir      = None
+flow_jobs           = os.cpu_count() or 1
+flow_pool           = None
+run_dir             = None
+step_reports        = []
+step_metrics        = {}
+metrics_db          = None
+compare_baseline    = None
+regression_thresholds = {"wns": 0.1, "area": 1.0, "runtime": 20.0}
+watchdog_enabled    = True
+watchdog_thresholds = {"grt_overflow": 500, "cts_wns": -5.0, "antenna": None}
+refresh_env         = False
+synth_cache_dir     = None
+synth_cache_size_gb = 20
+heavy_slots_dir     = None
+retention_policy    = "compress"
+
+# EDA tools whose resolved paths are part of the environment fingerprint
+env_tools = ("nix", "yosys", "openroad", "klayout", "magic", "netgen")
+
+# Config keys forwarded to Config.interactive when present in the config file
+flow_config_keys = ("SYNTH_STRATEGY", "FP_CORE_UTIL")
+
+# Per-step override kwargs passed to the OpenLane step constructors.
+# They are part of each step's checkpoint fingerprint.
+step_overrides = {
+    "flow_yosys_synthesis": {
+        "SYNTH_ABC_DFF": True,
+        # "SYNTH_STRATEGY": "DELAY 0",
+    },
+    "flow_openroad_generatepdn": {
+        "FP_PDN_VWIDTH": 2,
+        "FP_PDN_HWIDTH": 2,
+        "FP_PDN_VPITCH": 30,
+        "FP_PDN_HPITCH": 30,
+    },
+    # Post-PnR STA fans out one process per corner
+    "flow_openroad_stapostpnr": {
+        "STA_CORNERS": [
+            "nom_tt_025C_1v80", "nom_ss_100C_1v60", "nom_ff_n40C_1v95",
+            "min_tt_025C_1v80", "min_ss_100C_1v60", "min_ff_n40C_1v95",
+            "max_tt_025C_1v80", "max_ss_100C_1v60", "max_ff_n40C_1v95",
+        ],
+    },
+}
+
+# Flow step graph: each step lists the steps whose output State it consumes.
+# Steps are declared in sequential execution order. Independent branches
+# (RCX/STA next to stream-out, and the DRC, SPICE extraction/LVS checks
+# after stream-out) run concurrently in non-interactive mode.
+flow_graph = {
+    "flow_yosys_synthesis":             [],
+    "flow_openroad_floorplan":          ["flow_yosys_synthesis"],
+    "flow_openroad_tapendcapinsertion": ["flow_openroad_floorplan"],
+    "flow_openroad_ioplacement":        ["flow_openroad_tapendcapinsertion"],
+    "flow_openroad_generatepdn":        ["flow_openroad_ioplacement"],
+    "flow_openroad_globalplacement":    ["flow_openroad_generatepdn"],
+    "flow_openroad_detailedplacement":  ["flow_openroad_globalplacement"],
+    "flow_openroad_cts":                ["flow_openroad_detailedplacement"],
+    "flow_openroad_globalrouting":      ["flow_openroad_cts"],
+    "flow_openroad_detailedrouting":    ["flow_openroad_globalrouting"],
+    "flow_openroad_fillinsertion":      ["flow_openroad_detailedrouting"],
+    "flow_openroad_rcx":                ["flow_openroad_fillinsertion"],
+    "flow_openroad_stapostpnr":         ["flow_openroad_rcx"],
+    "flow_klayout_streamout":           ["flow_openroad_fillinsertion"],
+    "flow_klayout_opengui":             ["flow_klayout_streamout"],
+    "flow_klayout_drc":                 ["flow_klayout_streamout"],
+    "flow_magic_spiceextraction":       ["flow_klayout_streamout"],
+    "flow_netgen_lvs":                  ["flow_magic_spiceextraction"],
+}
+
+# Steps that must run in the main process (they need the terminal or a GUI,
+# or hand work out to the step worker pool)
+main_process_steps = {"flow_klayout_opengui", "flow_openroad_stapostpnr"}
+
+# Steps with the highest CPU and memory demand. When several flows share a
+# host (sweep and batch modes) they only run while holding a heavy step slot.
+heavy_steps = {"flow_openroad_detailedrouting", "flow_klayout_drc"}
 
 def step_prompt(step_name):
     """
@@ -71,6 +167,7 @@ def openlane_setup():
     ## ===================================
     global pdk_root, pdk_root_dir, pdk_family, pdk_qualified, desing_name, openlane_path, openlane_path_str
     global desing_name, design_dir, config_file, verilog_files, clock_port, clock_net, clock_period
+    global design_config, checkpoint_dir
 
     print("Checking OpenLane's dependencies")
 
@@ -80,6 +177,7 @@ def openlane_setup():
     # Load JSON config
     with open(config_file, "r", encoding="utf8") as f:
         config          = json.load(f)
+        design_config   = config
         pdk_root        = config.get('PDK_ROOT', ".volare")
         pdk_family      = config.get('PDK', "sky130")
         pdk_qualified   = config.get('PDK_QUALIFIED', "sky130A")
@@ -91,6 +189,16 @@ def openlane_setup():
         clock_net       = config.get('CLOCK_NET', clock_port)
         clock_period    = config.get('CLOCK_PERIOD', 25)
 
+    # The antenna fail-fast count defaults to the heuristic antenna threshold
+    if watchdog_thresholds["antenna"] is None:
+        watchdog_thresholds["antenna"] = config.get("HEURISTIC_ANTENNA_THRESHOLD")
+
+    # Config values take precedence over the per-step override defaults
+    for overrides in step_overrides.values():
+        for key in overrides:
+            if key in config:
+                overrides[key] = config[key]
+
     # Set pdk_root_dir to the parent directory of pdk_root
     pdk_root_dir = "/home/angel/.volare"
     pdk_root = os.path.expanduser(pdk_root)
@@ -116,6 +224,11 @@ def openlane_setup():
         return 1
     
     verilog_files = resolved
+
+    # Checkpoints are kept per design next to the OpenLane install
+    if checkpoint_dir is None:
+        checkpoint_dir = os.path.join(os.getcwd(), "checkpoints", desing_name)
+    checkpoint_dir = os.path.abspath(checkpoint_dir)
     
     # Check openlane install path exists
     print("Checking openlane install path")
@@ -123,45 +236,53 @@ def openlane_setup():
         print(f"Installation path '{openlane_path}' does not exist.")
         return 1
 
-    # Check tkinter
-    print("Checking tkinter")
-    try:
-        import tkinter
-    except ImportError:
-        subprocess.check_call(
-            ["sudo", "apt", "install", "python3-tk"],
-        )
+    # Skip the dependency setup when nothing changed since the last one
+    open_pdks_rev = open(os.path.join(openlane_path_str, "openlane", "open_pdks_rev"), encoding="utf8").read().strip()
+    env_cache_file = os.path.join(openlane_path_str, ".interactive_flow_env.json")
+    if not refresh_env and env_cache_load(env_cache_file) == env_fingerprint(open_pdks_rev):
+        print("Environment fingerprint matches the cached one, skipping dependency setup (use --refresh-env to force it)")
+    else:
+        # Check tkinter
+        print("Checking tkinter")
+        try:
+            import tkinter
+        except ImportError:
+            subprocess.check_call(
+                ["sudo", "apt", "install", "python3-tk"],
+            )
+
+        try:
+            import tkinter
+        except ImportError as e:
+            print("Failed to import the tkinter library for Python, which is required to load PDK configuration values. Make sure python3-tk or equivalent is installed on your system.")
+            raise e from None
+            return 1
 
-    try:
-        import tkinter
-    except ImportError as e:
-        print("Failed to import the tkinter library for Python, which is required to load PDK configuration values. Make sure python3-tk or equivalent is installed on your system.")
-        raise e from None
-        return 1
+        # Install OpenLane dependencies using Nix
+        print("Installing OpenLane depencencies")
+        try:
+            subprocess.check_call(
+                ["nix", "profile", "install", ".#colab-env", "--accept-flake-config"],
+                cwd=openlane_path_str,
+            )
+            subprocess.check_call(
+                ["nix", "profile", "install", ".#httpx", "--accept-flake-config"],
+                cwd=openlane_path_str,
+            )
+        except subprocess.CalledProcessError as e:
+            print('Failed to install binary dependencies using Nix>')
+            raise e from None
+            return 1
 
-    # Install OpenLane dependencies using Nix
-    print("Installing OpenLane depencencies")
-    try:
-        subprocess.check_call(
-            ["nix", "profile", "install", ".#colab-env", "--accept-flake-config"],
-            cwd=openlane_path_str,
+        # Loading PDK
+        print("Loading PDK")
+        import volare
+        volare.enable(
+            volare.get_volare_home(pdk_root), pdk_family,
+            open_pdks_rev,
         )
-        subprocess.check_call(
-            ["nix", "profile", "install", ".#httpx", "--accept-flake-config"],
-            cwd=openlane_path_str,
-        )
-    except subprocess.CalledProcessError as e:
-        print('Failed to install binary dependencies using Nix>')
-        raise e from None
-        return 1
+        env_cache_save(env_cache_file, env_fingerprint(open_pdks_rev))
 
-    # Loading PDK
-    print("Loading PDK")
-    import volare
-    volare.enable(
-        volare.get_volare_home(pdk_root), pdk_family,
-        open(os.path.join(openlane_path_str, "openlane", "open_pdks_rev"),encoding="utf8", ).read().strip(),
-    )
     sys.path.insert(0, openlane_path_str)
 
     # Remove the default colab logging handler
@@ -173,69 +294,1304 @@ def openlane_setup():
     print('Openlane version: ' + openlane.__version__)
     return 0
 
+def env_fingerprint(open_pdks_rev):
+    """
+    Fingerprint of the OpenLane environment: the openlane2 flake revision,
+    the PDK revision, family and variant, and the resolved EDA tool paths.
+    """
+    h = hashlib.sha256()
+    for name in ("flake.nix", "flake.lock"):
+        flake_file = os.path.join(openlane_path_str, name)
+        if os.path.exists(flake_file):
+            h.update(Path(flake_file).read_bytes())
+    try:
+        git_head = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=openlane_path_str,
+            capture_output=True, text=True,
+        ).stdout.strip()
+    except OSError:
+        git_head = ""
+    h.update(git_head.encode())
+    h.update(f"{open_pdks_rev}:{pdk_family}:{pdk_qualified}".encode())
+    # The enabled PDK is a link to the installed revision
+    h.update(os.path.realpath(os.path.join(pdk_root, pdk_qualified)).encode())
+    for tool in env_tools:
+        tool_path = shutil.which(tool)
+        h.update(f"{tool}={os.path.realpath(tool_path) if tool_path else ''}".encode())
+    h.update(sys.version.encode())
+    return h.hexdigest()
+
+def env_cache_load(env_cache_file):
+    """Return the cached environment fingerprint, None if there is none"""
+    try:
+        with open(env_cache_file, "r", encoding="utf8") as f:
+            return json.load(f).get("fingerprint")
+    except (OSError, ValueError):
+        return None
+
+def env_cache_save(env_cache_file, fingerprint):
+    with open(env_cache_file, "w", encoding="utf8") as f:
+        json.dump({"fingerprint": fingerprint, "time": time.strftime("%Y-%m-%d %H:%M:%S")}, f, indent=2)
+
 def openlane_flow():
     ## ===================================
     ## 3. Loading design configuration
     ## ===================================
+    global flow_progress_start
+
     print("Starting OpenLane flow")
     
     from openlane.config import Config
     from openlane.state import State
     
     print("Loading design configuration")
+    flow_config_interactive(desing_name)
+    print("Design configuration loaded successfully")
+
+    # Openlane steps
+    from openlane.steps import Step
+
+    # Keep OpenLane's log records in the run directory
+    log_handler = logging.FileHandler("openlane.log", encoding="utf8")
+    log_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    log_handler.setLevel(logging.INFO)
+    logging.getLogger().addHandler(log_handler)
+    if logging.getLogger().level > logging.INFO:
+        logging.getLogger().setLevel(logging.INFO)
+
+    # Run the step graph and keep the final metrics in the run directory
+    flow_start = time.monotonic()
+    flow_progress_start = time.time()
+    history = progress_history()
+    flow_pool_start()
+    stop_progress = threading.Event()
+    progress = threading.Thread(target=progress_monitor, args=(stop_progress, history), daemon=True)
+    progress.start()
+    flow_state = "failed"
+    try:
+        state = run_flow_graph()
+        flow_state = "done"
+    except WatchdogAbort as e:
+        flow_state = "aborted"
+        print(f"\nFlow aborted by the watchdog: {e}")
+        return 1
+    finally:
+        stop_progress.set()
+        progress.join()
+        progress_write_status(flow_state, history)
+        retention_wait()
+        write_step_report()
+    flow_runtime = time.monotonic() - flow_start
+    with open("metrics.json", "w", encoding="utf8") as f:
+        json.dump(dict(state.metrics), f, indent=2, default=str)
+
+    # Record the run and compare it against the baseline
+    run_id = metrics_store_record(state, flow_runtime)
+    if compare_baseline:
+        return metrics_compare_baseline(run_id)
+    return 0
+
+def flow_config_interactive(design_name):
+    """Load the interactive OpenLane configuration with design_name as top module"""
+    from openlane.config import Config
+
     Config.interactive(
-        DESIGN_NAME = desing_name,
+        DESIGN_NAME = design_name,
         PDK_ROOT    = pdk_root_dir,
         PDK         = pdk_qualified,
         CLOCK_PORT  = clock_port,
         CLOCK_NET   = clock_net,
         CLOCK_PERIOD= clock_period,
         PRIMARY_GDSII_STREAMOUT_TOOL="klayout",
+        **{key: design_config[key] for key in flow_config_keys if key in design_config},
     )
-    print("Design configuration loaded successfully")
 
-    # Openlane steps
-    from openlane.steps import Step
+def flow_pool_start():
+    """
+    Create the step worker pool and fork its workers right away, before the
+    progress and retention threads start: a process forked while another
+    thread holds a lock inherits that lock held, with no thread to release it.
+    With a single job there is no pool. In interactive mode the steps run in
+    the main process and the pool only takes the STA corners.
+    """
+    global flow_pool
 
-    # Initialize state and run synthesis
-    state = State()
-    state = flow_yosys_synthesis(state)
-    
-    # Run through all the implementation steps in sequence
-    state = flow_openroad_floorplan(state)
-    state = flow_openroad_tapendcapinsertion(state)
-    state = flow_openroad_ioplacement(state)
-    state = flow_openroad_generatepdn(state)
-    state = flow_openroad_globalplacement(state)
-    state = flow_openroad_detailedplacement(state)
-    state = flow_openroad_cts(state)
-    state = flow_openroad_globalrouting(state)
-    state = flow_openroad_detailedrouting(state)
-    state = flow_openroad_fillinsertion(state)
-    state = flow_openroad_rcx(state)
-    state = flow_openroad_stapostpnr(state)
-    state = flow_klayout_streamout(state)
-    state = flow_klayout_opengui(state)
-    state = flow_klayout_drc(state)
-    state = flow_magic_spiceextraction(state)
-    state = flow_netgen_lvs(state)
+    if flow_jobs > 1:
+        flow_pool = ProcessPoolExecutor(
+            max_workers=flow_jobs,
+            mp_context=multiprocessing.get_context("fork"),
+        )
+        # With fork, the first task starts every worker of the pool
+        flow_pool.submit(os.getpid).result()
+
+def run_flow_graph():
+    """
+    Run the flow step graph.
+    A step becomes ready once all the steps it depends on have finished. When
+    several steps are ready at once they run in parallel worker processes,
+    each with its own copy of the input State. In interactive mode the steps
+    run one by one in declaration order.
+    With --resume, a step whose dependencies were not re-executed is restored
+    from its checkpoint when its fingerprint still matches.
+    Returns the State merged from every branch of the graph.
+    """
+    from openlane.state import State
+
+    base_fingerprint = flow_fingerprint()
+    fingerprints = {}
+    states = {}
+    executed = set()
+    pending = list(flow_graph)
+    running = {}
+    pool = None if interactive_mode else flow_pool
+
+    started = {}
+    consumers = {s: [c for c, deps in flow_graph.items() if s in deps] for s in flow_graph}
+    outputs = {}
+
+    def finish(step_name, state_out, report):
+        state_in = merge_states([states[d] for d in flow_graph[step_name]])
+        states[step_name] = state_out
+        outputs[step_name] = state_new_paths(state_in, state_out)
+        executed.add(step_name)
+        progress_update(step_name, "ok")
+        step_reports.append(report)
+        step_metrics[step_name] = {
+            key: value for key, value in state_out.metrics.items()
+            if metric_tracked(key) and state_in.metrics.get(key) != value
+        }
+        checkpoint_save(step_name, fingerprints[step_name], state_out)
+
+        # Views no downstream step carries over are intermediates now
+        for dep in flow_graph[step_name]:
+            if dep in outputs and all(c in states for c in consumers[dep]):
+                live = {p for c in consumers[dep] for v in states[c].values() for p in state_paths(v)}
+                retention_submit(dep, outputs.pop(dep) - live)
+
+    def failed(step_name):
+        progress_update(step_name, "failed")
+        step_reports.append({
+            "step": step_name,
+            "status": "failed",
+            "wall_s": round(time.monotonic() - started[step_name], 2),
+        })
+
+    try:
+        while pending or running:
+            ready = [s for s in pending if all(d in states for d in flow_graph[s])]
+            if not ready and not running:
+                raise RuntimeError(f"Flow graph has unreachable steps: {', '.join(pending)}")
+
+            to_run = []
+            for step_name in ready:
+                pending.remove(step_name)
+                deps = flow_graph[step_name]
+                fingerprints[step_name] = step_fingerprint(
+                    step_name, [fingerprints[d] for d in deps] or [base_fingerprint]
+                )
+                if resume_mode and not executed.intersection(deps):
+                    restored = checkpoint_load(step_name, fingerprints[step_name])
+                    if restored is not None:
+                        print(f"\nStep {step_name} restored from checkpoint, skipping.")
+                        states[step_name] = restored
+                        outputs[step_name] = state_new_paths(
+                            merge_states([states[d] for d in deps]), restored)
+                        step_reports.append({"step": step_name, "status": "restored"})
+                        progress_update(step_name, "restored")
+                        continue
+                to_run.append(step_name)
+
+            # A lone ready step on an idle pool gains nothing from a worker
+            inline = [
+                s for s in to_run
+                if pool is None or s in main_process_steps or (len(to_run) == 1 and not running)
+            ]
+            for step_name in to_run:
+                started[step_name] = time.monotonic()
+                progress_update(step_name, "running")
+                if step_name not in inline:
+                    state_in = merge_states([states[d] for d in flow_graph[step_name]])
+                    retention_restore(state_in)
+                    future = pool.submit(run_step_worker, step_name, state_in.dumps())
+                    running[future] = step_name
+            for step_name in inline:
+                state_in = merge_states([states[d] for d in flow_graph[step_name]])
+                retention_restore(state_in)
+                try:
+                    state_out, report = run_step_instrumented(step_name, state_in)
+                except BaseException:
+                    failed(step_name)
+                    raise
+                finish(step_name, state_out, report)
+
+            if not ready and running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    step_name = running.pop(future)
+                    try:
+                        state_json, report = future.result()
+                    except BaseException:
+                        failed(step_name)
+                        raise
+                    finish(step_name, State.loads(state_json, validate_path=False), report)
+    except WatchdogAbort:
+        # Stop the other branches right away, the run is hopeless
+        kill_process_tree()
+        raise
+    finally:
+        if flow_pool is not None:
+            flow_pool.shutdown(wait=True, cancel_futures=True)
+
+    sinks = [s for s in flow_graph if not any(s in deps for deps in flow_graph.values())]
+    return merge_states([states[s] for s in sinks])
+
+## ===================================
+## Step instrumentation
+## ===================================
+
+# Period in seconds used to sample the step's child processes
+report_sample_period = 0.5
+
+def process_tree(root_pid, exclude=()):
+    """
+    Return {pid: command name} for every live descendant of root_pid.
+    Subtrees rooted at an excluded pid are skipped.
+    """
+    procs = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", "r", encoding="utf8") as f:
+                stat = f.read()
+        except OSError:
+            continue
+        # The command name is enclosed in parentheses and may contain spaces
+        comm = stat[stat.index("(") + 1:stat.rindex(")")]
+        ppid = int(stat[stat.rindex(")") + 2:].split()[1])
+        procs[int(entry)] = (ppid, comm)
+
+    children = {}
+    for pid, (ppid, _) in procs.items():
+        children.setdefault(ppid, []).append(pid)
+
+    tree = {}
+    stack = [pid for pid in children.get(root_pid, []) if pid not in exclude]
+    while stack:
+        pid = stack.pop()
+        tree[pid] = procs[pid][1]
+        stack.extend(child for child in children.get(pid, []) if child not in exclude)
+    return tree
+
+def process_peak_rss_kb(pid):
+    """Peak resident set size (VmHWM) of a live process in kB, 0 if gone"""
+    try:
+        with open(f"/proc/{pid}/status", "r", encoding="utf8") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
     return 0
 
+def sample_step_processes(stop, exclude, peaks, tools):
+    """Sampler thread: track the peak RSS and names of the step's child processes"""
+    while True:
+        for pid, comm in process_tree(os.getpid(), exclude).items():
+            peaks[pid] = max(peaks.get(pid, 0), process_peak_rss_kb(pid))
+            tools.add(comm)
+        if stop.wait(report_sample_period):
+            break
+
+def state_paths(value):
+    """Flatten the paths held by a State view (path, list or dict of paths)"""
+    if value is None:
+        return []
+    if isinstance(value, Mapping):
+        return [p for v in value.values() for p in state_paths(v)]
+    if isinstance(value, (list, tuple)):
+        return [p for v in value for p in state_paths(v)]
+    return [str(value)]
+
+def state_new_paths(state_in, state_out):
+    """Paths referenced by state_out that state_in did not reference"""
+    new = set()
+    for key, value in state_out.items():
+        new.update(state_paths(value))
+        new.difference_update(state_paths(state_in.get(key)))
+    return new
+
+def path_size(path):
+    """Size in bytes of a file, or of every file below a directory"""
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+def run_step_instrumented(step_name, state_in):
+    """
+    Run a flow step and measure it: wall time, CPU time and peak RSS of the
+    EDA tools it spawns, and the size of the views it produced.
+    Returns the output State and the step report.
+    """
+    # Pool workers are children of this process but not part of the step
+    exclude = {p.pid for p in multiprocessing.active_children()}
+    stop = threading.Event()
+    peaks = {}
+    tools = set()
+    sampler = threading.Thread(
+        target=sample_step_processes, args=(stop, exclude, peaks, tools), daemon=True
+    )
+    tripped = {}
+    watchdog = threading.Thread(
+        target=watch_step_logs, args=(step_name, stop, time.time(), exclude, tripped), daemon=True
+    )
+
+    slot, slot_wait = heavy_slot_acquire(step_name)
+    children_before = resource.getrusage(resource.RUSAGE_CHILDREN)
+    self_before = resource.getrusage(resource.RUSAGE_SELF)
+    wall_start = time.monotonic()
+    sampler.start()
+    if watchdog_enabled:
+        watchdog.start()
+    try:
+        state_out = globals()[step_name](state_in)
+    except Exception as e:
+        if tripped:
+            raise WatchdogAbort(watchdog_summary(step_name, tripped)) from e
+        raise
+    finally:
+        heavy_slot_release(slot)
+        stop.set()
+        sampler.join()
+        if watchdog.is_alive():
+            watchdog.join()
+    if tripped:
+        raise WatchdogAbort(watchdog_summary(step_name, tripped))
+    if watchdog_enabled:
+        watch_step_metrics(step_name, state_out)
+    wall = time.monotonic() - wall_start
+    children_after = resource.getrusage(resource.RUSAGE_CHILDREN)
+    self_after = resource.getrusage(resource.RUSAGE_SELF)
+
+    # ru_maxrss only grows when a reaped child beat every previous one
+    peak_rss_kb = max(peaks.values(), default=0)
+    if children_after.ru_maxrss > children_before.ru_maxrss:
+        peak_rss_kb = max(peak_rss_kb, children_after.ru_maxrss)
+
+    artifact_bytes = 0
+    for key, value in state_out.items():
+        if value is not None and value != state_in.get(key):
+            artifact_bytes += sum(path_size(p) for p in state_paths(value) if os.path.exists(p))
+
+    report = {
+        "step": step_name,
+        "status": "ok",
+        "wall_s": round(wall, 2),
+        "cpu_s": round(
+            (children_after.ru_utime - children_before.ru_utime) +
+            (children_after.ru_stime - children_before.ru_stime), 2),
+        "driver_cpu_s": round(
+            (self_after.ru_utime - self_before.ru_utime) +
+            (self_after.ru_stime - self_before.ru_stime), 2),
+        "peak_rss_mb": round(peak_rss_kb / 1024, 1),
+        "artifact_mb": round(artifact_bytes / 2**20, 2),
+        "tools": " ".join(sorted(tools)),
+        "slot_wait_s": round(slot_wait, 2),
+    }
+    print(f"Step {step_name}: {report['wall_s']} s wall, {report['cpu_s']} s CPU, "
+          f"{report['peak_rss_mb']} MB peak RSS, {report['artifact_mb']} MB artifacts")
+    return state_out, report
+
+## ===================================
+## Progress and ETA
+## ===================================
+
+# Period in seconds of the progress line and of the status file updates
+progress_period = 10.0
+
+# Log lines of each running step shown with the progress line
+progress_tail_lines = 3
+
+# Machine-readable progress of the run, rewritten every progress period
+progress_status_file = "flow_status.json"
+
+# Historical runs whose step durations are used for the ETA
+progress_history_runs = 5
+
+# Progress of every step: {step: {"status": ..., "start": ..., "end": ...}}
+flow_progress = {}
+flow_progress_start = None
+
+def progress_update(step_name, status):
+    """Record a step status change: running, ok, failed or restored"""
+    entry = flow_progress.setdefault(step_name, {})
+    if status == "running":
+        entry["start"] = time.time()
+    else:
+        entry["end"] = time.time()
+    entry["status"] = status
+
+def progress_history():
+    """
+    Expected duration of every step: the median wall time over the last
+    runs of this design and config in the metrics store, or over the last
+    runs of the design with any config when this config never ran.
+    """
+    try:
+        with metrics_store_open() as db:
+            query = ("SELECT m.step, m.value FROM metrics m JOIN runs r ON m.run_id = r.id "
+                     "WHERE r.design = ? AND m.name = 'runtime_s'")
+            rows = db.execute(query + " AND r.config_hash = ? ORDER BY r.id DESC",
+                              (desing_name, config_hash())).fetchall()
+            if not rows:
+                rows = db.execute(query + " ORDER BY r.id DESC", (desing_name,)).fetchall()
+    except sqlite3.Error as e:
+        print(f"Could not read the step history from the metrics store: {e}")
+        return {}
+    durations = {}
+    for step_name, wall in rows:
+        if len(durations.setdefault(step_name, [])) < progress_history_runs:
+            durations[step_name].append(wall)
+    return {step_name: sorted(walls)[len(walls) // 2] for step_name, walls in durations.items()}
+
+def progress_eta(history, now):
+    """
+    Remaining run time in seconds: the longest chain of unfinished steps
+    with their historical durations, or their sum when steps run one at a
+    time. None when a remaining step has no history.
+    """
+    finish = {}
+    remaining_total = 0.0
+    for step_name in flow_graph:
+        entry = flow_progress.get(step_name, {})
+        status = entry.get("status")
+        if status in ("ok", "restored"):
+            finish[step_name] = 0.0
+            continue
+        if step_name not in history:
+            return None
+        remaining = history[step_name]
+        if status == "running":
+            remaining = max(0.0, remaining - (now - entry["start"]))
+        remaining_total += remaining
+        finish[step_name] = max((finish[d] for d in flow_graph[step_name]), default=0.0) + remaining
+    if flow_jobs == 1 or interactive_mode:
+        return remaining_total
+    return max(finish.values(), default=0.0)
+
+def progress_log_tail(step_name, since):
+    """Last lines of the most recently written log of a running step"""
+    logs = []
+    for path in step_log_files(step_name, since):
+        try:
+            logs.append((os.path.getmtime(path), path))
+        except OSError:
+            pass
+    if not logs:
+        return []
+    try:
+        with open(max(logs)[1], "rb") as f:
+            f.seek(max(0, os.path.getsize(max(logs)[1]) - 8192))
+            lines = f.read().decode("utf8", errors="replace").splitlines()
+    except OSError:
+        return []
+    return [line for line in lines if line.strip()][-progress_tail_lines:]
+
+def progress_status(state, history):
+    """Snapshot of the run progress, as written to the status file"""
+    now = time.time()
+    running = [s for s in flow_graph if flow_progress.get(s, {}).get("status") == "running"]
+    steps = {}
+    for step_name in flow_graph:
+        entry = flow_progress.get(step_name, {})
+        start = entry.get("start")
+        steps[step_name] = {
+            "status": entry.get("status", "pending"),
+            "elapsed_s": round(entry.get("end", now) - start, 1) if start else None,
+            "expected_s": history.get(step_name),
+        }
+    eta = progress_eta(history, now) if state == "running" else 0.0
+    return {
+        "design": desing_name,
+        "pid": os.getpid(),
+        "state": state,
+        "started": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(flow_progress_start)),
+        "updated": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(now)),
+        "elapsed_s": round(now - flow_progress_start, 1),
+        "eta_s": round(eta, 1) if eta is not None else None,
+        "steps_done": sum(1 for s in steps.values() if s["status"] in ("ok", "restored")),
+        "steps_total": len(steps),
+        "running": running,
+        "steps": steps,
+        "log_tail": {s: progress_log_tail(s, flow_progress[s]["start"]) for s in running},
+    }
+
+def progress_write_status(state, history=None):
+    """Atomically rewrite the status file, returns the status written"""
+    status = progress_status(state, history or {})
+    tmp_path = f"{progress_status_file}.tmp"
+    with open(tmp_path, "w", encoding="utf8") as f:
+        json.dump(status, f, indent=2)
+    os.replace(tmp_path, progress_status_file)
+    return status
+
+def progress_monitor(stop, history):
+    """
+    Keep the status file up to date while the flow runs. In non-interactive
+    mode also print a progress line with the ETA and the tail of the logs
+    of the running steps.
+    """
+    def duration(seconds):
+        seconds = int(seconds)
+        return f"{seconds // 3600}:{seconds // 60 % 60:02d}:{seconds % 60:02d}"
+
+    while True:
+        try:
+            status = progress_write_status("running", history)
+        except OSError as e:
+            print(f"Could not write the status file: {e}")
+            status = progress_status("running", history)
+        if not interactive_mode and status["running"]:
+            eta = duration(status["eta_s"]) if status["eta_s"] is not None else "unknown"
+            running = ", ".join(
+                f"{s} ({duration(status['steps'][s]['elapsed_s'])}"
+                + (f" / ~{duration(status['steps'][s]['expected_s'])})" if status["steps"][s]["expected_s"] else ")")
+                for s in status["running"])
+            print(f"[{status['updated'][11:]}] {status['steps_done']}/{status['steps_total']} steps, "
+                  f"running {running}, elapsed {duration(status['elapsed_s'])}, ETA {eta}")
+            for step_name, lines in status["log_tail"].items():
+                for line in lines:
+                    print(f"    | {line[:160]}")
+        if stop.wait(progress_period):
+            return
+
+## ===================================
+## Shared heavy step slots
+## ===================================
+
+# Period in seconds at which a waiting step retries the heavy step slots
+heavy_slot_poll_period = 5.0
+
+def heavy_slots_setup(base_dir, slots):
+    """Create the lock files of the heavy step slots shared by the flows of a sweep or batch"""
+    global heavy_slots_dir
+    heavy_slots_dir = os.path.join(base_dir, ".heavy_slots")
+    shutil.rmtree(heavy_slots_dir, ignore_errors=True)
+    os.makedirs(heavy_slots_dir)
+    for i in range(slots):
+        Path(heavy_slots_dir, f"slot_{i}").touch()
+
+def heavy_slot_acquire(step_name):
+    """
+    Block until one of the shared heavy step slots is free and lock it.
+    The lock is an flock on the slot file, so it is released by the kernel
+    even if the flow holding it is killed.
+    Returns the locked slot file (None when not needed) and the time waited.
+    """
+    if heavy_slots_dir is None or step_name not in heavy_steps:
+        return None, 0.0
+    start = time.monotonic()
+    announced = False
+    while True:
+        for name in sorted(os.listdir(heavy_slots_dir)):
+            slot = open(os.path.join(heavy_slots_dir, name), "a")
+            try:
+                fcntl.flock(slot, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                slot.close()
+                continue
+            if announced:
+                print(f"Step {step_name} acquired heavy step {name} after {time.monotonic() - start:.0f} s")
+            return slot, time.monotonic() - start
+        if not announced:
+            print(f"Step {step_name} waiting for a free heavy step slot")
+            announced = True
+        time.sleep(heavy_slot_poll_period)
+
+def heavy_slot_release(slot):
+    """Unlock a heavy step slot taken by heavy_slot_acquire"""
+    if slot is not None:
+        slot.close()
+
+## ===================================
+## Early-abort watchdog
+## ===================================
+
+# Period in seconds at which the watchdog polls the step logs
+watchdog_poll_period = 2.0
+
+# Fail-fast conditions checked on the logs while a step runs:
+# (step, threshold name, regex capturing a count, description)
+# GRT: total overflow, last field of the "Total" row of the congestion report
+# (Total  resource  demand  usage%  max H / max V / total overflow)
+watchdog_log_rules = [
+    ("flow_openroad_globalrouting", "grt_overflow",
+     re.compile(r"^\s*Total\s+\d+\s+\d+\s+[\d.]+%\s+\d+\s*/\s*\d+\s*/\s*(\d+)\s*$"),
+     "global routing overflow"),
+    (None, "antenna", re.compile(r"Found (\d+) net violations"),
+     "antenna net violations"),
+]
+
+# Fail-fast conditions checked on the metrics once a step is done:
+# (step, threshold name, metric, True when a lower value is worse, description)
+watchdog_metric_rules = [
+    ("flow_openroad_cts", "cts_wns", "timing__setup__ws", True, "setup WNS after CTS"),
+    (None, "antenna", "antenna__violating__nets", False, "antenna net violations"),
+]
+
+class WatchdogAbort(RuntimeError):
+    """Raised when a watchdog fail-fast condition trips"""
+
+def kill_process_tree(exclude=()):
+    """Terminate every descendant of this process, killing the stubborn ones"""
+    pids = list(process_tree(os.getpid(), exclude))
+    for sig in (signal.SIGTERM, signal.SIGKILL):
+        for pid in pids:
+            try:
+                os.kill(pid, sig)
+            except OSError:
+                pass
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline and any(os.path.exists(f"/proc/{pid}") for pid in pids):
+            time.sleep(0.1)
+
+# Directories of this script that are not step directories
+step_dir_skip = {"checkpoints", "synth_cache", "sweeps", "synthesis_cache_hit"}
+
+def step_slug(step_name):
+    """Step id as it appears in the step directory names, e.g. openroad-globalrouting"""
+    return step_name.replace("flow_", "", 1).replace("_", "-")
+
+def step_log_files(step_name, since):
+    """Log files of a step (its directory carries the step id) written since a time"""
+    slug = step_slug(step_name)
+    for root, dirs, files in os.walk(os.getcwd()):
+        dirs[:] = [d for d in dirs if d not in step_dir_skip]
+        if slug not in root:
+            continue
+        for name in files:
+            path = os.path.join(root, name)
+            try:
+                if name.endswith(".log") and os.path.getmtime(path) >= since:
+                    yield path
+            except OSError:
+                pass
+
+def watch_step_logs(step_name, stop, since, exclude, tripped):
+    """
+    Watchdog thread: stream the step's logs and, when a fail-fast condition
+    trips, record it in 'tripped' and kill the step's tools.
+    """
+    rules = [
+        rule for rule in watchdog_log_rules
+        if rule[0] in (None, step_name) and watchdog_thresholds.get(rule[1]) is not None
+    ]
+    offsets = {}
+    tail = deque(maxlen=20)
+    while not tripped:
+        for path in step_log_files(step_name, since):
+            # Only consume whole lines, a line caught mid-write is read on the next poll
+            try:
+                with open(path, "rb") as f:
+                    f.seek(offsets.get(path, 0))
+                    data = f.read()
+            except OSError:
+                continue
+            end = data.rfind(b"\n") + 1
+            offsets[path] = offsets.get(path, 0) + end
+            lines = data[:end].decode("utf8", errors="replace").splitlines(keepends=True)
+            for line in lines:
+                tail.append(line.rstrip())
+                for _, threshold_name, pattern, description in rules:
+                    match = pattern.search(line)
+                    if match and int(match.group(1)) > watchdog_thresholds[threshold_name]:
+                        tripped.update(
+                            condition=description,
+                            value=int(match.group(1)),
+                            threshold=watchdog_thresholds[threshold_name],
+                            log_file=path,
+                            log_line=line.strip(),
+                            log_tail=list(tail),
+                        )
+                        break
+                if tripped:
+                    break
+            if tripped:
+                break
+        if tripped:
+            print(f"\nWatchdog: {tripped['condition']} {tripped['value']} exceeds "
+                  f"{tripped['threshold']} in step {step_name}, stopping the flow")
+            kill_process_tree(exclude)
+            break
+        if stop.wait(watchdog_poll_period):
+            break
+
+def watch_step_metrics(step_name, state_out):
+    """Check the metric fail-fast conditions once a step has finished"""
+    for rule_step, threshold_name, metric, lower_is_worse, description in watchdog_metric_rules:
+        threshold = watchdog_thresholds.get(threshold_name)
+        value = state_out.metrics.get(metric)
+        if rule_step not in (None, step_name) or threshold is None or value is None:
+            continue
+        if (value < threshold) if lower_is_worse else (value > threshold):
+            raise WatchdogAbort(watchdog_summary(step_name, {
+                "condition": description,
+                "value": value,
+                "threshold": threshold,
+                "metrics": {k: v for k, v in state_out.metrics.items() if metric_tracked(k)},
+            }))
+
+def watchdog_summary(step_name, tripped):
+    """Write the diagnostic summary of a watchdog abort and return its one-line form"""
+    summary = {"step": step_name, "time": time.strftime("%Y-%m-%d %H:%M:%S"), **tripped}
+    with open("watchdog_summary.json", "w", encoding="utf8") as f:
+        json.dump(summary, f, indent=2, default=str)
+    if tripped.get("log_tail"):
+        print("\n".join(tripped["log_tail"]))
+    return (f"{tripped['condition']} = {tripped['value']} (threshold {tripped['threshold']}) "
+            f"in step {step_name}, see {os.path.abspath('watchdog_summary.json')}")
+
+def write_step_report():
+    """Write the per-step report of this run as JSON and CSV"""
+    if not step_reports:
+        return
+    columns = ["step", "status", "wall_s", "cpu_s", "driver_cpu_s", "peak_rss_mb", "artifact_mb", "tools", "slot_wait_s"]
+    with open("flow_report.json", "w", encoding="utf8") as f:
+        json.dump(step_reports, f, indent=2)
+    with open("flow_report.csv", "w", encoding="utf8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=columns, restval="")
+        writer.writeheader()
+        writer.writerows(step_reports)
+
+    print("\nSlowest steps:")
+    timed = sorted((r for r in step_reports if "wall_s" in r), key=lambda r: -r["wall_s"])
+    for report in timed[:5]:
+        print(f"  {report['step']:<36} {report['wall_s']:>10} s  {report.get('peak_rss_mb', '-'):>8} MB")
+    print(f"Step report written to {os.path.abspath('flow_report.json')}")
+
+def run_step_worker(step_name, state_json):
+    """Run a single flow step in a worker process, States travel as JSON."""
+    from openlane.state import State
+
+    state_in = State.loads(state_json, validate_path=False)
+    state_out, report = run_step_instrumented(step_name, state_in)
+    return state_out.dumps(), report
+
+def merge_states(states):
+    """
+    Merge the output States of parallel branches.
+    The first State is the base; every other State contributes the views it
+    changed and its metrics.
+    """
+    from openlane.state import State
+
+    if not states:
+        return State()
+    base = states[0]
+    if len(states) == 1:
+        return base
+    overrides = {}
+    metrics = dict(base.metrics)
+    for state in states[1:]:
+        for key, value in state.items():
+            if value is not None and value != base.get(key):
+                overrides[key] = value
+        metrics.update(state.metrics)
+    return State(base, overrides=overrides, metrics=metrics)
+
+## ===================================
+## Metrics store
+## ===================================
+
+# Metrics kept in the store (exact names or prefixes of per-corner variants)
+tracked_metrics = (
+    "design__instance__count",
+    "design__instance__area",
+    "design__instance__utilization",
+    "timing__setup__ws",
+    "timing__setup__tns",
+    "timing__hold__ws",
+    "timing__hold__tns",
+    "antenna__violating__nets",
+    "antenna__violating__pins",
+    "route__antenna_violation__count",
+    "route__drc_errors",
+    "klayout__drc_error__count",
+    "magic__drc_error__count",
+    "design__lvs_error__count",
+)
+
+def metric_tracked(name):
+    return any(name == m or name.startswith(m + "__") for m in tracked_metrics)
+
+def design_git_revision():
+    """Git revision of the repository holding the RTL, '-dirty' if modified"""
+    try:
+        return subprocess.run(
+            ["git", "describe", "--always", "--dirty"],
+            cwd=os.path.dirname(os.path.abspath(verilog_files[0])),
+            capture_output=True, text=True,
+        ).stdout.strip() or "unknown"
+    except (OSError, IndexError):
+        return "unknown"
+
+def config_hash():
+    """Hash of the design configuration and the per-step overrides"""
+    config = {"config": design_config, "overrides": step_overrides}
+    return hashlib.sha256(json.dumps(config, sort_keys=True, default=str).encode()).hexdigest()[:16]
+
+@contextmanager
+def metrics_store_open():
+    """
+    Connection to the metrics store for one transaction: committed on
+    success, rolled back on error and closed in both cases
+    """
+    db = sqlite3.connect(metrics_db, timeout=60)
+    try:
+        with db:
+            metrics_store_schema(db)
+            yield db
+    finally:
+        db.close()
+
+def metrics_store_schema(db):
+    """Create the metrics store tables if they do not exist"""
+    db.executescript("""
+        CREATE TABLE IF NOT EXISTS runs (
+            id          INTEGER PRIMARY KEY AUTOINCREMENT,
+            time        TEXT,
+            design      TEXT,
+            git_rev     TEXT,
+            config_hash TEXT,
+            complete    INTEGER,
+            runtime_s   REAL
+        );
+        CREATE TABLE IF NOT EXISTS metrics (
+            run_id      INTEGER REFERENCES runs(id),
+            step        TEXT,
+            name        TEXT,
+            value       REAL
+        );
+        CREATE INDEX IF NOT EXISTS runs_key ON runs(design, config_hash, git_rev);
+        CREATE INDEX IF NOT EXISTS metrics_run ON metrics(run_id);
+    """)
+
+def metrics_store_record(state, flow_runtime):
+    """
+    Store the metrics of this run: the tracked metrics each executed step
+    produced, each step's runtime and the final tracked metrics (step 'flow').
+    A run is complete when no step was restored from a checkpoint.
+    Returns the run id.
+    """
+    rows = []
+    for step_name, metrics in step_metrics.items():
+        rows.extend((step_name, name, value) for name, value in metrics.items())
+    for report in step_reports:
+        if "wall_s" in report:
+            rows.append((report["step"], "runtime_s", report["wall_s"]))
+    rows.extend(("flow", name, value) for name, value in state.metrics.items() if metric_tracked(name))
+
+    complete = all(report["status"] != "restored" for report in step_reports)
+    with metrics_store_open() as db:
+        run_id = db.execute(
+            "INSERT INTO runs (time, design, git_rev, config_hash, complete, runtime_s) VALUES (?, ?, ?, ?, ?, ?)",
+            (time.strftime("%Y-%m-%d %H:%M:%S"), desing_name, design_git_revision(), config_hash(),
+             int(complete), round(flow_runtime, 1)),
+        ).lastrowid
+        db.executemany(
+            "INSERT INTO metrics (run_id, step, name, value) VALUES (?, ?, ?, ?)",
+            [(run_id, step, name, value) for step, name, value in rows
+             if isinstance(value, (int, float)) and not isinstance(value, bool)],
+        )
+    print(f"Run {run_id} recorded in the metrics store {metrics_db}")
+    return run_id
+
+def metrics_compare_baseline(run_id):
+    """
+    Compare this run against the baseline: the latest earlier run of the same
+    design and config at the --compare-baseline git revision (or any revision
+    for 'latest'). Timing (worst setup slack, ns), area (%) and runtime (%)
+    regressions beyond the thresholds fail the run.
+    """
+    with metrics_store_open() as db:
+        run = db.execute("SELECT design, config_hash, complete, runtime_s FROM runs WHERE id = ?", (run_id,)).fetchone()
+        query = "SELECT id, git_rev, complete, runtime_s FROM runs WHERE design = ? AND config_hash = ? AND id < ?"
+        params = [run[0], run[1], run_id]
+        if compare_baseline != "latest":
+            query += " AND git_rev = ?"
+            params.append(compare_baseline)
+        baseline = db.execute(query + " ORDER BY id DESC LIMIT 1", params).fetchone()
+        if baseline is None:
+            print(f"No baseline run found for {compare_baseline}, nothing to compare")
+            return 0
+
+        def flow_metrics(rid):
+            return dict(db.execute("SELECT name, value FROM metrics WHERE run_id = ? AND step = 'flow'", (rid,)))
+        current, previous = flow_metrics(run_id), flow_metrics(baseline[0])
+
+    print(f"\nComparing against baseline run {baseline[0]} ({baseline[1]})")
+    regressions = []
+
+    def check(label, now, before, regression, threshold, unit):
+        if now is None or before is None:
+            return
+        failed = regression > threshold
+        print(f"  {label:<10} {before:>12.3f} -> {now:>12.3f}  ({regression:+.3f} {unit}, limit {threshold} {unit})"
+              f"{'  REGRESSION' if failed else ''}")
+        if failed:
+            regressions.append(label)
+
+    wns, base_wns = current.get("timing__setup__ws"), previous.get("timing__setup__ws")
+    if wns is not None and base_wns is not None:
+        check("wns", wns, base_wns, base_wns - wns, regression_thresholds["wns"], "ns")
+    area, base_area = current.get("design__instance__area"), previous.get("design__instance__area")
+    if area and base_area:
+        check("area", area, base_area, 100 * (area - base_area) / base_area, regression_thresholds["area"], "%")
+    # Runtimes are only comparable when no step was restored in either run
+    if run[2] and baseline[2] and baseline[3]:
+        check("runtime", run[3], baseline[3], 100 * (run[3] - baseline[3]) / baseline[3],
+              regression_thresholds["runtime"], "%")
+
+    if regressions:
+        print(f"QoR regression against the baseline: {', '.join(regressions)}")
+        return 1
+    print("No regression against the baseline")
+    return 0
+
+def flow_fingerprint():
+    """
+    Fingerprint of the inputs shared by every step: the design configuration
+    and the contents of the resolved verilog files.
+    """
+    h = hashlib.sha256()
+    h.update(json.dumps(design_config, sort_keys=True).encode())
+    for vf in verilog_files:
+        h.update(str(vf).encode())
+        h.update(Path(vf).read_bytes())
+    return h.hexdigest()
+
+def step_fingerprint(step_name, parent_fingerprints):
+    """
+    Fingerprint of a single step, chained on the fingerprints of the steps
+    that feed it so any upstream change invalidates every downstream checkpoint.
+    """
+    h = hashlib.sha256()
+    for parent_fingerprint in parent_fingerprints:
+        h.update(parent_fingerprint.encode())
+    h.update(step_name.encode())
+    h.update(json.dumps(step_overrides.get(step_name, {}), sort_keys=True, default=str).encode())
+    return h.hexdigest()
+
+def checkpoint_path(step_name):
+    return os.path.join(checkpoint_dir, f"{step_name}.json")
+
+def checkpoint_save(step_name, fingerprint, state):
+    """Save the step's output state to disk, tagged with its input fingerprint."""
+    os.makedirs(checkpoint_dir, exist_ok=True)
+    checkpoint = {
+        "step": step_name,
+        "fingerprint": fingerprint,
+        "state": json.loads(state.dumps()),
+    }
+    tmp_path = checkpoint_path(step_name) + ".tmp"
+    with open(tmp_path, "w", encoding="utf8") as f:
+        json.dump(checkpoint, f, indent=2)
+    os.replace(tmp_path, checkpoint_path(step_name))
+
+def checkpoint_load(step_name, fingerprint):
+    """
+    Load the checkpointed state of a step.
+    Returns None if there is no checkpoint, the fingerprint does not match or
+    the files referenced by the saved state no longer exist, either as is or
+    compressed by the retention policy.
+    """
+    from openlane.state import State
+
+    path = checkpoint_path(step_name)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "r", encoding="utf8") as f:
+            checkpoint = json.load(f)
+        if checkpoint.get("fingerprint") != fingerprint:
+            print(f"Checkpoint for step {step_name} is stale, inputs changed.")
+            return None
+        state = State.loads(json.dumps(checkpoint["state"]), validate_path=False)
+        missing = [
+            p for v in state.values() for p in state_paths(v)
+            if not os.path.exists(p) and not os.path.exists(f"{p}.gz")
+        ]
+        if missing:
+            raise FileNotFoundError(f"{missing[0]} does not exist")
+        return state
+    except Exception as e:
+        print(f"Checkpoint for step {step_name} is not valid: {e}")
+        return None
+
+## ===================================
+## Artifact retention
+## ===================================
+
+# Per-step files compressed with the step's intermediate views
+retention_log_patterns = ("*.log",)
+
+# gzip level of the compressed intermediates, low enough to keep up with the flow
+retention_gzip_level = 3
+
+retention_pool = None
+retention_futures = []
+
+def step_directory(step_name):
+    """Latest directory of a step (<ordinal>-<step id>), None if it has none"""
+    pattern = re.compile(rf"^\d+-{re.escape(step_slug(step_name))}$")
+    found = []
+    for root, dirs, _ in os.walk(os.getcwd()):
+        dirs[:] = [d for d in dirs if d not in step_dir_skip]
+        found += [os.path.join(root, d) for d in dirs if pattern.match(d)]
+    return max(found, key=os.path.getmtime, default=None)
+
+def retention_submit(step_name, paths):
+    """
+    Apply the retention policy to a step whose downstream steps have all
+    succeeded: its views that no later State references are compressed
+    (or deleted) and the logs of its step directory compressed, in a
+    background thread while the flow goes on. Final views, reports and
+    metrics are never touched. The keep policy leaves everything in place.
+    """
+    global retention_pool
+    if retention_policy == "keep":
+        return
+    files = sorted(p for p in paths if os.path.isfile(p))
+    step_dir = step_directory(step_name)
+    if step_dir is not None:
+        for pattern in retention_log_patterns:
+            files += sorted(str(p) for p in Path(step_dir).rglob(pattern) if str(p) not in files)
+    if not files:
+        return
+    if retention_pool is None:
+        retention_pool = ThreadPoolExecutor(max_workers=1)
+    retention_futures.append(retention_pool.submit(retention_apply, step_name, files, set(paths)))
+
+def retention_apply(step_name, files, views):
+    """Compress or delete the given files, returns the bytes freed"""
+    freed = 0
+    for path in files:
+        try:
+            size = os.path.getsize(path)
+            if retention_policy == "delete" and path in views:
+                os.unlink(path)
+                freed += size
+            else:
+                freed += size - retention_compress(path)
+        except OSError as e:
+            print(f"Retention of {path} failed: {e}")
+    action = "deleted" if retention_policy == "delete" else "compressed"
+    print(f"Retention: {action} intermediates of step {step_name}, {freed / 2**20:.1f} MB freed")
+    return freed
+
+def retention_compress(path):
+    """Replace a file by its gzip-compressed copy <path>.gz, returns the compressed size"""
+    tmp_path = f"{path}.gz.tmp"
+    with open(path, "rb") as src, gzip.open(tmp_path, "wb", compresslevel=retention_gzip_level) as dst:
+        shutil.copyfileobj(src, dst, 1 << 20)
+    shutil.copystat(path, tmp_path)
+    os.replace(tmp_path, f"{path}.gz")
+    os.unlink(path)
+    return os.path.getsize(f"{path}.gz")
+
+def retention_restore(state):
+    """Decompress the views of a State that the retention policy compressed"""
+    for value in state.values():
+        for path in state_paths(value):
+            if os.path.exists(path) or not os.path.exists(f"{path}.gz"):
+                continue
+            # A background compression of this file may still be running
+            retention_wait()
+            if os.path.exists(path):
+                continue
+            tmp_path = f"{path}.tmp"
+            with gzip.open(f"{path}.gz", "rb") as src, open(tmp_path, "wb") as dst:
+                shutil.copyfileobj(src, dst, 1 << 20)
+            os.replace(tmp_path, path)
+            os.unlink(f"{path}.gz")
+
+def retention_wait():
+    """Wait for the background retention jobs, reports the total space freed"""
+    if not retention_futures:
+        return
+    freed = 0
+    for future in retention_futures:
+        try:
+            freed += future.result()
+        except Exception as e:
+            print(f"Retention job failed: {e}")
+    retention_futures.clear()
+    print(f"Retention: {freed / 2**20:.1f} MB freed by the {retention_policy} policy")
+
+## ===================================
+## Synthesis cache
+## ===================================
+
+# Config keys, besides SYNTH_*, that change the synthesized netlist
+synth_config_keys = (
+    "DESIGN_NAME", "PDK", "PDK_QUALIFIED", "STD_CELL_LIBRARY",
+    "CLOCK_PERIOD", "CLOCK_PORT", "CLOCK_NET",
+    "VERILOG_DEFINES", "VERILOG_INCLUDE_DIRS", "ERROR_ON_SYNTH_CHECKS",
+    "MAX_FANOUT_CONSTRAINT", "MAX_TRANSITION_CONSTRAINT",
+)
+
+def synth_cache_key():
+    """
+    Content address of a synthesis run: the RTL sources and the headers next
+    to them, the synthesis-relevant config keys and overrides, and the tools.
+    File paths are left out so configs pointing at the same RTL share entries.
+    """
+    h = hashlib.sha256()
+    for vf in verilog_files:
+        h.update(Path(vf).name.encode())
+        h.update(Path(vf).read_bytes())
+    synth_env_hash(h)
+    return h.hexdigest()
+
+def synth_env_hash(h):
+    """Update hash h with everything but the RTL modules that the synthesis result depends on"""
+    import openlane
+
+    headers = set()
+    for vf in verilog_files:
+        for pattern in ("*.svh", "*.vh"):
+            headers.update(Path(vf).parent.glob(pattern))
+    for header in sorted(headers, key=lambda p: p.name):
+        h.update(header.name.encode())
+        h.update(header.read_bytes())
+
+    synth_config = {
+        key: value for key, value in design_config.items()
+        if key.startswith("SYNTH_") or key in synth_config_keys
+    }
+    synth_config.update(step_overrides["flow_yosys_synthesis"])
+    h.update(json.dumps(synth_config, sort_keys=True, default=str).encode())
+
+    yosys_path = shutil.which("yosys")
+    h.update(f"{openlane.__version__}:{os.path.realpath(yosys_path) if yosys_path else ''}".encode())
+
+def synth_cache_copy_views(raw_state, dest_dir, src_dir="", relative=False):
+    """
+    Copy every file referenced by a raw (JSON) State into dest_dir and return
+    the raw State pointing at the copies. Relative source paths are taken
+    from src_dir; with relative=True the returned paths are relative to dest_dir.
+    """
+    def copy(value, key):
+        if value is None:
+            return None
+        if isinstance(value, dict):
+            return {k: copy(v, f"{key}.{k}") for k, v in value.items()}
+        if isinstance(value, list):
+            return [copy(v, f"{key}.{i}") for i, v in enumerate(value)]
+        src = os.path.join(src_dir, value)
+        dest = os.path.join(dest_dir, key, os.path.basename(value))
+        os.makedirs(os.path.dirname(dest), exist_ok=True)
+        if os.path.isdir(src):
+            shutil.copytree(src, dest)
+        else:
+            shutil.copy2(src, dest)
+        return os.path.relpath(dest, dest_dir) if relative else dest
+
+    metrics = raw_state.pop("metrics", {})
+    copied = {key: copy(value, key) for key, value in raw_state.items()}
+    copied["metrics"] = metrics
+    return copied
+
+def synth_cache_get(cache_key):
+    """
+    Look up a cached post-synthesis State. On a hit the entry is copied into
+    the run directory, so evicting it later does not break this run.
+    Returns None on a miss.
+    """
+    from openlane.state import State
+
+    entry = os.path.join(synth_cache_dir, cache_key)
+    entry_state = os.path.join(entry, "state.json")
+    if not os.path.exists(entry_state):
+        return None
+    try:
+        with open(entry_state, "r", encoding="utf8") as f:
+            raw_state = json.load(f)
+        os.utime(entry_state)
+        local_dir = os.path.abspath(os.path.join("synthesis_cache_hit", cache_key[:12]))
+        shutil.rmtree(local_dir, ignore_errors=True)
+        raw_state = synth_cache_copy_views(raw_state, local_dir, src_dir=entry)
+        return State.loads(json.dumps(raw_state), validate_path=True)
+    except Exception as e:
+        print(f"Synthesis cache entry {cache_key[:12]} is not usable: {e}")
+        return None
+
+def synth_cache_put(cache_key, state):
+    """Store a post-synthesis State and evict the least recently used entries"""
+    os.makedirs(synth_cache_dir, exist_ok=True)
+    entry = os.path.join(synth_cache_dir, cache_key)
+    if os.path.exists(entry):
+        return
+    tmp_entry = f"{entry}.tmp-{os.getpid()}"
+    shutil.rmtree(tmp_entry, ignore_errors=True)
+    try:
+        raw_state = synth_cache_copy_views(json.loads(state.dumps()), tmp_entry, relative=True)
+        with open(os.path.join(tmp_entry, "state.json"), "w", encoding="utf8") as f:
+            json.dump(raw_state, f, indent=2)
+        # Entries appear atomically, a concurrent run may have won the race
+        os.rename(tmp_entry, entry)
+    except OSError as e:
+        print(f"Could not store synthesis cache entry {cache_key[:12]}: {e}")
+        shutil.rmtree(tmp_entry, ignore_errors=True)
+        return
+    synth_cache_evict()
+
+def synth_cache_evict():
+    """Delete the least recently used entries until the cache fits its size bound"""
+    entries = []
+    for name in os.listdir(synth_cache_dir):
+        entry_state = os.path.join(synth_cache_dir, name, "state.json")
+        if os.path.exists(entry_state):
+            entries.append((os.path.getmtime(entry_state), path_size(os.path.join(synth_cache_dir, name)), name))
+    total = sum(size for _, size, _ in entries)
+    limit = synth_cache_size_gb * 2**30
+    for _, size, name in sorted(entries):
+        if total <= limit:
+            break
+        print(f"Evicting synthesis cache entry {name[:12]}")
+        shutil.rmtree(os.path.join(synth_cache_dir, name), ignore_errors=True)
+        total -= size
+
 def flow_yosys_synthesis(state_in):
     """Yosys Synthesis step"""
     from openlane.steps import Step
     global verilog_files
 
     step_prompt("Synthesis")
+    if synth_cache_dir:
+        cache_key = synth_cache_key()
+        cached = synth_cache_get(cache_key)
+        if cached is not None:
+            print(f"Step Synthesis restored from the synthesis cache ({cache_key[:12]})!")
+            return cached
+
     Synthesis = Step.factory.get("Yosys.Synthesis")
     files_to_use = verilog_files
     synthesis = Synthesis(
         VERILOG_FILES=files_to_use,
         state_in=state_in,
-        SYNTH_ABC_DFF=True,
-        # SYNTH_STRATEGY="DELAY 0",
+        **step_overrides["flow_yosys_synthesis"],
     )
     synthesis.start()
+    if synth_cache_dir:
+        synth_cache_put(cache_key, synthesis.state_out)
     print("Step Synthesis completed!")
     return synthesis.state_out
 
@@ -280,10 +1636,7 @@ def flow_openroad_generatepdn(state_in):
     GeneratePDN = Step.factory.get("OpenROAD.GeneratePDN")
     pdn = GeneratePDN(
         state_in=state_in,
-        FP_PDN_VWIDTH=2,
-        FP_PDN_HWIDTH=2,
-        FP_PDN_VPITCH=30,
-        FP_PDN_HPITCH=30,
+        **step_overrides["flow_openroad_generatepdn"],
     )
     pdn.start()
     print("Step Power Distribution Network (PDN) Generation completed!")
@@ -367,15 +1720,150 @@ def flow_openroad_rcx(state_in):
     return rcx.state_out
 
 def flow_openroad_stapostpnr(state_in):
-    """OpenROAD Static Timing Analysis (STA) Post-PNR step"""
-    from openlane.steps import Step
+    """
+    OpenROAD Static Timing Analysis (STA) Post-PNR step
+    Every STA corner runs in a worker of the step pool on a copy of the
+    post-RCX state, so the wall time stays close to that of a single corner.
+    Without a pool the corners run one after the other.
+    """
+    from openlane.state import State
 
     step_prompt("Static Timing Analysis (STA) Post-PNR")
-    STAPostPNR = Step.factory.get("OpenROAD.STAPostPNR")
-    sta_post_pnr = STAPostPNR(state_in=state_in)
-    sta_post_pnr.start()
+    corners = step_overrides["flow_openroad_stapostpnr"]["STA_CORNERS"]
+    sta_dir = os.path.abspath("sta_corners")
+    state_json = state_in.dumps()
+    if flow_pool is None:
+        corner_jsons = [
+            sta_corner_worker(corner, state_json, os.path.join(sta_dir, corner))
+            for corner in corners
+        ]
+    else:
+        futures = [
+            flow_pool.submit(sta_corner_worker, corner, state_json, os.path.join(sta_dir, corner))
+            for corner in corners
+        ]
+        corner_jsons = [f.result() for f in futures]
+    corner_states = [State.loads(j, validate_path=False) for j in corner_jsons]
+
+    # Per-corner views (LIB, SDF, ...) are dicts keyed by corner: join them
+    # Only the "__corner:" metrics are taken from each run, the design-wide
+    # aggregates of a single corner would overwrite each other
+    overrides = {}
+    corner_metrics = {}
+    for corner_state in corner_states:
+        for key, value in corner_state.items():
+            if value is None or value == state_in.get(key):
+                continue
+            if isinstance(value, Mapping):
+                overrides[key] = {**overrides.get(key, {}), **value}
+            else:
+                overrides[key] = value
+        corner_metrics.update(
+            (key, value) for key, value in corner_state.metrics.items() if "__corner:" in key)
+    metrics = {**state_in.metrics, **corner_metrics, **sta_corner_aggregates(corner_metrics)}
+    state_out = State(state_in, overrides=overrides, metrics=metrics)
+
+    sta_corner_report(state_out, corners, sta_dir)
     print("Step Static Timing Analysis (STA) Post-PNR completed!")
-    return sta_post_pnr.state_out
+    return state_out
+
+def sta_corner_worker(corner, state_json, step_dir):
+    """Run post-PnR STA for a single corner in a worker process"""
+    from openlane.steps import Step
+    from openlane.state import State
+
+    STAPostPNR = Step.factory.get("OpenROAD.STAPostPNR")
+    sta_post_pnr = STAPostPNR(
+        state_in=State.loads(state_json, validate_path=False),
+        **{**step_overrides["flow_openroad_stapostpnr"], "STA_CORNERS": [corner]},
+    )
+    sta_post_pnr.start(step_dir=step_dir)
+    return sta_post_pnr.state_out.dumps()
+
+def sta_corner_aggregates(corner_metrics):
+    """
+    Design-wide STA metrics recomputed over all the corners: the worst
+    (minimum) setup/hold slack and TNS, and the sum of the violation counts.
+    """
+    values = {}
+    for key, value in corner_metrics.items():
+        name = key.split("__corner:")[0]
+        if value is not None:
+            values.setdefault(name, []).append(value)
+
+    aggregates = {}
+    for name, corner_values in values.items():
+        if name.endswith(("__ws", "__wns", "__tns")):
+            aggregates[name] = min(corner_values)
+        elif name.endswith("__count"):
+            aggregates[name] = sum(corner_values)
+    return aggregates
+
+def sdc_clock_groups():
+    """
+    Clock groups of the signoff (or PnR) SDC file: the -group lists of its
+    set_clock_groups commands, or a single group of all the created clocks.
+    dir:: paths are resolved against DESIGN_DIR, like the Verilog files.
+    """
+    sdc_file = design_config.get("SIGNOFF_SDC_FILE") or design_config.get("PNR_SDC_FILE")
+    if not sdc_file:
+        return [[clock_port]]
+    sdc_file = os.path.join(design_dir, sdc_file.replace("dir::", ""))
+    try:
+        with open(sdc_file, "r", encoding="utf8") as f:
+            sdc = f.read().replace("\\\n", " ")
+    except OSError:
+        sdc = ""
+
+    groups = []
+    for command in re.findall(r"^\s*set_clock_groups\b.*$", sdc, re.MULTILINE):
+        for group in re.findall(r"-group\s+(\{[^}]*\}|\[[^\]]*\]|\S+)", command):
+            groups.append(re.sub(r"\[\s*get_clocks\b|[{}\[\]]", " ", group).split())
+    if not groups:
+        clocks = re.findall(r"create_clock\b.*?-name\s+(\S+)", sdc)
+        groups = [clocks] if clocks else []
+    return groups or [[clock_port]]
+
+def sta_corner_report(state, corners, sta_dir):
+    """
+    Aggregate the per-corner STA metrics into one worst-slack, hold and
+    max-transition table, written to <sta_dir>/sta_corners.csv.
+    OpenLane reports slack per corner over all the SDC clock groups, which
+    for a single-clock design is the slack of that clock.
+    """
+    columns = {
+        "setup_ws":       "timing__setup__ws__corner:{}",
+        "setup_tns":      "timing__setup__tns__corner:{}",
+        "hold_ws":        "timing__hold__ws__corner:{}",
+        "hold_tns":       "timing__hold__tns__corner:{}",
+        "max_slew_viol":  "design__max_slew_violation__count__corner:{}",
+        "max_cap_viol":   "design__max_cap_violation__count__corner:{}",
+    }
+    clock_group = " ".join("{" + " ".join(group) + "}" for group in sdc_clock_groups())
+    rows = []
+    for corner in corners:
+        row = {"clock_group": clock_group, "corner": corner}
+        for column, metric in columns.items():
+            row[column] = state.metrics.get(metric.format(corner))
+        rows.append(row)
+
+    os.makedirs(sta_dir, exist_ok=True)
+    with open(os.path.join(sta_dir, "sta_corners.csv"), "w", encoding="utf8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=["clock_group", "corner", *columns])
+        writer.writeheader()
+        writer.writerows(rows)
+
+    print(f"\nPost-PnR STA, clock group: {clock_group}")
+    print(f"  {'corner':<18} {'setup WS':>10} {'setup TNS':>10} {'hold WS':>10} {'hold TNS':>10} {'slew viol':>10}")
+    for row in rows:
+        print(f"  {row['corner']:<18} " + " ".join(
+            f"{row[c] if row[c] is not None else '-':>10}"
+            for c in ("setup_ws", "setup_tns", "hold_ws", "hold_tns", "max_slew_viol")))
+    for column, label in (("setup_ws", "setup"), ("hold_ws", "hold")):
+        values = [(row[column], row["corner"]) for row in rows if row[column] is not None]
+        if values:
+            worst, corner = min(values)
+            print(f"  Worst {label} slack: {worst} ({corner})")
 
 def flow_klayout_streamout(state_in):
     """KLayout Stream-out step"""
@@ -437,10 +1925,378 @@ def flow_netgen_lvs(state_in):
     print("Step Layout vs. Schematic Check (LVS) completed!")
     return lvs.state_out
 
+## ===================================
+## Synthesis estimate mode
+## ===================================
+
+# Modules estimated by --estimate when none are given
+estimate_modules = ["fec_top", "dl_fec_engine", "ul_fec_engine", "EF_UART", "dl_fec_fsm", "ul_fec_fsm"]
+
+# STA corner of the pre-placement timing estimate
+estimate_corner = "nom_tt_025C_1v80"
+
+def rtl_modules():
+    """Map every module defined in the RTL sources to its source text"""
+    modules = {}
+    for vf in verilog_files:
+        text = Path(vf).read_text(encoding="utf8", errors="replace")
+        for m in re.finditer(r"^\s*module\s+(\w+).*?^\s*endmodule\b", text, re.M | re.S):
+            modules[m.group(1)] = m.group(0)
+    return modules
+
+def module_hashes(modules):
+    """
+    Hash of every module over its own source and the hashes of the modules
+    it instantiates, so editing a submodule only invalidates its ancestors.
+    """
+    hashes = {}
+    def module_hash(name, parents):
+        if name not in hashes:
+            text = modules[name]
+            h = hashlib.sha256(f"{name}\n{text}".encode())
+            for sub in sorted(modules):
+                if sub != name and sub not in parents and re.search(rf"\b{sub}\b", text):
+                    h.update(module_hash(sub, parents | {name}).encode())
+            hashes[name] = h.hexdigest()
+        return hashes[name]
+    for name in modules:
+        module_hash(name, frozenset())
+    return hashes
+
+def estimate_critical_path(sta_dir):
+    """Start point, end point and arrival time of the worst setup path in the STA reports"""
+    for report in sorted(Path(sta_dir).rglob("max*.rpt")):
+        text = report.read_text(encoding="utf8", errors="replace")
+        start = re.search(r"Startpoint:\s*(\S+)", text)
+        end = re.search(r"Endpoint:\s*(\S+)", text)
+        arrival = re.search(r"(-?\d+\.\d+)\s+data arrival time", text)
+        if start and end:
+            return {
+                "startpoint": start.group(1),
+                "endpoint": end.group(1),
+                "arrival_ns": float(arrival.group(1)) if arrival else None,
+            }
+    return {"startpoint": None, "endpoint": None, "arrival_ns": None}
+
+def estimate_module_worker(module, step_dir):
+    """
+    Synthesize one module as top level and time the netlist with a
+    pre-placement STA at a single corner. Submodules keep their default
+    parameter values. Runs in a worker process.
+    """
+    from openlane.steps import Step
+
+    start = time.monotonic()
+    row = {"module": module}
+    try:
+        flow_config_interactive(module)
+        Synthesis = Step.factory.get("Yosys.Synthesis")
+        synthesis = Synthesis(VERILOG_FILES=verilog_files, **step_overrides["flow_yosys_synthesis"])
+        synthesis.start(step_dir=os.path.join(step_dir, "synthesis"))
+        STAPrePNR = Step.factory.get("OpenROAD.STAPrePNR")
+        sta_pre_pnr = STAPrePNR(state_in=synthesis.state_out, STA_CORNERS=[estimate_corner])
+        sta_pre_pnr.start(step_dir=os.path.join(step_dir, "sta"))
+        metrics = sta_pre_pnr.state_out.metrics
+        row.update(
+            status="ok",
+            cells=metrics.get("design__instance__count"),
+            area=metrics.get("design__instance__area"),
+            wns=metrics.get("timing__setup__ws"),
+            tns=metrics.get("timing__setup__tns"),
+            **estimate_critical_path(os.path.join(step_dir, "sta")),
+        )
+    except Exception as e:
+        row.update(status="failed", error=str(e))
+    row["runtime_s"] = round(time.monotonic() - start, 1)
+    return row
+
+def estimate_flow(modules):
+    """
+    Quick QoR estimate: synthesis plus pre-placement STA of each module,
+    without running placement and routing. Results are cached per module
+    hash in the synthesis cache, so only edited modules and the modules
+    that instantiate them are synthesized again.
+    Results are written to estimate/estimate.csv.
+    """
+    rtl = rtl_modules()
+    unknown = [m for m in modules if m not in rtl]
+    if unknown:
+        print(f"Modules not found in the RTL sources: {', '.join(unknown)}")
+        return 1
+
+    env = hashlib.sha256()
+    synth_env_hash(env)
+    env.update(f"{estimate_corner}:{clock_period}".encode())
+    hashes = module_hashes(rtl)
+    keys = {m: hashlib.sha256(f"{hashes[m]}:{env.hexdigest()}".encode()).hexdigest() for m in modules}
+    cache_dir = os.path.join(synth_cache_dir, "estimate") if synth_cache_dir else None
+
+    estimate_dir = os.path.abspath("estimate")
+    rows = {}
+    for module in modules:
+        cached = os.path.join(cache_dir, f"{keys[module]}.json") if cache_dir else None
+        if cached and os.path.exists(cached):
+            with open(cached, "r", encoding="utf8") as f:
+                rows[module] = {**json.load(f), "cached": True}
+            os.utime(cached)
+
+    pending = [m for m in modules if m not in rows]
+    print(f"Estimating {len(modules)} modules, {len(modules) - len(pending)} from the cache")
+    estimate_start = time.monotonic()
+    with ProcessPoolExecutor(
+        max_workers=max(1, min(len(pending), flow_jobs)),
+        mp_context=multiprocessing.get_context("fork"),
+    ) as pool:
+        futures = {
+            pool.submit(estimate_module_worker, module, os.path.join(estimate_dir, module)): module
+            for module in pending
+        }
+        for future in as_completed(futures):
+            row = future.result()
+            print(f"Module {row['module']} estimated in {row['runtime_s']} s")
+            if row["status"] == "ok" and cache_dir:
+                os.makedirs(cache_dir, exist_ok=True)
+                with open(os.path.join(cache_dir, f"{keys[row['module']]}.json"), "w", encoding="utf8") as f:
+                    json.dump(row, f, indent=2)
+            rows[row["module"]] = {**row, "cached": False}
+
+    columns = ["module", "status", "cells", "area", "wns", "tns",
+               "startpoint", "endpoint", "arrival_ns", "cached", "runtime_s", "error"]
+    rows = [rows[m] for m in modules]
+    os.makedirs(estimate_dir, exist_ok=True)
+    with open(os.path.join(estimate_dir, "estimate.csv"), "w", encoding="utf8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=columns, restval="")
+        writer.writeheader()
+        writer.writerows(rows)
+
+    print(f"\nSynthesis estimate at {clock_period} ns, corner {estimate_corner}")
+    print(f"  {'module':<16} {'cells':>8} {'area um2':>12} {'WNS':>8} {'TNS':>10}  critical path")
+    for row in rows:
+        if row["status"] != "ok":
+            print(f"  {row['module']:<16} failed: {row.get('error')}")
+            continue
+        path = f"{row['startpoint']} -> {row['endpoint']}" if row["startpoint"] else "-"
+        print(f"  {row['module']:<16} " + " ".join(
+            f"{row[c] if row[c] is not None else '-':>{w}}"
+            for c, w in (("cells", 8), ("area", 12), ("wns", 8), ("tns", 10)))
+            + f"  {path}{' (cached)' if row['cached'] else ''}")
+    print(f"Estimate written to {os.path.join(estimate_dir, 'estimate.csv')} "
+          f"in {time.monotonic() - estimate_start:.1f} s")
+    return 0 if all(row["status"] == "ok" for row in rows) else 1
+
+## ===================================
+## Design-space exploration sweep
+## ===================================
+
+# Metrics collected for every sweep point, first available key wins
+sweep_metrics = {
+    "wns":         ["timing__setup__ws"],
+    "tns":         ["timing__setup__tns"],
+    "area":        ["design__instance__area"],
+    "utilization": ["design__instance__utilization"],
+    "drc":         ["klayout__drc_error__count", "magic__drc_error__count", "route__drc_errors"],
+}
+
+def sweep_points(grid):
+    """Expand a parameter grid {KEY: [values]} into a list of {KEY: value} points."""
+    keys = list(grid)
+    values = [v if isinstance(v, list) else [v] for v in grid.values()]
+    return [dict(zip(keys, combo)) for combo in itertools.product(*values)]
+
+def flow_subprocess(run_config, point_dir, point_cores):
+    """
+    Run the full flow for one config non-interactively in its own process
+    and run directory, logging to <point_dir>/flow.log.
+    Returns the run status, its sweep metrics and runtime.
+    """
+    cmd = [
+        sys.executable, os.path.abspath(__file__),
+        "-c", run_config,
+        "--no-interactive", "--no-klayout-opengui",
+        "--run-dir", point_dir,
+        "--checkpoint-dir", os.path.join(point_dir, "checkpoints"),
+        "-j", str(point_cores),
+    ]
+    if resume_mode:
+        cmd.append("--resume")
+    if heavy_slots_dir:
+        cmd += ["--heavy-slots", heavy_slots_dir]
+    cmd += ["--retention", retention_policy]
+
+    start = time.monotonic()
+    with open(os.path.join(point_dir, "flow.log"), "w", encoding="utf8") as log:
+        result = subprocess.call(cmd, stdout=log, stderr=subprocess.STDOUT, stdin=subprocess.DEVNULL)
+    runtime = time.monotonic() - start
+
+    row = {"status": "ok" if result == 0 else "failed"}
+    metrics = {}
+    metrics_file = os.path.join(point_dir, "metrics.json")
+    if os.path.exists(metrics_file):
+        with open(metrics_file, "r", encoding="utf8") as f:
+            metrics = json.load(f)
+    for column, keys in sweep_metrics.items():
+        row[column] = next((metrics[k] for k in keys if k in metrics), None)
+    row["runtime_s"] = round(runtime, 1)
+    return row
+
+def sweep_run_point(index, point, point_dir, base_config, point_cores):
+    """Run the full flow for one sweep point in its own run directory."""
+    os.makedirs(point_dir, exist_ok=True)
+    point_config = os.path.join(point_dir, "config.json")
+    with open(point_config, "w", encoding="utf8") as f:
+        json.dump({**base_config, **point}, f, indent=4)
+    return {"point": index, **point, **flow_subprocess(point_config, point_dir, point_cores)}
+
+def resource_budget(base_dir, budget):
+    """
+    Split a host budget {cores, mem, run_cores, run_mem, heavy_cores, heavy_mem}
+    into the number of concurrent flows and of heavy step slots.
+    """
+    workers = max(1, min(budget["cores"] // budget["run_cores"], int(budget["mem"] // budget["run_mem"])))
+    slots = max(1, min(budget["cores"] // budget["heavy_cores"], int(budget["mem"] // budget["heavy_mem"])))
+    heavy_slots_setup(base_dir, slots)
+    print(f"Running {workers} flows at a time ({budget['run_cores']} cores / {budget['run_mem']} GB each), "
+          f"{slots} of them in {'/'.join(sorted(heavy_steps))} at once "
+          f"({budget['heavy_cores']} cores / {budget['heavy_mem']} GB each)")
+    return workers
+
+def sweep_flow(grid_file, sweep_dir, budget):
+    """
+    Run every point of a parameter grid through the flow, each one in its own
+    run directory, as many at a time as the core and memory budget allows.
+    Results are collected into <sweep_dir>/results.csv.
+    """
+    with open(grid_file, "r", encoding="utf8") as f:
+        grid = json.load(f)
+    with open(config_file, "r", encoding="utf8") as f:
+        base_config = json.load(f)
+
+    points = sweep_points(grid)
+    if sweep_dir is None:
+        sweep_dir = os.path.join(os.getcwd(), "sweeps", base_config.get("DESIGN_NAME", "design"))
+    sweep_dir = os.path.abspath(sweep_dir)
+    os.makedirs(sweep_dir, exist_ok=True)
+
+    print(f"Sweeping {len(points)} points in {sweep_dir}")
+    workers = resource_budget(sweep_dir, budget)
+
+    rows = []
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(
+                sweep_run_point, i, point, os.path.join(sweep_dir, f"point_{i:03d}"),
+                base_config, budget["run_cores"],
+            ): i
+            for i, point in enumerate(points)
+        }
+        for future in as_completed(futures):
+            row = future.result()
+            rows.append(row)
+            print(f"Sweep point {row['point']} {row['status']} in {row['runtime_s']} s")
+
+    # Closing points first, then by clock period and area
+    def sort_key(row):
+        closes = row["status"] == "ok" and row["wns"] is not None and row["wns"] >= 0
+        return (not closes, row.get("CLOCK_PERIOD") or 0, row["area"] or 0)
+    rows.sort(key=sort_key)
+
+    columns = ["point", *grid.keys(), "status", *sweep_metrics.keys(), "runtime_s"]
+    results_file = os.path.join(sweep_dir, "results.csv")
+    with open(results_file, "w", encoding="utf8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=columns)
+        writer.writeheader()
+        writer.writerows(rows)
+
+    print("\n" + " | ".join(columns))
+    for row in rows:
+        print(" | ".join(str(row.get(c, "")) for c in columns))
+    print(f"\nSweep results written to {results_file}")
+    return 0 if all(row["status"] == "ok" for row in rows) else 1
+
+## ===================================
+## Multi-design batch
+## ===================================
+
+def batch_run_design(index, config_path, batch_dir, run_cores):
+    """Run the full flow for one design of a batch in its own run directory."""
+    with open(config_path, "r", encoding="utf8") as f:
+        design = json.load(f).get("DESIGN_NAME", Path(config_path).stem)
+    design_run_dir = os.path.join(batch_dir, f"{index:02d}_{design}")
+    os.makedirs(design_run_dir, exist_ok=True)
+    print(f"Batch design {design} started, log {os.path.join(design_run_dir, 'flow.log')}")
+    return {"design": design, "config": config_path, **flow_subprocess(config_path, design_run_dir, run_cores),
+            "run_dir": design_run_dir}
+
+def batch_flow(config_files, batch_dir, budget):
+    """
+    Run the flow for several designs concurrently under one core and memory
+    budget. Every design gets its own run directory and log, the heavy steps
+    of all designs share the heavy step slots, and a consolidated summary is
+    written to <batch_dir>/summary.csv.
+    """
+    config_files = [os.path.abspath(c) for c in config_files]
+    missing = [c for c in config_files if not os.path.exists(c)]
+    if missing:
+        print(f"Configuration files do not exist: {', '.join(missing)}")
+        return 1
+    batch_dir = os.path.abspath(batch_dir or os.path.join("batch", time.strftime("%Y%m%d_%H%M%S")))
+    os.makedirs(batch_dir, exist_ok=True)
+
+    print(f"Running a batch of {len(config_files)} designs in {batch_dir}")
+    workers = resource_budget(batch_dir, budget)
+
+    rows = []
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(batch_run_design, i, config, batch_dir, budget["run_cores"])
+            for i, config in enumerate(config_files)
+        ]
+        for future in as_completed(futures):
+            row = future.result()
+            rows.append(row)
+            print(f"Batch design {row['design']} {row['status']} in {row['runtime_s']} s")
+    rows.sort(key=lambda row: row["run_dir"])
+
+    columns = ["design", "status", *sweep_metrics.keys(), "runtime_s", "config", "run_dir"]
+    summary_file = os.path.join(batch_dir, "summary.csv")
+    with open(summary_file, "w", encoding="utf8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=columns)
+        writer.writeheader()
+        writer.writerows(rows)
+
+    shown = columns[:-2]
+    print("\n" + " | ".join(shown))
+    for row in rows:
+        print(" | ".join(str(row.get(c, "")) for c in shown))
+    for row in rows:
+        if row["status"] != "ok":
+            print(f"Design {row['design']} failed, see {os.path.join(row['run_dir'], 'flow.log')}")
+    print(f"\nBatch summary written to {summary_file}")
+    return 0 if all(row["status"] == "ok" for row in rows) else 1
+
+def total_memory_gb():
+    """Physical memory of the host in GB"""
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES") / 2**30
+    except (ValueError, OSError, AttributeError):
+        return 16
+
 def main():
     global interactive_mode
     global klayout_opengui
     global config_file
+    global resume_mode
+    global checkpoint_dir
+    global flow_jobs
+    global run_dir
+    global refresh_env
+    global synth_cache_dir
+    global synth_cache_size_gb
+    global metrics_db
+    global compare_baseline
+    global watchdog_enabled
+    global heavy_slots_dir
+    global retention_policy
 
     parser = argparse.ArgumentParser(
         prog="OpenLane Interactive Flow",
@@ -453,26 +2309,87 @@ def main():
     parser.add_argument("-c", "--config", help="OpenLane configuration file path")
     parser.add_argument("--no-interactive", action="store_true", help="Disable interactive mode")
     parser.add_argument("--no-klayout-opengui", action="store_true", help="Disable KLayout OpenGUI step")
+    parser.add_argument("--resume", action="store_true", help="Restore finished steps from their checkpoints and re-run only the steps whose inputs changed")
+    parser.add_argument("-j", "--jobs", type=int, help="Maximum number of flow steps run in parallel in non-interactive mode (default: number of CPUs)")
+    parser.add_argument("--refresh-env", action="store_true", help="Force the Nix/PDK environment setup even if the cached environment fingerprint matches")
+    parser.add_argument("--synth-cache", help="Synthesis cache directory, may be shared across runs and configs (default: ./synth_cache)")
+    parser.add_argument("--synth-cache-size", type=float, default=synth_cache_size_gb, help="Synthesis cache size bound in GB, least recently used entries are evicted")
+    parser.add_argument("--no-synth-cache", action="store_true", help="Always run synthesis, bypassing the synthesis cache")
+    parser.add_argument("--metrics-db", help="SQLite metrics store the run is recorded in (default: ./flow_metrics.db)")
+    parser.add_argument("--compare-baseline", nargs="?", const="latest", metavar="GIT_REV", help="Fail the run if timing, area or runtime regress against the latest run of the same config (at GIT_REV if given)")
+    parser.add_argument("--wns-threshold", type=float, default=regression_thresholds["wns"], help="Allowed worst setup slack regression in ns")
+    parser.add_argument("--area-threshold", type=float, default=regression_thresholds["area"], help="Allowed area regression in percent")
+    parser.add_argument("--runtime-threshold", type=float, default=regression_thresholds["runtime"], help="Allowed runtime regression in percent")
+    parser.add_argument("--no-watchdog", action="store_true", help="Disable the early-abort watchdog")
+    parser.add_argument("--max-grt-overflow", type=int, default=watchdog_thresholds["grt_overflow"], help="Abort when the global routing overflow exceeds this value")
+    parser.add_argument("--min-cts-wns", type=float, default=watchdog_thresholds["cts_wns"], help="Abort when the setup WNS after CTS is worse than this value in ns")
+    parser.add_argument("--max-antenna-violations", type=int, help="Abort when the antenna net violations exceed this count (default: HEURISTIC_ANTENNA_THRESHOLD)")
+    parser.add_argument("--retention", choices=("keep", "compress", "delete"), default=retention_policy, help="What to do with the intermediate views of a step once its downstream steps succeeded: keep them, gzip them in the background or delete them (with compress and delete the logs of the step directory are gzipped too)")
+    parser.add_argument("--checkpoint-dir", help="Directory where step checkpoints are stored (default: ./checkpoints/<DESIGN_NAME>)")
+    parser.add_argument("--run-dir", help="Directory the flow runs in and writes its results to (default: current directory)")
+    parser.add_argument("--estimate", nargs="*", metavar="MODULE", help="Only synthesize and run a pre-placement STA on each module (default: fec_top and its main submodules) to estimate area and timing")
+    parser.add_argument("--sweep", metavar="GRID", help="Run a design-space exploration sweep over the JSON parameter grid {KEY: [values], ...}")
+    parser.add_argument("--sweep-dir", help="Directory for the sweep point run directories (default: ./sweeps/<DESIGN_NAME>)")
+    parser.add_argument("--batch", nargs="+", metavar="CONFIG", help="Run the flow for several design configuration files concurrently")
+    parser.add_argument("--batch-dir", help="Directory for the batch design run directories (default: ./batch/<timestamp>)")
+    parser.add_argument("--max-cores", "--sweep-cores", type=int, default=os.cpu_count() or 1, help="Total CPU cores available to a sweep or batch")
+    parser.add_argument("--max-mem", "--sweep-mem", type=float, default=total_memory_gb(), help="Total memory in GB available to a sweep or batch")
+    parser.add_argument("--run-cores", "--point-cores", type=int, default=2, help="CPU cores reserved for each flow of a sweep or batch")
+    parser.add_argument("--run-mem", "--point-mem", type=float, default=8, help="Memory in GB reserved for each flow of a sweep or batch")
+    parser.add_argument("--heavy-cores", type=int, default=4, help="CPU cores reserved for each detailed routing or DRC step of a sweep or batch")
+    parser.add_argument("--heavy-mem", type=float, default=16, help="Memory in GB reserved for each detailed routing or DRC step of a sweep or batch")
+    parser.add_argument("--heavy-slots", help=argparse.SUPPRESS)
     args = parser.parse_args()
     result = 0
 
     # Check for flags
     interactive_mode = not args.no_interactive
     klayout_opengui  = not args.no_klayout_opengui
+    resume_mode      = args.resume
+    checkpoint_dir   = args.checkpoint_dir
+    run_dir          = args.run_dir
+    refresh_env      = args.refresh_env
+    synth_cache_size_gb = args.synth_cache_size
+    metrics_db       = os.path.abspath(args.metrics_db or "flow_metrics.db")
+    compare_baseline = args.compare_baseline
+    regression_thresholds.update(wns=args.wns_threshold, area=args.area_threshold, runtime=args.runtime_threshold)
+    watchdog_enabled = not args.no_watchdog
+    watchdog_thresholds.update(grt_overflow=args.max_grt_overflow, cts_wns=args.min_cts_wns,
+                               antenna=args.max_antenna_violations)
+    if not args.no_synth_cache:
+        synth_cache_dir = os.path.abspath(args.synth_cache or "synth_cache")
+    if args.jobs:
+        flow_jobs    = max(1, args.jobs)
+    heavy_slots_dir  = args.heavy_slots
+    retention_policy = args.retention
+    budget = {
+        "cores": args.max_cores, "mem": args.max_mem,
+        "run_cores": max(1, args.run_cores), "run_mem": args.run_mem,
+        "heavy_cores": max(1, args.heavy_cores), "heavy_mem": args.heavy_mem,
+    }
 
     if interactive_mode:
         print("Running in interactive mode. You will be prompted to proceed at each step.")
+    elif flow_jobs > 1:
+        print(f"Running in non-interactive mode. Independent steps run in parallel on {flow_jobs} workers, without prompts.")
     else:
-        print("Running in non-interactive mode. Steps will run sequentially without prompts.")
+        print("Running in non-interactive mode. Steps will run sequentially on 1 worker, without prompts.")
 
     if klayout_opengui:
         print("KLayout OpenGUI step is enabled. You will be prompted to open the generated GDS file in KLayout after the stream-out step.")
     else:
         print("KLayout OpenGUI step is disabled. The flow will skip the interactive GDS inspection step.")
 
+    if resume_mode:
+        print("Resume mode enabled. Steps with a valid checkpoint will be skipped.")
+
+    # Batch mode runs each design as a separate flow invocation
+    if args.batch:
+        return batch_flow(args.batch, args.batch_dir, budget)
+
     # Check if config file is provided and exists, if not, exit with error
     if(args.config):
-        config_file = args.config
+        config_file = os.path.abspath(args.config)
         if not os.path.exists(config_file):
             print(f"Configuration file does not exist: {config_file}")
             return 1
@@ -480,6 +2397,10 @@ def main():
         print("No configuration file provided. It must be provided with the -c or --config flag.")
         return 1
 
+    # Sweep mode runs each point as a separate flow invocation
+    if args.sweep:
+        return sweep_flow(args.sweep, args.sweep_dir, budget)
+
     # Check Nix setup and OpenLane dependencies
     result  = nix_setup()
     result += openlane_setup()
@@ -487,6 +2408,11 @@ def main():
         return result
 
     # Run OpenLane flow
+    if run_dir:
+        os.makedirs(run_dir, exist_ok=True)
+        os.chdir(run_dir)
+    if args.estimate is not None:
+        return estimate_flow(args.estimate or estimate_modules)
     result = openlane_flow()
     return result
 
@@ -119,6 +119,7 @@ module crc_tb;
     parameter logic [CRC_WIDTH:0] POLY = 9'b10000111;
     parameter logic [CRC_WIDTH-1:0] SEED = '0;
     parameter int XOR_OPS_PER_CYCLE = 8;
+    parameter int MODE = 0; // 0: sequential, 1: parallel, 2: pipelined
 
     logic clk, rst, crc_ver_start, crc_gen_start;
     logic [DATA_WIDTH-1:0] data_in;
@@ -145,7 +146,8 @@ module crc_tb;
         .CRC_WIDTH(CRC_WIDTH),
         .POLY(POLY),
         .SEED(SEED),
-        .XOR_OPS_PER_CYCLE(XOR_OPS_PER_CYCLE)
+        .XOR_OPS_PER_CYCLE(XOR_OPS_PER_CYCLE),
+        .MODE(MODE)
     ) crc_gen (
         .clk(clk),
         .rst(rst),
@@ -160,7 +162,8 @@ module crc_tb;
         .DATA_WIDTH(DATA_WIDTH),
         .CRC_WIDTH(CRC_WIDTH),
         .POLY(POLY),
-        .XOR_OPS_PER_CYCLE(XOR_OPS_PER_CYCLE)
+        .XOR_OPS_PER_CYCLE(XOR_OPS_PER_CYCLE),
+        .MODE(MODE)
     ) crc_verify (
         .clk(clk),
         .rst(rst),
@@ -183,7 +186,7 @@ module crc_tb;
     end
 
     task run_test();
-        $display("\n--- Test con XOR_OPS_PER_CYCLE = %0d ---", XOR_OPS_PER_CYCLE);
+        $display("\n--- Test con XOR_OPS_PER_CYCLE = %0d, MODE = %0d ---", XOR_OPS_PER_CYCLE, MODE);
         `WAIT_CLK(clk, 4);
 
         foreach (test_vectors[i]) begin
@@ -5,6 +5,7 @@ module decoder_tb;
 
   localparam DATA_WIDTH = 4;
   localparam DATA_DEPTH = 4;
+  parameter  MODE       = 0; // 0: iterative, 1: single pass, 2: single pass + pipeline register
   logic clk, rst_n;
   
 //   logic [DATA_WIDTH-1:0][DATA_DEPTH-1:0] data = '{4'b1111, 4'b1111, 4'b1111, 4'b1111};
@@ -16,10 +17,12 @@ module decoder_tb;
   logic [DATA_WIDTH-1:0] col_p  = 4'b0000;
   logic [3:0][3:0] data_out;
   logic err_det, err_corr, done, start;
+  logic [7:0] latency;
 
   decoder # (
     .WIDTH       (DATA_WIDTH),
-    .DEPTH       (DATA_DEPTH)
+    .DEPTH       (DATA_DEPTH),
+    .MODE        (MODE)
   ) decoder_i (
     .clk              (clk),
     .rst_n            (rst_n),
@@ -30,7 +33,8 @@ module decoder_tb;
     .error_detected   (err_det),
     .error_corrected  (err_corr),
     .done	            (done),
-    .start            (start)
+    .start            (start),
+    .latency          (latency)
     );
   `TB_DUMP("decoder_tb.vcd", decoder_tb, 0) 
   `TB_FINISH(5000)
@@ -49,6 +53,7 @@ module decoder_tb;
       @(posedge done);
       print_error();
       print_data_out();
+      check_latency();
       `WAIT_CLK(clk,4)
       
       // 3 data errors
@@ -57,6 +62,7 @@ module decoder_tb;
       @(posedge done);
       print_error();
       print_data_out();
+      check_latency();
       `WAIT_CLK(clk,4)
       
       // 2 data errors
@@ -65,6 +71,7 @@ module decoder_tb;
       @(posedge done);
       print_error();
       print_data_out();
+      check_latency();
       `WAIT_CLK(clk,4)
       
       // 1 data error
@@ -73,6 +80,7 @@ module decoder_tb;
       @(posedge done);
       print_error();
       print_data_out();
+      check_latency();
       `WAIT_CLK(clk,4)
       
       // 0 data errors
@@ -81,6 +89,7 @@ module decoder_tb;
       @(posedge done);
       print_error();
       print_data_out();
+      check_latency();
       `WAIT_CLK(clk,4)
       
       // 1 parity error
@@ -89,6 +98,7 @@ module decoder_tb;
       @(posedge done);
       print_error();
       print_data_out();
+      check_latency();
       `WAIT_CLK(clk,4)
       
       // 1 data error and 1 parity error
@@ -97,6 +107,7 @@ module decoder_tb;
       @(posedge done);
       print_error();
       print_data_out();
+      check_latency();
       `WAIT_CLK(clk,4)
       
       // 4 data errors again
@@ -105,6 +116,7 @@ module decoder_tb;
       @(posedge done);
       print_error();
       print_data_out();
+      check_latency();
       `WAIT_CLK(clk,4)
       
       $finish;
@@ -116,6 +128,18 @@ module decoder_tb;
     start = 'b0;
   endtask
   
+  // Worst case decode latency: 4 + max(WIDTH, DEPTH) iterative, MODE cycles single pass
+  task check_latency();
+    int max_latency;
+    max_latency = (MODE == 0) ? 4 + ((DATA_WIDTH > DATA_DEPTH) ? DATA_WIDTH : DATA_DEPTH) : MODE;
+    @(negedge done);
+    #1;
+    $display("Decode latency: %0d cycles (max %0d)", latency, max_latency);
+    if (latency > max_latency || (MODE != 0 && latency != max_latency))
+      $error("Decode latency %0d exceeds the bound of %0d cycles", latency, max_latency);
+    $display("\n");
+  endtask
+  
   function set_data_in(logic [DATA_WIDTH-1:0][DATA_DEPTH-1:0] data_in, logic [DATA_DEPTH-1:0] row, logic [DATA_WIDTH-1:0] col);
     data = data_in;
     row_p  = row;
@@ -20,10 +20,11 @@ module fec_top_tb;
   logic             rst_n;
   logic             uart_tx;
   logic             uart_rx = 1'b1;
-  logic             dl_out;
+  logic             uart_cts;
+  logic [SERIAL_LANES-1:0] dl_out;
   logic             dl_en;
   logic             dl_ready;
-  logic             ul_in;
+  logic [SERIAL_LANES-1:0] ul_in;
   logic             ul_en;
  
   bit [15:0]         uart_ps;
@@ -35,12 +36,14 @@ module fec_top_tb;
   string test;
   bit [7:0] payload;
   bit [15:0] clk_div;
+  bit [6:0]  lane_cfg;
   
   fec_top fec_u (
     .clk      (clk),
     .rst_n    (rst_n),
     .uart_rx  (uart_rx),
     .uart_tx  (uart_tx),
+    .uart_cts (uart_cts),
     .dl_out   (dl_out),
     .dl_en    (dl_en),
     .dl_ready (dl_ready),
@@ -82,6 +85,7 @@ module fec_top_tb;
     $display("- UART_MDW            : %0d bits     ", UART_MDW);
     $display("- UART_TX_FAW         : %0d bus size ", UART_TX_FAW);
     $display("- UART_RX_FAW         : %0d bus size ", UART_RX_FAW);
+    $display("- UART_RX_BUF_FAW     : %0d bus size ", UART_RX_BUF_FAW);
     $display("- UART_SC             : %0d bits/baud", UART_SC);
     $display("- UART_GFLEN          : %0d          ", UART_GFLEN);
     $display("- SERIAL_CLK_DIV      : %0d clocks   ", ser_clk_div);
@@ -101,8 +105,12 @@ module fec_top_tb;
     if($value$plusargs ("CLK_DIV=%0d", clk_div))
       $display ("[%0t][TB] Using downlink clock division %0d (0x%0h)",$time ,clk_div, clk_div);
 
+    if($value$plusargs ("LANE_CFG=%h", lane_cfg))
+      $display ("[%0t][TB] Using serial lane configuration 0x%0h",$time ,lane_cfg);
+
     $monitor("[%0t][TB] dl_fec_fsm.state: %s", $time, fec_u.dl_fec_fsm_u.state.name());
-    //downlink_monitor(/*clk, fec_u.dl_out*/);
+    if($test$plusargs("dl_mon"))
+      downlink_monitor(/*clk, fec_u.dl_out*/);
     
     uart_setup();
     dl_ctrl_setup();
@@ -126,12 +134,17 @@ module fec_top_tb;
        "test_fec_tx_max_payload":      test_fec_data_tx(255);
        "test_fec_tx_set_payload":      test_fec_data_tx(payload);
        "test_fec_tx_set_clk_div":      test_fec_data_tx(payload, clk_div);
+       "test_fec_tx_set_lanes":        test_fec_data_tx_lanes(payload, lane_cfg);
+       "test_fec_tx_stream":           test_fec_data_tx_stream(payload, 8);
+       "test_fec_tx_burst":            test_fec_data_tx_burst(payload);
        "test_fec_tx_invalid_payload":  test_fec_data_tx_invalid_payloads();
        "test_fec_tx_boundary_payload": test_fec_data_tx_boundary_payloads();
        "test_fec_tx_err_inj_mask_0":   test_fec_data_tx_err_inj(64'hbab1_cafe_dead_beef, 7);
        "test_fec_tx_err_inj_mask_1":   test_fec_data_tx_err_inj(64'hffff_ffff_ffff_ffff, 7);
        "test_fec_tx_err_inj_mask_2":   test_fec_data_tx_err_inj(64'h2, 7);
        "test_registers":               test_registers();
+       "test_registers_burst":         test_registers_burst();
+       "test_perf_counters":           test_perf_counters(payload);
        "test_undef_command_error":     test_undef_command_error();
        "test_uart_rx_timeout_error":   test_uart_rx_timeout_error();
        "test_uart_rx_frame_error":     test_uart_rx_frame_error();
@@ -295,7 +308,8 @@ module fec_top_tb;
     $display("[%0t][TB-TEST] == Commands count: %0d  ==", $time, CMDS_NUM);
     
     for(int ii=0; ii<CMDS_NUM; ii++) begin
-      command = command_t'($urandom_range(5,15)); // use undefined command ids
+      do command = command_t'($urandom_range(5,15)); // use undefined command ids
+      while(command inside {CMD_TX_STREAM, CMD_REG_BURST_READ, CMD_REG_BURST_WRITE});
       fec_command_error(command, err_resp,  err_code);
       
       // Check for error response
@@ -339,8 +353,12 @@ module fec_top_tb;
     
     repeat(registers.num()) begin
       
-      // Skip config registers
-      if(registers inside{REG_ADDR_UART_PR, REG_ADDR_UART_CTRL, REG_ADDR_UART_CFG}) continue;
+      // Skip config and performance counter registers
+      if(registers inside{REG_ADDR_UART_PR, REG_ADDR_UART_CTRL, REG_ADDR_UART_CFG,
+                          [REG_ADDR_PERF_CTRL:REG_ADDR_PERF_FIFO_HWM]}) begin
+        registers = registers.next();
+        continue;
+      end
       
       for(int ii=1; ii<(REGS_TCS+1); ii++) begin
         $display("[%0t][TB-TEST] Register: %s Address: 0x%0h Access cnt: %0d", $time, registers.name(), registers, ii);
@@ -352,6 +370,8 @@ module fec_top_tb;
         case(registers)
           REG_ADDR_DL_SER_CLK_DIV:     wdata = wdata[15:0];
           REG_ADDR_DL_ERR_INJ_ENABLE:  wdata = wdata[00:0];
+          REG_ADDR_SER_LANE_CFG:       wdata = wdata[06:0];
+          REG_ADDR_SER_BURST_CFG:      wdata = wdata[01:0];
           //REG_ADDR_UART_PR:            wdata = wdata[15:0];
           //REG_ADDR_UART_CTRL:          wdata = wdata[04:0];
           //REG_ADDR_UART_CFG:           wdata = wdata[13:0];
@@ -384,6 +404,104 @@ module fec_top_tb;
   endtask
   
   
+  // Register burst W-R ====================================================================
+  
+  
+  task test_registers_burst();
+    reg_addr_t  regs[$];
+    bit [31:0]  wdata[$], rdata[$];
+    bit [7:0]   rsp_cmd, rsp_cnt, rsp_err;
+    bit result;
+    
+    $display("[%0t][TB-TEST] ======= Register burst W-R =======", $time);
+    
+    // UART config registers are skipped, one invalid address is listed
+    regs  = '{REG_ADDR_SER_LANE_CFG, REG_ADDR_DL_ERR_INJ_MASK_1, REG_ADDR_DL_SER_CLK_DIV,
+              REG_ADDR_DL_ERR_INJ_ENABLE, reg_addr_t'(8'h14), REG_ADDR_DL_ERR_INJ_MASK_0};
+    wdata = '{$urandom_range(0,127), $urandom(), $urandom_range(0,16'hffff), 1, $urandom(), $urandom()};
+    
+    // Listed write
+    fec_reg_burst_write(regs, wdata, 1, rsp_cmd, rsp_cnt, rsp_err);
+    if(rsp_cmd!=RSP_BURST_WRITE_RES || rsp_cnt!=regs.size() || rsp_err!=1) begin
+      $error("[%0t][TB-TEST] Burst write response mismatch. Command: %0d Count: %0d Errors: %0d", $time, rsp_cmd, rsp_cnt, rsp_err);
+      result = 1;
+    end
+    
+    // Listed read, reg_cfg reads unmapped addresses as CAFE_CAFE
+    fec_reg_burst_read(regs, 1, rdata);
+    foreach(regs[ii]) begin
+      if(rdata[ii] != ((regs[ii]==reg_addr_t'(8'h14)) ? 32'hCAFE_CAFE : wdata[ii])) begin
+        $error("[%0t][TB-TEST] Register data mismatch. Register: 0x%0h Written data: %0h Read data: %0h", $time, regs[ii], wdata[ii], rdata[ii]);
+        result = 1;
+      end
+    end
+    
+    // Contiguous write of 0x00-0x0C, read back from the same start address
+    regs  = '{REG_ADDR_DL_SER_CLK_DIV, REG_ADDR_DL_ERR_INJ_MASK_0, REG_ADDR_DL_ERR_INJ_MASK_1, REG_ADDR_DL_ERR_INJ_ENABLE};
+    wdata = '{$urandom_range(0,16'hffff), $urandom(), $urandom(), 0};
+    fec_reg_burst_write(regs, wdata, 0, rsp_cmd, rsp_cnt, rsp_err);
+    if(rsp_cmd!=RSP_BURST_WRITE_RES || rsp_cnt!=regs.size() || rsp_err!=0) begin
+      $error("[%0t][TB-TEST] Burst write response mismatch. Command: %0d Count: %0d Errors: %0d", $time, rsp_cmd, rsp_cnt, rsp_err);
+      result = 1;
+    end
+    fec_reg_burst_read(regs, 0, rdata);
+    foreach(regs[ii]) begin
+      if(rdata[ii] != wdata[ii]) begin
+        $error("[%0t][TB-TEST] Register data mismatch. Register: 0x%0h Written data: %0h Read data: %0h", $time, regs[ii], wdata[ii], rdata[ii]);
+        result = 1;
+      end
+    end
+    
+    `WAIT_CLK(clk, 20)
+    $display("[%0t][TB-TEST] TEST %s", $time, result?"FAILED":"PASSED"); 
+    $display("");
+  endtask
+  
+  
+  // Performance counters ==================================================================
+  
+  
+  task test_perf_counters(bit[7:0] msg_len);
+    reg_addr_t  regs[$];
+    bit [31:0]  cnt[$];
+    bit [7:0]   rsp_cmd, rsp_addr, rsp_code, rsp_tag;
+    bit result;
+    
+    $display("[%0t][TB-TEST] ======= Performance counters =======", $time);
+    $display("[%0t][TB-TEST] == Payload: %0d bytes              ==", $time, msg_len);
+    
+    // Counter snapshots, REG_ADDR_PERF_CYCLES onwards
+    for(reg_addr_t r=REG_ADDR_PERF_CYCLES; ; r=r.next()) begin
+      regs.push_back(r);
+      if(r==r.last()) break;
+    end
+    
+    fec_reg_write(REG_ADDR_PERF_CTRL, 2, rsp_cmd, rsp_addr, rsp_code, 0); // Clear
+    fec_data_transmit_rand(msg_len, 0, rsp_cmd, rsp_tag, rsp_code);
+    wait(fec_u.dl_ctrl_done && fec_u.dl_ctrl_ready);
+    fec_uplink_drain();
+    fec_reg_write(REG_ADDR_PERF_CTRL, 1, rsp_cmd, rsp_addr, rsp_code, 0); // Snapshot
+    fec_reg_burst_read(regs, 0, cnt);
+    
+    foreach(regs[ii])
+      $display("[%0t][TB-TEST] %-32s %0d (0x%0h)", $time, regs[ii].name(), cnt[ii], cnt[ii]);
+    
+    // One message: one 16-bit frame (ID) and one 64-bit frame per 7 bytes
+    if(cnt[1] != (msg_len+6)/7 || cnt[2] != 1) begin
+      $error("[%0t][TB-TEST] Frame counters mismatch. 64-bit: %0d Expected: %0d 16-bit: %0d Expected: 1", $time, cnt[1], (msg_len+6)/7, cnt[2]);
+      result = 1;
+    end
+    if(cnt[0] == 0 || cnt[7] != 0 || cnt[8] != 0) begin
+      $error("[%0t][TB-TEST] Counters mismatch. Cycles: %0d UART frame errors: %0d UART timeouts: %0d", $time, cnt[0], cnt[7], cnt[8]);
+      result = 1;
+    end
+    
+    `WAIT_CLK(clk, 20)
+    $display("[%0t][TB-TEST] TEST %s", $time, result?"FAILED":"PASSED"); 
+    $display("");
+  endtask
+  
+  
   // FEC data transmission with error injection ==========================================
   
   
@@ -402,7 +520,8 @@ module fec_top_tb;
     fec_reg_write(REG_ADDR_DL_ERR_INJ_ENABLE, 1, rsp_cmd, rsp_addr, rsp_code, 0);
     
     fec_data_transmit_rand(payload, msg_tag, rsp_cmd, rsp_tag, rsp_code);
-    repeat(msg_pkts) @(negedge dl_en);
+    // Frames are sent back to back, wait for the downlink to drain
+    wait(fec_u.dl_ctrl_done && fec_u.dl_ctrl_ready);
   endtask
   
   
@@ -453,6 +572,145 @@ module fec_top_tb;
   endtask
   
   
+  // FEC data transmission over several lanes / DDR ======================================
+  
+  
+  task test_fec_data_tx_lanes(bit[7:0] msg_len, bit[6:0] lane_cfg);
+    bit [7:0] rsp_cmd, rsp_addr, rsp_code;
+    
+    $display("[%0t][TB-TEST] ======= Serial lanes =======", $time);
+    $display("[%0t][TB-TEST] == DL lanes: %0d DDR: %0d  ==", $time, 1 << lane_cfg[1:0], lane_cfg[2]);
+    $display("[%0t][TB-TEST] == UL lanes: %0d DDR: %0d  ==", $time, 1 << lane_cfg[5:4], lane_cfg[6]);
+    
+    fec_reg_write(REG_ADDR_SER_LANE_CFG, lane_cfg, rsp_cmd, rsp_addr, rsp_code, 0);
+    test_fec_data_tx(msg_len);
+    // Line utilization of the downlink_monitor (+dl_mon) scales with the lanes
+    wait(fec_u.dl_ctrl_done && fec_u.dl_ctrl_ready);
+  endtask
+  
+  
+  // FEC data streaming (CMD_TX_STREAM) ===================================================
+  
+  
+  task test_fec_data_tx_stream(bit[7:0] msg_len, int msg_count);
+    int  clks_per_byte;
+    time t_start, t_end, t_line, t_clk;
+    bit  sent, result;
+    
+    $display("[%0t][TB-TEST] ======= FEC data streaming =======", $time);
+    $display("[%0t][TB-TEST] == Messages: %0d Payload: %0d bytes ==", $time, msg_count, msg_len);
+    if(msg_len==0) begin
+      $error("[%0t][TB-TEST] Message lenght must be greather than 0", $time);
+      return;
+    end
+    
+    // UART line time of a byte: start, 8 data, parity and stop bits of UART_SC*(PR+1) cycles,
+    // timed with the testbench clock (TB_CLK), not SYS_CLK_PERIOD
+    clks_per_byte = UART_SC * (fec_u.uart_prescaler+1) * (UART_PARITY_TYPE!=0 ? 11 : 10);
+    @(posedge clk) t_clk = $time;
+    @(posedge clk) t_clk = $time - t_clk;
+    t_start = $time;
+    fork
+      begin
+        for(int m=0; m<msg_count; m++) begin
+          uart_send_8b(CMD_TX_STREAM);  // 1: Command        : stream (command_t)
+          uart_send_8b(msg_len);        // 2: Message lenght : msg_len
+          uart_send_8b(m[3:0]);         // 3: Message Tag    : message index
+          repeat(msg_len)               // 4: Message data   : Random data
+            uart_send_8b($urandom_range(0,255));
+        end
+        sent = 1;
+      end
+      begin
+        // Streamed messages are not answered
+        while(!sent || !fec_u.uart_u.rx_buf_empty || fec_u.dl_fec_fsm_u.state.name()!="S_IDLE") begin
+          @(posedge clk);
+          if(uart_tx==1'b0) begin
+            $error("[%0t][TB-TEST] Unexpected UART response while streaming", $time);
+            result = 1;
+          end
+        end
+      end
+    join
+    wait(fec_u.dl_ctrl_done && fec_u.dl_ctrl_ready);
+    t_end  = $time;
+    t_line = msg_count * (msg_len + 3) * clks_per_byte * t_clk;
+    
+    $display("[%0t][TB-TEST] Stream time: %0t, UART line time: %0t (%0d%% of the line rate)",
+             $time, t_end - t_start, t_line, (100 * t_line) / (t_end - t_start));
+    // The stream can not be faster than the UART line carrying it
+    if(t_end - t_start < t_line) begin
+      $error("[%0t][TB-TEST] Stream time shorter than the UART line time", $time);
+      result = 1;
+    end
+    
+   `WAIT_CLK(clk, 20)
+    $display("[%0t][TB-TEST] TEST %s", $time, result?"FAILED":"PASSED"); 
+    $display("");
+  endtask
+  
+  
+  // FEC data transmission with burst framing ============================================
+  
+  
+  task test_fec_data_tx_burst(bit[7:0] msg_len);
+    bit [7:0]  rsp_cmd, rsp_addr, rsp_code, rsp_tag;
+    reg_addr_t regs[$];
+    bit [31:0] cnt[$];
+    int        preamble[2];
+    bit        done, result;
+    
+    $display("[%0t][TB-TEST] ======= Burst framing =======", $time);
+    $display("[%0t][TB-TEST] == Payload: %0d bytes       ==", $time, msg_len);
+    
+    regs = '{REG_ADDR_PERF_UL_FRAMES, REG_ADDR_PERF_UL_UNCORRECTABLE, REG_ADDR_PERF_UL_CRC_ERRORS};
+    
+    // Same message with a preamble per frame (0) and per burst (1)
+    for(int mode=0; mode<2; mode++) begin
+      fec_reg_write(REG_ADDR_SER_BURST_CFG, {mode[0], mode[0]}, rsp_cmd, rsp_addr, rsp_code, 0);
+      fec_reg_write(REG_ADDR_PERF_CTRL, 2, rsp_cmd, rsp_addr, rsp_code, 0); // Clear
+      done = 0;
+      fork
+        begin
+          fec_data_transmit_rand(msg_len, mode[3:0], rsp_cmd, rsp_tag, rsp_code);
+          wait(fec_u.dl_ctrl_done && fec_u.dl_ctrl_ready);
+          done = 1;
+          fec_uplink_drain();
+        end
+        // Line time spent on preambles and delimiters
+        while(!done) begin
+          @(posedge clk);
+          if(fec_u.dl_ctrl_u.dl_state.name() == "S_TRAINING") preamble[mode]++;
+        end
+      join
+      if(rsp_cmd!=RSP_TX_RES || rsp_code!=8'h0) begin
+        $error("[%0t][TB-TEST] FEC response mismatch. Command: %0d Code: %0d", $time, rsp_cmd, rsp_code);
+        result = 1;
+      end
+      
+      // In loopback every frame must be decoded back on the uplink
+      fec_reg_write(REG_ADDR_PERF_CTRL, 1, rsp_cmd, rsp_addr, rsp_code, 0); // Snapshot
+      fec_reg_burst_read(regs, 1, cnt);
+      $display("[%0t][TB-TEST] Burst framing %0d: preamble cycles %0d, UL frames %0d, uncorrectable %0d, CRC errors %0d",
+               $time, mode, preamble[mode], cnt[0], cnt[1], cnt[2]);
+      if($test$plusargs("LOOPBACK") && (cnt[0] != (msg_len+6)/7+1 || cnt[1] != 0 || cnt[2] != 0)) begin
+        $error("[%0t][TB-TEST] Uplink frames mismatch. Frames: %0d Expected: %0d", $time, cnt[0], (msg_len+6)/7+1);
+        result = 1;
+      end
+    end
+    fec_reg_write(REG_ADDR_SER_BURST_CFG, 0, rsp_cmd, rsp_addr, rsp_code, 0);
+    
+    if(msg_len > 7 && preamble[1] >= preamble[0]) begin
+      $error("[%0t][TB-TEST] Burst framing does not shorten the preambles: %0d >= %0d cycles", $time, preamble[1], preamble[0]);
+      result = 1;
+    end
+    
+   `WAIT_CLK(clk, 20)
+    $display("[%0t][TB-TEST] TEST %s", $time, result?"FAILED":"PASSED"); 
+    $display("");
+  endtask
+  
+  
   // FEC Transmission Boundary payloads ====================================================
   
   
@@ -598,12 +856,30 @@ module fec_top_tb;
   endtask
   
   
+  // FEC Uplink drain ======================================================================
+  
+  
+  task fec_uplink_drain();
+    int clks_per_byte;
+    clks_per_byte = UART_SC * (fec_u.uart_prescaler+1) * (UART_PARITY_TYPE!=0 ? 11 : 10);
+    // Uplink messages of the loopback drain from the UART before the next command
+    wait(fec_u.ul_mon_data_level == 0 && fec_u.ul_fec_fsm_u.ul_state.name() == "S_IDLE" && fec_u.uart_tx_empty);
+    repeat(clks_per_byte) @(posedge clk);
+  endtask
+  
+  
   // FEC Data transmit UART response =======================================================
   
   
   task fec_data_transmit_uart_response(output bit[7:0] rsp_cmd, output bit[7:0] rsp_tag, output bit[7:0] rsp_code);
+    bit [7:0] ul_byte;
     $display("[%0t][TB-TASK] FEC Data transmit UART response start.", $time);
     uart_receive_8b(rsp_cmd);
+    // In loopback the uplink messages of the transmitted frames share the UART
+    while($test$plusargs("LOOPBACK") && (rsp_cmd==RX_MSG_ID || rsp_cmd==RX_MSG_DATA)) begin
+      repeat((rsp_cmd==RX_MSG_ID) ? 3 : 9) uart_receive_8b(ul_byte);
+      uart_receive_8b(rsp_cmd);
+    end
     uart_receive_8b(rsp_tag);
     uart_receive_8b(rsp_code);
     $display("[%0t][TB-TASK] FEC Data transmit UART response end.", $time);
@@ -756,6 +1032,62 @@ module fec_top_tb;
   endtask
   
   
+  // FEC Register burst write ==============================================================
+  
+  
+  task fec_reg_burst_write(reg_addr_t regs[$], bit[31:0] data[$], bit list, output bit[7:0] rsp_cmd, output bit[7:0] rsp_cnt, output bit[7:0] rsp_err);
+    $display("[%0t][TB-TASK] FEC Register burst write start. Registers: %0d Addresses: %s", $time, regs.size(), list?"listed":"contiguous");
+    
+    uart_send_8b(CMD_REG_BURST_WRITE);       // 1: Command: Reg burst write (command_t)
+    uart_send_8b({list, 7'(regs.size())});   // 2: Address mode and register count
+    foreach(regs[ii]) begin
+      if(list || ii==0)
+        uart_send_8b(regs[ii]);              // 3: Register address
+      uart_send_8b(data[ii][31:24]);         // 4: Config data - MSB
+      uart_send_8b(data[ii][23:16]);
+      uart_send_8b(data[ii][15: 8]);
+      uart_send_8b(data[ii][ 7: 0]);         // LSB
+    end
+    uart_receive_8b(rsp_cmd);
+    uart_receive_8b(rsp_cnt);
+    uart_receive_8b(rsp_err);                // Writes answered with pslverr
+  endtask
+  
+  
+  // FEC Register burst read ===============================================================
+  
+  
+  task fec_reg_burst_read(reg_addr_t regs[$], bit list, output bit[31:0] data[$]);
+    bit [7:0] rsp_cmd, rsp_cnt;
+    $display("[%0t][TB-TASK] FEC Register burst read start. Registers: %0d Addresses: %s", $time, regs.size(), list?"listed":"contiguous");
+    
+    data = {};
+    fork
+      begin
+        uart_send_8b(CMD_REG_BURST_READ);      // 1: Command: Reg burst read (command_t)
+        uart_send_8b({list, 7'(regs.size())}); // 2: Address mode and register count
+        foreach(regs[ii])
+          if(list || ii==0)
+            uart_send_8b(regs[ii]);            // 3: Register address
+      end
+      begin
+        uart_receive_8b(rsp_cmd);
+        uart_receive_8b(rsp_cnt);
+        if(rsp_cmd!=RSP_BURST_READ_RES || rsp_cnt!=regs.size())
+          $error("[%0t][TB-TASK] Burst read response mismatch. Command: %0d Count: %0d", $time, rsp_cmd, rsp_cnt);
+        repeat(regs.size()) begin
+          bit [31:0] word;
+          uart_receive_8b(word[31:24]);        // Register data - MSB
+          uart_receive_8b(word[23:16]);
+          uart_receive_8b(word[15: 8]);
+          uart_receive_8b(word[ 7: 0]);        // LSB
+          data.push_back(word);
+        end
+      end
+    join
+  endtask
+  
+  
   // ========================================================
   //                     UART Drivers
   // ========================================================
@@ -841,6 +1173,9 @@ module fec_top_tb;
     
     //@(negedge clk);
     
+    // 0. Hardware flow control: hold the byte while the FEC RX buffer is full
+    wait(uart_cts);
+    
     // 1. Sart bit
     uart_rx = 0;
     //$display("[%0t][TB-TASK] UART start bit %0b    ", $time, uart_rx);
@@ -1061,6 +1396,7 @@ module fec_top_tb;
     bit [ 7:0] sampled_idx;
     bit [23:0] sampled_data_1;
     bit [79:0] sampled_data_0;
+    int        line_cycles, line_busy, line_frames;
     
     $display("[%0t][TB-DL-MON] downlink_monitor started", $time);
     
@@ -1081,7 +1417,7 @@ module fec_top_tb;
               ser_clk_cnt     = 0;
               
               //@(posedge clk);
-              if(dl_out == 1'b1) begin
+              if(dl_out[0] == 1'b1) begin
                 dl_mon_st       = S_TRAINING;
                 ser_clk_cnt     = 1;
                 dl_preamble_cnt = 0;
@@ -1093,16 +1429,16 @@ module fec_top_tb;
             S_TRAINING: begin
                             
               // Count when dl_out is high
-              if(dl_out == 1'b1) ser_clk_cnt++;
+              if(dl_out[0] == 1'b1) ser_clk_cnt++;
               
               // If posedge 
-              if(dl_out=='b1 && dl_out_pre=='b0) begin
+              if(dl_out[0]=='b1 && dl_out_pre=='b0) begin
                 dl_out_pre = 'b1;
                 //$display("[%0t] [DL-MON] Posedge detected %0d", $time, dl_preamble_cnt);
               end
                 
               // If negative edge -> increase dl preamble count 
-              if(dl_out=='b0 && dl_out_pre=='b1) begin
+              if(dl_out[0]=='b0 && dl_out_pre=='b1) begin
                 dl_out_pre = 0;
                 dl_preamble_cnt++;
                 //$display("[%0t] [DL-MON] Negedge detected %0d", $time, dl_preamble_cnt);
@@ -1136,10 +1472,10 @@ module fec_top_tb;
               sync_cnt++;
               if(sync_cnt == trained_ser_clk) begin
                 if(sampled_data_dec) begin
-                  sampled_data_1[sampled_idx] = dl_out;
+                  sampled_data_1[sampled_idx] = dl_out[0];
                 end
                 else begin
-                  sampled_data_0[sampled_idx] = dl_out;
+                  sampled_data_0[sampled_idx] = dl_out[0];
                 end
                 
                 sync_cnt =0;
@@ -1160,6 +1496,31 @@ module fec_top_tb;
         
       end // Downlink Monitor
       
+      begin // Line utilization
+        
+        forever begin
+          
+          // A message window opens with the first preamble on the line and
+          // closes once the FSM is back in S_IDLE and no frame is in flight
+          @(posedge clk iff(dl_en=='b1));
+          line_cycles = 0;
+          line_busy   = 0;
+          line_frames = 0;
+          
+          while(dl_en || !fec_u.dl_ctrl_done || !fec_u.dl_ctrl_ready ||
+                fec_u.dl_fec_fsm_u.state.name() != "S_IDLE") begin
+            line_cycles++;
+            if(dl_en) line_busy++;
+            if(fec_u.dl_ctrl_u.serial_start) line_frames++;
+            @(posedge clk);
+          end
+          
+          $display("[%0t][TB-DL-MON] Line utilization: %0d frames, dl_en busy %0d of %0d cycles (%.1f%%)",
+                   $time, line_frames, line_busy, line_cycles, 100.0*line_busy/line_cycles);
+        end
+        
+      end // Line utilization
+      
       begin // Hang detector
 
       // Hang detector code here